@@ -1,6 +1,6 @@
 # Our custom vector database
 import numpy as np
-from sentence_transformers import SentenceTransformer
+from backend.config.embedding_models import EmbeddingModels
 from backend.utils.constants import COMPANY_INFORMATION
 
 
@@ -69,14 +69,15 @@ class VectorDatabase:
     def populate(self):
         # Populate the custom vector database
         # Embedding model
-        model = SentenceTransformer(
+        model = EmbeddingModels().get_embedding_engine(
             "C:/Users/703395858/PycharmProjects/agentic_ai/backend/models/sentence_transformer/"
         )
         company_db = self.create_db()
-        for idx, sentence in enumerate(COMPANY_INFORMATION):
-            # Create sentence embedding
-            embedding = model.encode(sentence)
-
+        # Create all sentence embeddings in length-bucketed batches
+        embeddings = model.encode(list(COMPANY_INFORMATION))
+        for idx, (sentence, embedding) in enumerate(
+            zip(COMPANY_INFORMATION, embeddings)
+        ):
             # Add sentence embedding to the database
 
             company_db.add_vector(
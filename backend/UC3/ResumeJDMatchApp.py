@@ -1,7 +1,7 @@
 import streamlit as st
 import json
-from PyPDF2 import PdfReader
 from dotenv import load_dotenv
+from backend.config.pdf_extractors import get_pdf_extractor
 from crewai import Crew, Task, LLM, Process
 
 # ------------------- Agents -------------------
@@ -23,11 +23,7 @@ except ImportError:
 
 
 def extract_text_from_pdf(uploaded_file):
-    reader = PdfReader(uploaded_file)
-    text = ""
-    for page in reader.pages:
-        text += page.extract_text() or ""
-    return text.strip()
+    return get_pdf_extractor().extract_text(uploaded_file, separator="")
 
 
 # ------------------- Streamlit UI -------------------
@@ -1,8 +1,8 @@
 import streamlit as st
 import json
 import logging
-from PyPDF2 import PdfReader
 from dotenv import load_dotenv
+from backend.config.pdf_extractors import get_pdf_extractor
 from crewai import Agent, Crew, Task, LLM, Process
 import json
 
@@ -18,11 +18,7 @@ except ImportError:
 
 
 def extract_text_from_pdf(uploaded_file):
-    reader = PdfReader(uploaded_file)
-    text = ""
-    for page in reader.pages:
-        text += page.extract_text() or ""
-    return text.strip()
+    return get_pdf_extractor().extract_text(uploaded_file, separator="")
 
 
 class ResumeParsingAgent(Agent):
@@ -15,7 +15,6 @@ from langchain_core.prompts import (
 )
 from langchain_core.runnables import RunnablePassthrough, RunnableLambda, Runnable
 from langchain_core.stores import InMemoryByteStore
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain import hub
 import warnings
 from typing import List, Dict
@@ -27,6 +26,7 @@ from pydantic import Field, BaseModel
 from ragatouille import RAGPretrainedModel
 
 from backend.config.azure_models import AzureOpenAIModels
+from backend.config.embedding_models import EmbeddingModels
 from backend.config.logging_lib import logger
 
 warnings.filterwarnings("ignore")
@@ -49,12 +49,7 @@ class RAGChainBuilder:
             persist_dir (str): The directory to persist the Chroma vector store.
         """
         self.llm = AzureOpenAIModels().get_azure_model_4()
-        self.embedding_model = HuggingFaceEmbeddings(
-            model_name="C:/Users/703395858/PycharmProjects/agentic_ai/backend/models/all-MiniLM-L6-v2",
-            model_kwargs={
-                "device": "cpu",
-            },
-        )
+        self.embedding_model = EmbeddingModels().get_embedding_engine()
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size, chunk_overlap=chunk_overlap
         )
@@ -1,15 +1,46 @@
+import threading
+from typing import Optional, Tuple
+import httpx
 from langchain_openai import AzureChatOpenAI, AzureOpenAIEmbeddings
 from backend.config.config import AzureConfig
 from backend.config.logging_lib import logger
 
 
 class AzureOpenAIModels(AzureConfig):
+    # HTTP clients shared by every model of the process, so sync and async calls
+    # reuse one keep-alive connection pool instead of one per model instance
+    _http_client: Optional[httpx.Client] = None
+    _http_async_client: Optional[httpx.AsyncClient] = None
+    _http_lock = threading.Lock()
+
     def __init__(self):
         """
         Initializes the AzureOpenAIConfig class with a config file.
         """
         super().__init__()
 
+    def get_http_clients(self) -> Tuple[httpx.Client, httpx.AsyncClient]:
+        """
+        Returns the process-wide sync and async HTTP clients, created on first use
+        with a pool of AZURE_OPENAI_MAX_CONNECTIONS connections. The async client
+        belongs to the event loop it is first used on.
+
+        :return: (httpx.Client, httpx.AsyncClient) tuple.
+        """
+        with AzureOpenAIModels._http_lock:
+            if AzureOpenAIModels._http_client is None:
+                limits = httpx.Limits(
+                    max_connections=self.get_azure_openai_max_connections,
+                    max_keepalive_connections=self.get_azure_openai_max_connections,
+                )
+                AzureOpenAIModels._http_client = httpx.Client(limits=limits)
+                AzureOpenAIModels._http_async_client = httpx.AsyncClient(limits=limits)
+                logger.info(
+                    f"Created shared Azure OpenAI HTTP pool of "
+                    f"{self.get_azure_openai_max_connections} connections"
+                )
+            return AzureOpenAIModels._http_client, AzureOpenAIModels._http_async_client
+
     # def get_azure_embedding_model(self) -> AzureOpenAIEmbeddings:
     #     """
     #     Initializes and returns the Azure embedding model.
@@ -45,12 +76,15 @@ class AzureOpenAIModels(AzureConfig):
         :return: AzureChatOpenAI instance.
         """
         logger.info("Initializing Azure GPT-3.5 model...")
+        http_client, http_async_client = self.get_http_clients()
         try:
             model = AzureChatOpenAI(
                 azure_endpoint=self.get_azure_openai_base,
                 api_key=self.get_azure_openai_key,
                 api_version=self.get_azure_openai_api_version,
                 azure_deployment=self.get_gpt_model_deployment_name,
+                http_client=http_client,
+                http_async_client=http_async_client,
                 temperature=temperature,
             )
             # Logging.info("Azure GPT-3.5 model initialized.")
@@ -67,6 +101,7 @@ class AzureOpenAIModels(AzureConfig):
         :return: AzureOpenAI instance.
         """
         logger.info("Initializing Azure GPT-4 model...")
+        http_client, http_async_client = self.get_http_clients()
         try:
             # azure_config = AzureConfig()
             model = AzureChatOpenAI(
@@ -74,6 +109,8 @@ class AzureOpenAIModels(AzureConfig):
                 api_key=self.get_azure_openai_key,
                 api_version=self.get_azure_openai_api_version,
                 azure_deployment=self.get_gpt_model_preview_deployment_name,
+                http_client=http_client,
+                http_async_client=http_async_client,
                 temperature=temperature,
                 max_tokens=2000,
             )
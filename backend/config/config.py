@@ -61,6 +61,10 @@ class AzureConfig:
     GPT_MODEL_DEPLOYMENT_NAME: str
     GPT_MODEL_PREVIEW_DEPLOYMENT_NAME: str
     GPT_MODEL_EMBEDDING_DEPLOYMENT_NAME: str
+    AZURE_OPENAI_MAX_IN_FLIGHT: int
+    AZURE_OPENAI_TOKENS_PER_MINUTE: int
+    AZURE_OPENAI_MAX_CONNECTIONS: int
+    AZURE_OPENAI_ASYNC_NATIVE: bool
 
     def __init__(self):
         self.AZURE_OPENAI_KEY = os.getenv(
@@ -93,6 +97,31 @@ class AzureConfig:
             "GPT_MODEL_EMBEDDING_DEPLOYMENT_NAME",
             config.get(ENV, "GPT_MODEL_EMBEDDING_DEPLOYMENT_NAME"),
         )
+        self.AZURE_OPENAI_MAX_IN_FLIGHT = int(
+            os.getenv(
+                "AZURE_OPENAI_MAX_IN_FLIGHT",
+                config.get(ENV, "AZURE_OPENAI_MAX_IN_FLIGHT", fallback="4"),
+            )
+        )
+        # 0 disables the tokens-per-minute budget
+        self.AZURE_OPENAI_TOKENS_PER_MINUTE = int(
+            os.getenv(
+                "AZURE_OPENAI_TOKENS_PER_MINUTE",
+                config.get(ENV, "AZURE_OPENAI_TOKENS_PER_MINUTE", fallback="0"),
+            )
+        )
+        # Size of the HTTP connection pool shared by every Azure OpenAI client
+        self.AZURE_OPENAI_MAX_CONNECTIONS = int(
+            os.getenv(
+                "AZURE_OPENAI_MAX_CONNECTIONS",
+                config.get(ENV, "AZURE_OPENAI_MAX_CONNECTIONS", fallback="200"),
+            )
+        )
+        # Await ainvoke on the event loop instead of running invoke on a thread
+        self.AZURE_OPENAI_ASYNC_NATIVE = os.getenv(
+            "AZURE_OPENAI_ASYNC_NATIVE",
+            config.get(ENV, "AZURE_OPENAI_ASYNC_NATIVE", fallback="true"),
+        ).lower() in ("1", "true", "yes")
 
     @property
     def get_azure_openai_key(self) -> str:
@@ -164,6 +193,231 @@ class AzureConfig:
         """
         return self.GPT_MODEL_EMBEDDING_DEPLOYMENT_NAME
 
+    @property
+    def get_azure_openai_max_in_flight(self) -> int:
+        """Get azure_openai_max_in_flight
+        :return: int
+        """
+        return self.AZURE_OPENAI_MAX_IN_FLIGHT
+
+    @property
+    def get_azure_openai_tokens_per_minute(self) -> int:
+        """Get azure_openai_tokens_per_minute
+        :return: int
+        """
+        return self.AZURE_OPENAI_TOKENS_PER_MINUTE
+
+    @property
+    def get_azure_openai_max_connections(self) -> int:
+        """Get azure_openai_max_connections
+        :return: int
+        """
+        return self.AZURE_OPENAI_MAX_CONNECTIONS
+
+    @property
+    def get_azure_openai_async_native(self) -> bool:
+        """Get azure_openai_async_native
+        :return: bool
+        """
+        return self.AZURE_OPENAI_ASYNC_NATIVE
+
+
+class EmbeddingConfig:
+    EMBEDDING_MODEL_PATH: str
+    EMBEDDING_DEVICE: str
+    EMBEDDING_CACHE_DIR: str
+    EMBEDDING_MAX_TOKENS_PER_BATCH: int
+    EMBEDDING_BACKEND: str
+    EMBEDDING_ONNX_QUANTIZATION: str
+
+    def __init__(self):
+        self.EMBEDDING_MODEL_PATH = os.getenv(
+            "EMBEDDING_MODEL_PATH",
+            config.get(
+                ENV,
+                "EMBEDDING_MODEL_PATH",
+                fallback="C:/Users/703395858/PycharmProjects/agentic_ai/backend/models/all-MiniLM-L6-v2",
+            ),
+        )
+        self.EMBEDDING_DEVICE = os.getenv(
+            "EMBEDDING_DEVICE", config.get(ENV, "EMBEDDING_DEVICE", fallback="cpu")
+        )
+        self.EMBEDDING_CACHE_DIR = os.getenv(
+            "EMBEDDING_CACHE_DIR",
+            config.get(ENV, "EMBEDDING_CACHE_DIR", fallback="embedding_cache"),
+        )
+        self.EMBEDDING_MAX_TOKENS_PER_BATCH = int(
+            os.getenv(
+                "EMBEDDING_MAX_TOKENS_PER_BATCH",
+                config.get(ENV, "EMBEDDING_MAX_TOKENS_PER_BATCH", fallback="8192"),
+            )
+        )
+        # "torch" or "onnx" (int8-quantized ONNX graph, CPU only)
+        self.EMBEDDING_BACKEND = os.getenv(
+            "EMBEDDING_BACKEND", config.get(ENV, "EMBEDDING_BACKEND", fallback="torch")
+        )
+        self.EMBEDDING_ONNX_QUANTIZATION = os.getenv(
+            "EMBEDDING_ONNX_QUANTIZATION",
+            config.get(ENV, "EMBEDDING_ONNX_QUANTIZATION", fallback="avx2"),
+        )
+
+    @property
+    def get_embedding_model_path(self) -> str:
+        """Get embedding_model_path
+        :return: string
+        """
+        return self.EMBEDDING_MODEL_PATH
+
+    @property
+    def get_embedding_device(self) -> str:
+        """Get embedding_device
+        :return: string
+        """
+        return self.EMBEDDING_DEVICE
+
+    @property
+    def get_embedding_cache_dir(self) -> str:
+        """Get embedding_cache_dir
+        :return: string
+        """
+        return self.EMBEDDING_CACHE_DIR
+
+    @property
+    def get_embedding_max_tokens_per_batch(self) -> int:
+        """Get embedding_max_tokens_per_batch
+        :return: int
+        """
+        return self.EMBEDDING_MAX_TOKENS_PER_BATCH
+
+    @property
+    def get_embedding_backend(self) -> str:
+        """Get embedding_backend
+        :return: string
+        """
+        return self.EMBEDDING_BACKEND
+
+    @property
+    def get_embedding_onnx_quantization(self) -> str:
+        """Get embedding_onnx_quantization
+        :return: string
+        """
+        return self.EMBEDDING_ONNX_QUANTIZATION
+
+
+class PdfConfig:
+    PDF_EXTRACTOR: str
+
+    def __init__(self):
+        # "pdfplumber", "pypdf2" or "pymupdf" (see backend.config.pdf_extractors)
+        self.PDF_EXTRACTOR = os.getenv(
+            "PDF_EXTRACTOR", config.get(ENV, "PDF_EXTRACTOR", fallback="pdfplumber")
+        )
+
+    @property
+    def get_pdf_extractor(self) -> str:
+        """Get pdf_extractor
+        :return: string
+        """
+        return self.PDF_EXTRACTOR
+
+
+class CacheConfig:
+    REWRITE_CACHE_ENABLED: bool
+    REWRITE_CACHE_THRESHOLD: float
+    REWRITE_CACHE_TTL_SECONDS: float
+    REWRITE_CACHE_MAX_ENTRIES: int
+    ANSWER_CACHE_ENABLED: bool
+    ANSWER_CACHE_DIR: str
+    ANSWER_CACHE_MAX_BYTES: int
+
+    def __init__(self):
+        self.REWRITE_CACHE_ENABLED = os.getenv(
+            "REWRITE_CACHE_ENABLED",
+            config.get(ENV, "REWRITE_CACHE_ENABLED", fallback="true"),
+        ).lower() in ("1", "true", "yes")
+        # Minimum cosine similarity for a paraphrase to reuse a cached rewrite
+        self.REWRITE_CACHE_THRESHOLD = float(
+            os.getenv(
+                "REWRITE_CACHE_THRESHOLD",
+                config.get(ENV, "REWRITE_CACHE_THRESHOLD", fallback="0.92"),
+            )
+        )
+        self.REWRITE_CACHE_TTL_SECONDS = float(
+            os.getenv(
+                "REWRITE_CACHE_TTL_SECONDS",
+                config.get(ENV, "REWRITE_CACHE_TTL_SECONDS", fallback="86400"),
+            )
+        )
+        self.REWRITE_CACHE_MAX_ENTRIES = int(
+            os.getenv(
+                "REWRITE_CACHE_MAX_ENTRIES",
+                config.get(ENV, "REWRITE_CACHE_MAX_ENTRIES", fallback="1000"),
+            )
+        )
+        self.ANSWER_CACHE_ENABLED = os.getenv(
+            "ANSWER_CACHE_ENABLED",
+            config.get(ENV, "ANSWER_CACHE_ENABLED", fallback="true"),
+        ).lower() in ("1", "true", "yes")
+        self.ANSWER_CACHE_DIR = os.getenv(
+            "ANSWER_CACHE_DIR",
+            config.get(ENV, "ANSWER_CACHE_DIR", fallback="answer_cache"),
+        )
+        self.ANSWER_CACHE_MAX_BYTES = int(
+            os.getenv(
+                "ANSWER_CACHE_MAX_BYTES",
+                config.get(ENV, "ANSWER_CACHE_MAX_BYTES", fallback="52428800"),
+            )
+        )
+
+    @property
+    def get_rewrite_cache_enabled(self) -> bool:
+        """Get rewrite_cache_enabled
+        :return: bool
+        """
+        return self.REWRITE_CACHE_ENABLED
+
+    @property
+    def get_rewrite_cache_threshold(self) -> float:
+        """Get rewrite_cache_threshold
+        :return: float
+        """
+        return self.REWRITE_CACHE_THRESHOLD
+
+    @property
+    def get_rewrite_cache_ttl_seconds(self) -> float:
+        """Get rewrite_cache_ttl_seconds
+        :return: float
+        """
+        return self.REWRITE_CACHE_TTL_SECONDS
+
+    @property
+    def get_rewrite_cache_max_entries(self) -> int:
+        """Get rewrite_cache_max_entries
+        :return: int
+        """
+        return self.REWRITE_CACHE_MAX_ENTRIES
+
+    @property
+    def get_answer_cache_enabled(self) -> bool:
+        """Get answer_cache_enabled
+        :return: bool
+        """
+        return self.ANSWER_CACHE_ENABLED
+
+    @property
+    def get_answer_cache_dir(self) -> str:
+        """Get answer_cache_dir
+        :return: string
+        """
+        return self.ANSWER_CACHE_DIR
+
+    @property
+    def get_answer_cache_max_bytes(self) -> int:
+        """Get answer_cache_max_bytes
+        :return: int
+        """
+        return self.ANSWER_CACHE_MAX_BYTES
+
 
 class Config(AzureConfig):
     ENV: str
@@ -0,0 +1,200 @@
+import threading
+from time import monotonic
+from typing import Any, Dict, List, Union
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from backend.config.logging_lib import logger
+
+
+class BucketedEmbeddings(Embeddings):
+    """
+    Description:
+        Embedding engine around a SentenceTransformer that batches by token length.
+        Inputs are tokenized once to get their lengths, sorted longest first and cut
+        into batches whose padded size (batch length * longest sequence) stays within
+        `max_tokens_per_batch`. Short quotes are therefore batched with other short
+        texts instead of being padded to the length of 1000-character chunks, and
+        batches of short texts are larger. Outputs are returned in input order.
+        Also usable as a LangChain Embeddings object; embed_documents and embed_query
+        replace newlines with spaces first, as HuggingFaceEmbeddings does.
+
+    Params:
+        model (SentenceTransformer): The loaded sentence-transformers model.
+        max_tokens_per_batch (int): Padded token budget per forward pass.
+        max_batch_size (int): Upper bound on texts per batch.
+        encode_kwargs (dict, optional): Extra SentenceTransformer.encode kwargs
+            (e.g. normalize_embeddings).
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        max_tokens_per_batch: int = 8192,
+        max_batch_size: int = 256,
+        encode_kwargs: Dict[str, Any] = None,
+    ):
+        if not isinstance(max_tokens_per_batch, int) or max_tokens_per_batch < 1:
+            raise ValueError("max_tokens_per_batch must be a positive integer")
+        if not isinstance(max_batch_size, int) or max_batch_size < 1:
+            raise ValueError("max_batch_size must be a positive integer")
+        self.model = model
+        self.max_tokens_per_batch = max_tokens_per_batch
+        self.max_batch_size = max_batch_size
+        self.encode_kwargs = dict(encode_kwargs or {})
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "texts": 0,
+            "batches": 0,
+            "tokens": 0,
+            "padded_tokens": 0,
+            "seconds": 0.0,
+        }
+
+    def token_lengths(self, texts: List[str]) -> List[int]:
+        """
+        Description:
+            Token count of every text as the model will see it (special tokens
+            included, truncated to the model's max_seq_length).
+
+        Params:
+            texts (list[str]): Texts to measure.
+
+        Return:
+            list[int]: One length per text.
+
+        Exceptions:
+            None
+        """
+        max_length = getattr(self.model, "max_seq_length", None) or 512
+        encoded = self.model.tokenizer(
+            texts,
+            add_special_tokens=True,
+            truncation=True,
+            max_length=max_length,
+            return_attention_mask=False,
+            return_token_type_ids=False,
+        )
+        return [len(ids) for ids in encoded["input_ids"]]
+
+    def plan_batches(self, lengths: List[int]) -> List[List[int]]:
+        """
+        Description:
+            Group text positions into token-budgeted batches, longest texts first.
+
+        Params:
+            lengths (list[int]): Token length of every text.
+
+        Return:
+            list[list[int]]: Batches of positions into the input list.
+
+        Exceptions:
+            None
+        """
+        order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+        batches: List[List[int]] = []
+        batch: List[int] = []
+        longest = 0
+        for position in order:
+            # Sorted descending, so the first text of a batch sets its padded length
+            longest = longest if batch else lengths[position]
+            if batch and (
+                len(batch) >= self.max_batch_size
+                or (len(batch) + 1) * longest > self.max_tokens_per_batch
+            ):
+                batches.append(batch)
+                batch = []
+                longest = lengths[position]
+            batch.append(position)
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def encode(self, texts: Union[str, List[str]]) -> np.ndarray:
+        """
+        Description:
+            Embed texts with length-bucketed batches, restoring input order.
+            Mirrors SentenceTransformer.encode: a single string gives a 1-D vector.
+
+        Params:
+            texts (str or list[str]): Text(s) to embed.
+
+        Return:
+            np.ndarray: Embeddings of shape (len(texts), dim), or (dim,) for one string.
+
+        Exceptions:
+            TypeError: If texts is not a string or a list of strings.
+        """
+        if isinstance(texts, str):
+            return self.encode([texts])[0]
+        if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+            raise TypeError("texts must be a string or a list of strings")
+        if not texts:
+            return np.zeros((0, self.model.get_sentence_embedding_dimension()))
+
+        start_time = monotonic()
+        lengths = self.token_lengths(texts)
+        batches = self.plan_batches(lengths)
+        result = None
+        for batch in batches:
+            vectors = self.model.encode(
+                [texts[i] for i in batch],
+                batch_size=len(batch),
+                convert_to_numpy=True,
+                show_progress_bar=False,
+                **self.encode_kwargs,
+            )
+            if result is None:
+                result = np.empty((len(texts), vectors.shape[1]), dtype=vectors.dtype)
+            result[batch] = vectors
+        elapsed = monotonic() - start_time
+
+        with self._stats_lock:
+            self._stats["texts"] += len(texts)
+            self._stats["batches"] += len(batches)
+            self._stats["tokens"] += sum(lengths)
+            self._stats["padded_tokens"] += sum(
+                len(batch) * lengths[batch[0]] for batch in batches
+            )
+            self._stats["seconds"] += elapsed
+        logger.debug(
+            f"Embedded {len(texts)} texts in {len(batches)} batches, "
+            f"{sum(lengths) / elapsed if elapsed else 0.0:.0f} tokens/s"
+        )
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Description:
+            Cumulative throughput statistics.
+
+        Params:
+            None
+
+        Return:
+            dict: texts, batches, tokens, padded_tokens, seconds, tokens_per_second and
+                  padding_ratio (padded / real tokens).
+
+        Exceptions:
+            None
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["tokens_per_second"] = (
+            stats["tokens"] / stats["seconds"] if stats["seconds"] else 0.0
+        )
+        stats["padding_ratio"] = (
+            stats["padded_tokens"] / stats["tokens"] if stats["tokens"] else 0.0
+        )
+        return stats
+
+    @staticmethod
+    def _prepare(text: str) -> str:
+        # HuggingFaceEmbeddings replaces newlines before encoding; doing the same keeps
+        # vectors identical to stores and caches built with it under the same model id
+        return text.replace("\n", " ")
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.encode([self._prepare(text) for text in texts]).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.encode(self._prepare(text)).tolist()
@@ -0,0 +1,380 @@
+import os
+import threading
+from time import monotonic
+from typing import Any, Dict, Optional, Tuple
+from langchain_huggingface import HuggingFaceEmbeddings
+from backend.config.config import EmbeddingConfig
+from backend.config.embedding_engine import BucketedEmbeddings
+from backend.config.onnx_embeddings import OnnxEmbeddingExporter
+from backend.config.logging_lib import logger
+
+
+class EmbeddingModelRegistry:
+    """
+    Description:
+        Process-wide, lazily initialised registry of HuggingFace embedding models.
+        Each (model path, device) pair is loaded at most once per process and the
+        same instance is handed to every caller. The "onnx" backend serves an
+        int8-quantized ONNX export of the model instead of PyTorch (CPU only). Loading
+        is guarded by a per-key
+        lock so two different models can load concurrently while concurrent
+        requests for the same model wait for the first load to finish.
+    """
+
+    _registry_lock = threading.Lock()
+    _key_locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+    _models: Dict[Tuple[str, str, str], HuggingFaceEmbeddings] = {}
+    _stats: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+    _engines: Dict[Tuple[str, str, str, int], BucketedEmbeddings] = {}
+
+    BACKENDS = ("torch", "onnx")
+
+    @classmethod
+    def make_key(
+        cls,
+        model_name: str,
+        device: str,
+        backend: str = "torch",
+        quantization: str = "avx2",
+    ) -> Tuple[str, str, str]:
+        """
+        Description:
+            Build the normalised registry key for a model path, device and backend.
+
+        Params:
+            model_name (str): Local path or hub id of the sentence-transformers model.
+            device (str): Torch device string, e.g. "cpu" or "cuda:0".
+            backend (str): "torch" or "onnx".
+            quantization (str): ONNX int8 quantization target (ignored for torch).
+
+        Return:
+            tuple[str, str, str]: The (model, device, backend label) key.
+
+        Exceptions:
+            TypeError: If model_name or device is not a string.
+            ValueError: If backend is not supported.
+        """
+        if not isinstance(model_name, str) or not isinstance(device, str):
+            raise TypeError("model_name and device must be strings")
+        if backend not in cls.BACKENDS:
+            raise ValueError(f"backend must be one of {cls.BACKENDS}")
+        if os.path.exists(model_name):
+            model_name = os.path.normcase(os.path.abspath(model_name))
+        label = "torch" if backend == "torch" else f"onnx-qint8_{quantization}"
+        return model_name, device.lower(), label
+
+    @classmethod
+    def model_id(
+        cls,
+        model_name: str,
+        backend: str = "torch",
+        quantization: str = "avx2",
+    ) -> str:
+        """
+        Description:
+            Identifier of the vectors a model/backend produces, for embedding caches and
+            store manifests. Quantized ONNX vectors differ slightly from PyTorch ones, so
+            they get their own id; the PyTorch id is the plain model name.
+
+        Params:
+            model_name (str): Local path or hub id of the sentence-transformers model.
+            backend (str): "torch" or "onnx".
+            quantization (str): ONNX int8 quantization target.
+
+        Return:
+            str: The identifier.
+
+        Exceptions:
+            ValueError: If backend is not supported.
+        """
+        if backend not in cls.BACKENDS:
+            raise ValueError(f"backend must be one of {cls.BACKENDS}")
+        if backend == "torch":
+            return model_name
+        return f"{model_name}#onnx-qint8_{quantization}"
+
+    @classmethod
+    def get(
+        cls,
+        model_name: str,
+        device: str = "cpu",
+        backend: str = "torch",
+        quantization: str = "avx2",
+    ) -> HuggingFaceEmbeddings:
+        """
+        Description:
+            Return the shared embedding model for (model_name, device, backend), loading
+            it on first use. The "onnx" backend exports and quantizes the model on first
+            use (see OnnxEmbeddingExporter).
+
+        Params:
+            model_name (str): Local path or hub id of the sentence-transformers model.
+            device (str): Torch device string.
+            backend (str): "torch" or "onnx".
+            quantization (str): ONNX int8 quantization target.
+
+        Return:
+            HuggingFaceEmbeddings: The shared embedding model instance.
+
+        Exceptions:
+            TypeError: If model_name or device is not a string.
+            ValueError: If backend is not supported.
+            RuntimeError: If the model cannot be loaded.
+        """
+        key = cls.make_key(model_name, device, backend, quantization)
+
+        model = cls._models.get(key)
+        if model is not None:
+            cls._stats[key]["hits"] += 1
+            return model
+
+        with cls._registry_lock:
+            key_lock = cls._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another thread may have finished loading while we waited
+            model = cls._models.get(key)
+            if model is not None:
+                cls._stats[key]["hits"] += 1
+                return model
+
+            logger.info(f"Loading embedding model {key[0]} on {key[1]} ({key[2]})")
+            start_time = monotonic()
+            try:
+                if backend == "onnx":
+                    model_kwargs = OnnxEmbeddingExporter.model_kwargs(
+                        OnnxEmbeddingExporter.ensure_quantized(
+                            model_name, quantization
+                        ),
+                        device,
+                    )
+                else:
+                    model_kwargs = {"device": device}
+                model = HuggingFaceEmbeddings(
+                    model_name=model_name,
+                    model_kwargs=model_kwargs,
+                )
+            except Exception as e:
+                logger.exception(f"Failed to load embedding model {key[0]}")
+                raise RuntimeError(f"Failed to load embedding model {key[0]}") from e
+            load_seconds = monotonic() - start_time
+
+            cls._stats[key] = {
+                "model_name": key[0],
+                "device": key[1],
+                "backend": key[2],
+                "load_seconds": load_seconds,
+                "param_bytes": cls._param_bytes(model),
+                "hits": 0,
+            }
+            cls._models[key] = model
+            logger.info(
+                f"Loaded embedding model {key[0]} in {load_seconds:.2f}s "
+                f"({cls._stats[key]['param_bytes'] / 1024 ** 2:.1f} MiB of weights)"
+            )
+            return model
+
+    @classmethod
+    def get_engine(
+        cls,
+        model_name: str,
+        device: str = "cpu",
+        max_tokens_per_batch: int = 8192,
+        backend: str = "torch",
+        quantization: str = "avx2",
+    ) -> BucketedEmbeddings:
+        """
+        Description:
+            Return the shared length-bucketed embedding engine for (model_name, device),
+            built on the shared model so throughput stats are process-wide.
+
+        Params:
+            model_name (str): Local path or hub id of the sentence-transformers model.
+            device (str): Torch device string.
+            max_tokens_per_batch (int): Padded token budget per forward pass.
+            backend (str): "torch" or "onnx".
+            quantization (str): ONNX int8 quantization target.
+
+        Return:
+            BucketedEmbeddings: The shared engine.
+
+        Exceptions:
+            TypeError: If model_name or device is not a string.
+            ValueError: If backend is not supported.
+            RuntimeError: If the model cannot be loaded.
+        """
+        embeddings = cls.get(model_name, device, backend, quantization)
+        key = (
+            *cls.make_key(model_name, device, backend, quantization),
+            max_tokens_per_batch,
+        )
+        with cls._registry_lock:
+            engine = cls._engines.get(key)
+            if engine is None:
+                engine = BucketedEmbeddings(
+                    cls.get_client(embeddings),
+                    max_tokens_per_batch=max_tokens_per_batch,
+                    encode_kwargs=embeddings.encode_kwargs,
+                )
+                cls._engines[key] = engine
+        return engine
+
+    @staticmethod
+    def get_client(embeddings: HuggingFaceEmbeddings) -> Any:
+        """
+        Description:
+            Return the SentenceTransformer wrapped by a HuggingFaceEmbeddings instance.
+
+        Params:
+            embeddings (HuggingFaceEmbeddings): The LangChain embedding wrapper.
+
+        Return:
+            SentenceTransformer: The underlying model.
+
+        Exceptions:
+            None
+        """
+        return getattr(embeddings, "_client", None) or getattr(
+            embeddings, "client", None
+        )
+
+    @classmethod
+    def _param_bytes(cls, embeddings: HuggingFaceEmbeddings) -> int:
+        client = cls.get_client(embeddings)
+        try:
+            return sum(p.numel() * p.element_size() for p in client.parameters())
+        except Exception:
+            return 0
+
+    @classmethod
+    def stats(cls) -> Dict[str, Dict[str, Any]]:
+        """
+        Description:
+            Load-time and memory statistics for every model loaded in this process.
+
+        Params:
+            None
+
+        Return:
+            dict: Mapping of "<model>@<device>/<backend>" to load_seconds, param_bytes
+                  and hits.
+
+        Exceptions:
+            None
+        """
+        return {
+            f"{key[0]}@{key[1]}/{key[2]}": dict(value)
+            for key, value in cls._stats.items()
+        }
+
+    @classmethod
+    def clear(cls) -> None:
+        """
+        Description:
+            Drop every cached model so the next call reloads it (mainly for tests and reloads).
+
+        Params:
+            None
+
+        Return:
+            None
+
+        Exceptions:
+            None
+        """
+        with cls._registry_lock:
+            cls._models.clear()
+            cls._stats.clear()
+            cls._engines.clear()
+            cls._key_locks.clear()
+
+
+class EmbeddingModels(EmbeddingConfig):
+    def __init__(self):
+        """
+        Initializes the EmbeddingModels class with the embedding config.
+        """
+        super().__init__()
+
+    def get_embedding_model(
+        self, model_name: Optional[str] = None, device: Optional[str] = None
+    ) -> HuggingFaceEmbeddings:
+        """
+        Returns the process-wide shared HuggingFace embedding model, served by the
+        configured EMBEDDING_BACKEND ("torch" or int8-quantized "onnx").
+
+        :param model_name: Model path or hub id, defaults to EMBEDDING_MODEL_PATH.
+        :param device: Torch device, defaults to EMBEDDING_DEVICE.
+        :return: HuggingFaceEmbeddings instance.
+        """
+        return EmbeddingModelRegistry.get(
+            model_name or self.get_embedding_model_path,
+            device or self.get_embedding_device,
+            self.get_embedding_backend,
+            self.get_embedding_onnx_quantization,
+        )
+
+    def get_sentence_transformer(
+        self, model_name: Optional[str] = None, device: Optional[str] = None
+    ) -> Any:
+        """
+        Returns the SentenceTransformer behind the shared embedding model.
+
+        :param model_name: Model path or hub id, defaults to EMBEDDING_MODEL_PATH.
+        :param device: Torch device, defaults to EMBEDDING_DEVICE.
+        :return: SentenceTransformer instance.
+        """
+        return EmbeddingModelRegistry.get_client(
+            self.get_embedding_model(model_name, device)
+        )
+
+    def get_embedding_engine(
+        self, model_name: Optional[str] = None, device: Optional[str] = None
+    ) -> BucketedEmbeddings:
+        """
+        Returns the shared length-bucketed embedding engine (LangChain Embeddings with
+        token-budgeted batching and tokens/sec stats).
+
+        :param model_name: Model path or hub id, defaults to EMBEDDING_MODEL_PATH.
+        :param device: Torch device, defaults to EMBEDDING_DEVICE.
+        :return: BucketedEmbeddings instance.
+        """
+        return EmbeddingModelRegistry.get_engine(
+            model_name or self.get_embedding_model_path,
+            device or self.get_embedding_device,
+            self.get_embedding_max_tokens_per_batch,
+            self.get_embedding_backend,
+            self.get_embedding_onnx_quantization,
+        )
+
+    def get_embedding_model_id(self, model_name: Optional[str] = None) -> str:
+        """
+        Returns the id of the vectors the configured backend produces, used to key
+        embedding caches and vector store manifests.
+
+        :param model_name: Model path or hub id, defaults to EMBEDDING_MODEL_PATH.
+        :return: string
+        """
+        return EmbeddingModelRegistry.model_id(
+            model_name or self.get_embedding_model_path,
+            self.get_embedding_backend,
+            self.get_embedding_onnx_quantization,
+        )
+
+    @staticmethod
+    def get_registry_stats() -> Dict[str, Dict[str, Any]]:
+        """
+        Returns load-time and memory stats for all loaded embedding models.
+
+        :return: dictionary keyed by "<model>@<device>/<backend>".
+        """
+        return EmbeddingModelRegistry.stats()
+
+
+# Example usage:
+if __name__ == "__main__":
+    models = EmbeddingModels()
+    first = models.get_embedding_model()
+    second = models.get_embedding_model()
+    print(first is second)
+    print(models.get_registry_stats())
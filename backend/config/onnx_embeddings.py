@@ -0,0 +1,239 @@
+import os
+from time import monotonic
+from typing import Any, Dict, List
+import numpy as np
+from backend.config.logging_lib import logger
+
+
+class OnnxEmbeddingExporter:
+    """
+    Description:
+        Exports a sentence-transformers model to ONNX and int8-quantizes it (dynamic
+        quantization via optimum / onnxruntime) so it can be served with
+        SentenceTransformer(backend="onnx") on CPU. The quantized graph is written next
+        to the model as `onnx/model_qint8_<quantization>.onnx` and reused afterwards;
+        the tokenizer is the model's own, so inputs are identical to the PyTorch path.
+        Requires `sentence-transformers>=3.2` and `optimum[onnxruntime]`.
+    """
+
+    QUANTIZATIONS = ("arm64", "avx2", "avx512", "avx512_vnni")
+
+    @classmethod
+    def quantized_file_name(cls, quantization: str) -> str:
+        """
+        Description:
+            Relative path of the quantized graph inside the model folder.
+
+        Params:
+            quantization (str): One of QUANTIZATIONS.
+
+        Return:
+            str: e.g. "onnx/model_qint8_avx2.onnx".
+
+        Exceptions:
+            ValueError: If quantization is not supported.
+        """
+        if quantization not in cls.QUANTIZATIONS:
+            raise ValueError(f"quantization must be one of {cls.QUANTIZATIONS}")
+        return f"onnx/model_qint8_{quantization}.onnx"
+
+    @classmethod
+    def ensure_quantized(cls, model_path: str, quantization: str = "avx2") -> str:
+        """
+        Description:
+            Export and quantize the model once; later calls return the existing graph.
+
+        Params:
+            model_path (str): Local folder of the sentence-transformers model.
+            quantization (str): Target instruction set for the int8 kernels.
+
+        Return:
+            str: The quantized graph's path relative to model_path.
+
+        Exceptions:
+            FileNotFoundError: If model_path is not a local folder.
+            ImportError: If the ONNX export dependencies are not installed.
+        """
+        file_name = cls.quantized_file_name(quantization)
+        if not os.path.isdir(model_path):
+            raise FileNotFoundError(
+                f"ONNX export needs a local model folder, got {model_path}"
+            )
+        if os.path.exists(os.path.join(model_path, file_name)):
+            return file_name
+
+        from sentence_transformers import (
+            SentenceTransformer,
+            export_dynamic_quantized_onnx_model,
+        )
+
+        logger.info(f"Exporting {model_path} to int8 ONNX ({quantization})")
+        start_time = monotonic()
+        # Loading with backend="onnx" exports onnx/model.onnx when it is missing
+        model = SentenceTransformer(model_path, device="cpu", backend="onnx")
+        if not os.path.exists(os.path.join(model_path, "onnx", "model.onnx")):
+            model.save_pretrained(model_path)
+        export_dynamic_quantized_onnx_model(model, quantization, model_path)
+        logger.info(
+            f"Exported {file_name} in {monotonic() - start_time:.2f}s "
+            f"({os.path.getsize(os.path.join(model_path, file_name)) / 1024 ** 2:.1f} MiB)"
+        )
+        return file_name
+
+    @staticmethod
+    def model_kwargs(file_name: str, device: str = "cpu") -> Dict[str, Any]:
+        """
+        Description:
+            SentenceTransformer kwargs (as passed through HuggingFaceEmbeddings.model_kwargs)
+            that load the quantized ONNX graph.
+
+        Params:
+            file_name (str): Graph path relative to the model folder.
+            device (str): Device; ONNX Runtime's CPU provider is used for "cpu".
+
+        Return:
+            dict: The kwargs.
+
+        Exceptions:
+            None
+        """
+        return {
+            "device": device,
+            "backend": "onnx",
+            "model_kwargs": {"file_name": file_name},
+        }
+
+    @classmethod
+    def _load_pair(cls, model_path: str, quantization: str):
+        from sentence_transformers import SentenceTransformer
+
+        torch_model = SentenceTransformer(model_path, device="cpu")
+        onnx_model = SentenceTransformer(
+            model_path,
+            **cls.model_kwargs(cls.ensure_quantized(model_path, quantization)),
+        )
+        return torch_model, onnx_model
+
+    @classmethod
+    def parity_check(
+        cls,
+        model_path: str,
+        texts: List[str],
+        quantization: str = "avx2",
+        min_cosine: float = 0.99,
+    ) -> Dict[str, Any]:
+        """
+        Description:
+            Compare quantized ONNX embeddings with the PyTorch ones text by text.
+
+        Params:
+            model_path (str): Local folder of the sentence-transformers model.
+            texts (list[str]): Sample texts (ideally real chunks, quotes and queries).
+            quantization (str): Quantized graph to check.
+            min_cosine (float): Minimum cosine similarity each text must reach.
+
+        Return:
+            dict: min_cosine, mean_cosine, failures (texts below the threshold) and passed.
+
+        Exceptions:
+            ValueError: If texts is empty.
+        """
+        if not texts:
+            raise ValueError("texts must not be empty")
+        torch_model, onnx_model = cls._load_pair(model_path, quantization)
+        expected = torch_model.encode(texts, normalize_embeddings=True)
+        actual = onnx_model.encode(texts, normalize_embeddings=True)
+        cosines = np.sum(expected * actual, axis=1)
+        failures = [text for text, cosine in zip(texts, cosines) if cosine < min_cosine]
+        report = {
+            "min_cosine": float(cosines.min()),
+            "mean_cosine": float(cosines.mean()),
+            "failures": failures,
+            "passed": not failures,
+        }
+        logger.info(
+            f"ONNX parity ({quantization}): min cosine {report['min_cosine']:.4f}, "
+            f"mean {report['mean_cosine']:.4f}, {len(failures)} below {min_cosine}"
+        )
+        return report
+
+    @classmethod
+    def benchmark(
+        cls,
+        model_path: str,
+        texts: List[str],
+        quantization: str = "avx2",
+        batch_size: int = 32,
+        repeats: int = 3,
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Description:
+            Throughput of PyTorch vs quantized ONNX on the same texts, plus single-query
+            latency (the retrieval hot path).
+
+        Params:
+            model_path (str): Local folder of the sentence-transformers model.
+            texts (list[str]): Benchmark texts.
+            quantization (str): Quantized graph to benchmark.
+            batch_size (int): Encode batch size.
+            repeats (int): Timed repetitions (best run is reported).
+
+        Return:
+            dict: Per backend, texts_per_second and query_ms.
+
+        Exceptions:
+            ValueError: If texts is empty.
+        """
+        if not texts:
+            raise ValueError("texts must not be empty")
+        report = {}
+        for name, model in zip(
+            ("torch", "onnx"), cls._load_pair(model_path, quantization)
+        ):
+            model.encode(texts[:batch_size], batch_size=batch_size)  # warm-up
+            best = min(
+                cls._time(lambda: model.encode(texts, batch_size=batch_size))
+                for _ in range(repeats)
+            )
+            query = min(cls._time(lambda: model.encode(texts[0])) for _ in range(20))
+            report[name] = {
+                "texts_per_second": len(texts) / best,
+                "query_ms": query * 1000,
+            }
+            logger.info(
+                f"{name}: {report[name]['texts_per_second']:.1f} texts/s, "
+                f"{report[name]['query_ms']:.2f} ms/query"
+            )
+        return report
+
+    @staticmethod
+    def _time(fn) -> float:
+        start_time = monotonic()
+        fn()
+        return monotonic() - start_time
+
+
+# Example usage:
+if __name__ == "__main__":
+    from backend.config.config import EmbeddingConfig
+
+    embedding_config = EmbeddingConfig()
+    sample_texts = [
+        "Harry Potter lived in the cupboard under the stairs.",
+        '"I solemnly swear that I am up to no good."',
+        "Who is the headmaster of Hogwarts?",
+    ] * 64
+    print(
+        OnnxEmbeddingExporter.parity_check(
+            embedding_config.get_embedding_model_path,
+            sample_texts,
+            embedding_config.get_embedding_onnx_quantization,
+        )
+    )
+    print(
+        OnnxEmbeddingExporter.benchmark(
+            embedding_config.get_embedding_model_path,
+            sample_texts,
+            embedding_config.get_embedding_onnx_quantization,
+        )
+    )
@@ -0,0 +1,350 @@
+import difflib
+import importlib.util
+import os
+from abc import ABC, abstractmethod
+from time import monotonic
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple, Union
+from backend.config.logging_lib import logger
+
+# A file path or a binary file-like object (e.g. a Streamlit upload)
+PdfSource = Union[str, IO[bytes]]
+
+
+class PdfTextExtractor(ABC):
+    """
+    Description:
+        Common interface of the PDF text backends. Every backend extracts page text
+        from a path or binary file-like object and reports failures per page
+        instead of raising, so callers can decide what a missing page means. The
+        backend library is imported on first use, so only the backends actually
+        used need to be installed.
+    """
+
+    name = ""
+    module = ""
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """
+        Description:
+            Whether the backend's library is installed.
+
+        Params:
+            None
+
+        Return:
+            bool: True if the backend can be used.
+
+        Exceptions:
+            None
+        """
+        return importlib.util.find_spec(cls.module) is not None
+
+    @staticmethod
+    def _rewind(source: PdfSource) -> PdfSource:
+        # File-like sources may have been read already (e.g. by page_count)
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return source
+
+    @abstractmethod
+    def page_count(self, source: PdfSource) -> int:
+        """
+        Description:
+            Number of pages in the PDF.
+
+        Params:
+            source (str or file): PDF path or binary file-like object.
+
+        Return:
+            int: Page count.
+
+        Exceptions:
+            FileNotFoundError: If the PDF does not exist.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_pages(
+        self, source: PdfSource, start: int = 0, stop: Optional[int] = None
+    ) -> Iterator[Tuple[int, str, Optional[str]]]:
+        """
+        Description:
+            Extract pages [start, stop) one at a time.
+
+        Params:
+            source (str or file): PDF path or binary file-like object.
+            start (int): First page (inclusive).
+            stop (int, optional): Last page (exclusive); defaults to the page count.
+
+        Return:
+            Iterator[tuple[int, str, str or None]]: (page, text, error) per page;
+                failed pages have empty text and the error message.
+
+        Exceptions:
+            FileNotFoundError: If the PDF does not exist.
+        """
+        raise NotImplementedError
+
+    def extract_pages(self, source: PdfSource) -> List[str]:
+        """
+        Description:
+            Text of every page; failed pages are logged and left empty.
+
+        Params:
+            source (str or file): PDF path or binary file-like object.
+
+        Return:
+            list[str]: Page texts in order.
+
+        Exceptions:
+            FileNotFoundError: If the PDF does not exist.
+        """
+        texts = []
+        for page, text, error in self.iter_pages(source):
+            if error is not None:
+                logger.warning(f"{self.name}: failed to extract page {page}: {error}")
+            texts.append(text)
+        return texts
+
+    def extract_text(self, source: PdfSource, separator: str = "\n") -> str:
+        """
+        Description:
+            Text of the whole document.
+
+        Params:
+            source (str or file): PDF path or binary file-like object.
+            separator (str): Joined between pages.
+
+        Return:
+            str: The document text, stripped.
+
+        Exceptions:
+            FileNotFoundError: If the PDF does not exist.
+        """
+        return separator.join(self.extract_pages(source)).strip()
+
+
+class PdfplumberExtractor(PdfTextExtractor):
+    """pdfplumber: layout-aware and the most faithful, but pure Python and slow."""
+
+    name = "pdfplumber"
+    module = "pdfplumber"
+
+    def page_count(self, source: PdfSource) -> int:
+        import pdfplumber
+
+        with pdfplumber.open(self._rewind(source)) as pdf:
+            return len(pdf.pages)
+
+    def iter_pages(
+        self, source: PdfSource, start: int = 0, stop: Optional[int] = None
+    ) -> Iterator[Tuple[int, str, Optional[str]]]:
+        import pdfplumber
+
+        with pdfplumber.open(self._rewind(source)) as pdf:
+            stop = len(pdf.pages) if stop is None else stop
+            for i in range(start, stop):
+                try:
+                    yield i, pdf.pages[i].extract_text() or "", None
+                except Exception as e:
+                    yield i, "", repr(e)
+
+
+class PyPDF2Extractor(PdfTextExtractor):
+    """PyPDF2: pure Python, faster than pdfplumber, looser word spacing."""
+
+    name = "pypdf2"
+    module = "PyPDF2"
+
+    def page_count(self, source: PdfSource) -> int:
+        from PyPDF2 import PdfReader
+
+        return len(PdfReader(self._rewind(source)).pages)
+
+    def iter_pages(
+        self, source: PdfSource, start: int = 0, stop: Optional[int] = None
+    ) -> Iterator[Tuple[int, str, Optional[str]]]:
+        from PyPDF2 import PdfReader
+
+        pages = PdfReader(self._rewind(source)).pages
+        stop = len(pages) if stop is None else stop
+        for i in range(start, stop):
+            try:
+                yield i, pages[i].extract_text() or "", None
+            except Exception as e:
+                yield i, "", repr(e)
+
+
+class PyMuPDFExtractor(PdfTextExtractor):
+    """PyMuPDF (fitz): native MuPDF, typically an order of magnitude faster."""
+
+    name = "pymupdf"
+    module = "fitz"
+
+    def _open(self, source: PdfSource) -> Any:
+        import fitz
+
+        if isinstance(source, str):
+            return fitz.open(source)
+        return fitz.open(stream=self._rewind(source).read(), filetype="pdf")
+
+    def page_count(self, source: PdfSource) -> int:
+        with self._open(source) as doc:
+            return doc.page_count
+
+    def iter_pages(
+        self, source: PdfSource, start: int = 0, stop: Optional[int] = None
+    ) -> Iterator[Tuple[int, str, Optional[str]]]:
+        with self._open(source) as doc:
+            stop = doc.page_count if stop is None else stop
+            for i in range(start, stop):
+                try:
+                    yield i, doc[i].get_text() or "", None
+                except Exception as e:
+                    yield i, "", repr(e)
+
+
+EXTRACTORS = {
+    cls.name: cls for cls in (PdfplumberExtractor, PyPDF2Extractor, PyMuPDFExtractor)
+}
+
+
+def get_pdf_extractor(name: Optional[str] = None) -> PdfTextExtractor:
+    """
+    Description:
+        The PDF text extractor for a backend name, defaulting to the PDF_EXTRACTOR
+        setting.
+
+    Params:
+        name (str, optional): One of EXTRACTORS.
+
+    Return:
+        PdfTextExtractor: The extractor.
+
+    Exceptions:
+        ValueError: If the backend is unknown.
+        ImportError: If the backend's library is not installed.
+    """
+    if name is None:
+        from backend.config.config import PdfConfig
+
+        name = PdfConfig().get_pdf_extractor
+    if name not in EXTRACTORS:
+        raise ValueError(
+            f"Unknown PDF extractor {name!r}; expected one of {list(EXTRACTORS)}"
+        )
+    extractor_cls = EXTRACTORS[name]
+    if not extractor_cls.is_available():
+        raise ImportError(
+            f"PDF extractor {name!r} needs the {extractor_cls.module!r} package"
+        )
+    return extractor_cls()
+
+
+def text_fidelity(pages: List[str], reference_pages: List[str]) -> float:
+    """
+    Description:
+        Mean per-page word-sequence similarity (difflib ratio) against a reference
+        extraction; 1.0 means the same words in the same order on every page.
+
+    Params:
+        pages (list[str]): Page texts to score.
+        reference_pages (list[str]): Reference page texts.
+
+    Return:
+        float: Similarity in [0, 1].
+
+    Exceptions:
+        None
+    """
+    if not reference_pages:
+        return 1.0 if not pages else 0.0
+    total = 0.0
+    for i, reference in enumerate(reference_pages):
+        words = pages[i].split() if i < len(pages) else []
+        total += difflib.SequenceMatcher(
+            None, words, reference.split(), autojunk=False
+        ).ratio()
+    return total / len(reference_pages)
+
+
+def benchmark_extractors(
+    paths: List[str],
+    names: Optional[List[str]] = None,
+    reference: str = "pdfplumber",
+) -> List[Dict[str, Any]]:
+    """
+    Description:
+        Extract every PDF with every backend and report throughput and text
+        fidelity against the reference backend. Backends that are not installed
+        are reported as unavailable.
+
+    Params:
+        paths (list[str]): PDFs to benchmark.
+        names (list[str], optional): Backends to compare; defaults to all.
+        reference (str): Backend whose text scores 1.0 fidelity.
+
+    Return:
+        list[dict]: One row per (path, backend) with available, pages, seconds,
+                    pages_per_second, chars, failed_pages and fidelity.
+
+    Exceptions:
+        ValueError: If a backend name is unknown.
+        ImportError: If the reference backend is not installed.
+    """
+    names = names or list(EXTRACTORS)
+    rows = []
+    for path in paths:
+        reference_pages = get_pdf_extractor(reference).extract_pages(path)
+        for name in names:
+            if name not in EXTRACTORS:
+                raise ValueError(f"Unknown PDF extractor {name!r}")
+            row: Dict[str, Any] = {"path": path, "extractor": name}
+            if not EXTRACTORS[name].is_available():
+                rows.append({**row, "available": False})
+                continue
+            extractor = get_pdf_extractor(name)
+            start_time = monotonic()
+            results = list(extractor.iter_pages(path))
+            seconds = monotonic() - start_time
+            pages = [text for _, text, _ in results]
+            rows.append(
+                {
+                    **row,
+                    "available": True,
+                    "pages": len(pages),
+                    "seconds": seconds,
+                    "pages_per_second": len(pages) / seconds if seconds else 0.0,
+                    "chars": sum(len(text) for text in pages),
+                    "failed_pages": sum(error is not None for _, _, error in results),
+                    "fidelity": text_fidelity(pages, reference_pages),
+                }
+            )
+            logger.info(f"PDF extractor benchmark: {rows[-1]}")
+    return rows
+
+
+# Example usage:
+#   python -m backend.config.pdf_extractors [pdf ...]
+if __name__ == "__main__":
+    import sys
+
+    sample_paths = sys.argv[1:] or [
+        os.path.join(
+            os.path.dirname(__file__),
+            "..",
+            "rag_optimization",
+            "Harry_Potter_Book_1_The_Sorcerers_Stone.pdf",
+        )
+    ]
+    print(f"{'extractor':<12} {'pages':>6} {'pages/s':>9} {'chars':>9} {'fidelity':>9}")
+    for result in benchmark_extractors(sample_paths):
+        if not result["available"]:
+            print(f"{result['extractor']:<12} (not installed)")
+            continue
+        print(
+            f"{result['extractor']:<12} {result['pages']:>6} "
+            f"{result['pages_per_second']:>9.1f} {result['chars']:>9} "
+            f"{result['fidelity']:>9.3f}"
+        )
@@ -0,0 +1,232 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from backend.config.logging_lib import logger
+from backend.rag_optimization.embedding_cache import EmbeddingCache
+
+
+class AnswerCache:
+    """
+    Description:
+        On-disk exact-match cache of answers. The key is the sha256 of the normalized
+        question (NFC, collapsed whitespace, case-folded), the sha256 of the context
+        the answer was generated from and the model settings (deployment,
+        temperature, prompt, ...). The same question over identical retrieved
+        context and settings is therefore answered once. Any change to the context
+        or the settings produces a new key.
+
+        Each entry is its own JSON file, written atomically. The cache is bounded to
+        `max_bytes` on disk: when a write pushes it over, the least recently used
+        entries (by file modification time, refreshed on every hit) are deleted.
+
+    Params:
+        cache_dir (str): Folder holding the cached answers.
+        max_bytes (int): Maximum total size of the entries.
+    """
+
+    def __init__(self, cache_dir: str = "answer_cache", max_bytes: int = 50 * 2**20):
+        if not isinstance(cache_dir, str):
+            raise TypeError("cache_dir must be a string")
+        if not isinstance(max_bytes, int) or max_bytes < 1:
+            raise ValueError("max_bytes must be a positive integer")
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # Total entry size, scanned from disk on first write
+        self._size: Optional[int] = None
+
+    @staticmethod
+    def normalize_question(question: str) -> str:
+        """
+        Description:
+            Normalize a question for exact matching: NFC form, collapsed whitespace,
+            case-folded.
+
+        Params:
+            question (str): Raw question.
+
+        Return:
+            str: Normalized question.
+
+        Exceptions:
+            None
+        """
+        return EmbeddingCache.normalize_text(question).casefold()
+
+    @classmethod
+    def make_key(cls, question: str, context: str, settings: Dict[str, Any]) -> str:
+        """
+        Description:
+            Cache key for an answer.
+
+        Params:
+            question (str): The question.
+            context (str): The aggregated context the answer is generated from.
+            settings (dict): JSON-serializable model settings.
+
+        Return:
+            str: Hex digest.
+
+        Exceptions:
+            TypeError: If settings is not JSON-serializable.
+        """
+        payload = json.dumps(
+            {
+                "question": cls.normalize_question(question),
+                "context": hashlib.sha256(context.encode("utf-8")).hexdigest(),
+                "settings": settings,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(".json"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Description:
+            Cached answer for a key, if any; a hit marks the entry as recently used.
+
+        Params:
+            key (str): Key from make_key().
+
+        Return:
+            str or None: The answer.
+
+        Exceptions:
+            None
+        """
+        path = self._path(key)
+        answer = None
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    answer = json.load(f)["answer"]
+                os.utime(path)
+            except (OSError, ValueError, KeyError):
+                logger.warning(f"Answer cache entry unreadable, ignoring: {path}")
+        with self._lock:
+            if answer is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return answer
+
+    def put(self, key: str, answer: str, question: str = "") -> None:
+        """
+        Description:
+            Store an answer, then evict least recently used entries while the cache
+            is over max_bytes.
+
+        Params:
+            key (str): Key from make_key().
+            answer (str): The answer text.
+            question (str): The question (kept for inspection).
+
+        Return:
+            None
+
+        Exceptions:
+            OSError: If the entry cannot be written.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"answer": answer, "question": question}, f)
+        size = os.path.getsize(tmp_path)
+        old_size = os.path.getsize(path) if os.path.exists(path) else 0
+        os.replace(tmp_path, path)
+        with self._lock:
+            if self._size is None:
+                self._size = sum(entry[1] for entry in self._entries())
+            else:
+                self._size += size - old_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def delete(self, key: str) -> None:
+        """
+        Description:
+            Remove an entry, if present.
+
+        Params:
+            key (str): Key from make_key().
+
+        Return:
+            None
+
+        Exceptions:
+            OSError: If the entry exists but cannot be removed.
+        """
+        path = self._path(key)
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        with self._lock:
+            if self._size is not None:
+                self._size -= size
+
+    def _evict(self) -> None:
+        # Rescan: other processes may share the folder
+        entries = sorted(self._entries())
+        self._size = sum(entry[1] for entry in entries)
+        for _, size, path in entries:
+            if self._size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._size -= size
+            self.evictions += 1
+        logger.info(
+            f"Answer cache evicted down to {self._size} bytes "
+            f"({self.evictions} evictions so far)"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Description:
+            Hit-rate and eviction counters.
+
+        Params:
+            None
+
+        Return:
+            dict: hits, misses, hit_rate, evictions and size_bytes (None before
+                  the first write).
+
+        Exceptions:
+            None
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "size_bytes": self._size,
+            }
@@ -13,6 +13,10 @@ class QualitativeRetrievalAnswerGraphState(TypedDict):
     question: str
     context: str
     answer: str
+    # False bypasses the answer cache for this question
+    use_answer_cache: bool
+    # The user's question, set once rewrite_question has replaced "question"
+    original_question: str
 
 
 class GraphRetrieval(RetrieveData):
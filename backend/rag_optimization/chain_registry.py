@@ -0,0 +1,161 @@
+import threading
+from time import monotonic
+from typing import Any, Callable, Dict, List
+from backend.config.logging_lib import logger
+
+
+class ChainRegistry:
+    """
+    Description:
+        Process-wide registry of compiled LCEL chains. Each chain (prompt template,
+        output parser, LLM binding) is built once, the first time get() asks for
+        it, and the same object is returned to every later request; chains are
+        stateless, so concurrent requests can share them.
+
+        The registry measures what this saves: the build time of every chain and
+        how often it was reused. stats() reports the time saved as
+        build_seconds * hits, the cost the old build-per-call code paid on every
+        request.
+    """
+
+    _chains: Dict[str, Any] = {}
+    _stats: Dict[str, Dict[str, Any]] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, name: str, builder: Callable[[], Any]) -> Any:
+        """
+        Description:
+            The chain registered under name, built with builder on first use.
+
+        Params:
+            name (str): Chain name, unique per process.
+            builder (Callable[[], Any]): Builds the chain; called at most once per name.
+
+        Return:
+            Any: The compiled chain.
+
+        Exceptions:
+            Exception: Whatever builder raises; nothing is registered then.
+        """
+        chain = cls._chains.get(name)
+        if chain is not None:
+            with cls._lock:
+                cls._stats[name]["hits"] += 1
+            return chain
+        with cls._lock:
+            # Another request may have built it while we waited for the lock
+            if name in cls._chains:
+                cls._stats[name]["hits"] += 1
+                return cls._chains[name]
+            start_time = monotonic()
+            chain = builder()
+            seconds = monotonic() - start_time
+            cls._chains[name] = chain
+            cls._stats[name] = {"build_seconds": seconds, "hits": 0}
+        logger.info(f"Built chain {name} in {seconds * 1000:.2f} ms")
+        return chain
+
+    @classmethod
+    def clear(cls) -> None:
+        """
+        Description:
+            Drop every chain and its statistics (e.g. after the LLM configuration changes).
+
+        Params:
+            None
+
+        Return:
+            None
+
+        Exceptions:
+            None
+        """
+        with cls._lock:
+            cls._chains.clear()
+            cls._stats.clear()
+
+    @classmethod
+    def stats(cls) -> List[Dict[str, Any]]:
+        """
+        Description:
+            Construction cost and reuse of every registered chain.
+
+        Params:
+            None
+
+        Return:
+            list[dict]: One row per chain with name, build_seconds, hits and
+                        saved_seconds (build time avoided by reuse).
+
+        Exceptions:
+            None
+        """
+        with cls._lock:
+            return [
+                {
+                    "name": name,
+                    "build_seconds": entry["build_seconds"],
+                    "hits": entry["hits"],
+                    "saved_seconds": entry["build_seconds"] * entry["hits"],
+                }
+                for name, entry in cls._stats.items()
+            ]
+
+    @classmethod
+    def format_stats(cls) -> str:
+        """
+        Description:
+            Human-readable table of stats().
+
+        Params:
+            None
+
+        Return:
+            str: The table.
+
+        Exceptions:
+            None
+        """
+        rows = cls.stats()
+        lines = [f"{'chain':<32} {'build ms':>9} {'hits':>6} {'saved ms':>9}"]
+        for row in rows:
+            lines.append(
+                f"{row['name']:<32} {row['build_seconds'] * 1000:>9.2f} "
+                f"{row['hits']:>6} {row['saved_seconds'] * 1000:>9.2f}"
+            )
+        lines.append(
+            f"total saved: {sum(row['saved_seconds'] for row in rows) * 1000:.2f} ms"
+        )
+        return "\n".join(lines)
+
+
+# Example usage (needs the Azure OpenAI settings):
+#   python -m backend.rag_optimization.chain_registry [requests]
+if __name__ == "__main__":
+    import sys
+    from backend.rag_optimization.retrieve_data import RetrieveData
+
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    builders = {
+        "rewrite_question": RetrieveData._build_rewrite_question_chain,
+        "answer_question_from_context": RetrieveData._build_answer_question_from_context_chain,
+        "is_relevant_content": RetrieveData._build_is_relevant_content_chain,
+        "is_grounded_on_facts": RetrieveData._build_is_grounded_on_facts_chain,
+        "can_be_answered": RetrieveData._build_can_be_answered_chain,
+        "keep_only_relevant_content": RetrieveData._build_keep_only_relevant_content_chain,
+    }
+    for name, builder in builders.items():
+        start_time = monotonic()
+        for _ in range(requests):
+            builder()
+        rebuild_seconds = monotonic() - start_time
+        start_time = monotonic()
+        for _ in range(requests):
+            ChainRegistry.get(name, builder)
+        registry_seconds = monotonic() - start_time
+        print(
+            f"{name}: build per request {rebuild_seconds / requests * 1000:.3f} ms, "
+            f"registry per request {registry_seconds / requests * 1000:.3f} ms"
+        )
+    print(ChainRegistry.format_stats())
@@ -0,0 +1,230 @@
+import json
+import os
+from bisect import bisect_right
+from typing import Any, Dict, Iterator, List, Optional
+import regex as re
+from langchain_core.documents import Document
+from backend.config.logging_lib import logger
+from backend.rag_optimization.pdf_page_cache import PdfPageCache
+
+
+class ChapterIndex:
+    """
+    Description:
+        Page and character-offset index of a book's chapters. Each entry records the
+        chapter number, its heading, its [start, end) offsets in the joined book text
+        (PdfPageCache.full_text) and the pages it spans, so chapter text is sliced out
+        of the cached pages only when it is needed instead of holding every chapter
+        in memory. The index is persisted as `<cache_dir>/<sha256>.json` next to the
+        page cache and rebuilt when the chapter pattern changes.
+
+        Chapter documents carry the entry as metadata
+        {"source", "chapter", "title", "page_start", "page_end", "start", "end"},
+        which flows into their summaries; chapter_at() maps any book offset (a chunk
+        or a quote) back to its chapter for chapter-scoped retrieval filters.
+
+    Params:
+        path (str): PDF path.
+        entries (list[dict]): Chapter entries in book order.
+        page_cache (PdfPageCache, optional): Page cache the offsets refer to.
+    """
+
+    # A chapter starts at its heading and runs to the next heading (or the book's end)
+    PATTERN = r"CHAPTER\s[A-Z]+(?:\s[A-Z]+)*"
+
+    def __init__(
+        self,
+        path: str,
+        entries: List[Dict[str, Any]],
+        page_cache: Optional[PdfPageCache] = None,
+    ):
+        self.path = path
+        self.entries = entries
+        self.page_cache = page_cache or PdfPageCache()
+        self._starts = [entry["start"] for entry in entries]
+        self._by_chapter = {entry["chapter"]: entry for entry in entries}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @classmethod
+    def build_entries(cls, pages: List[Document]) -> List[Dict[str, Any]]:
+        """
+        Description:
+            Find the chapter headings in the joined page text.
+
+        Params:
+            pages (list[Document]): Pages from PdfPageCache.get_pages().
+
+        Return:
+            list[dict]: Chapter entries in book order.
+
+        Exceptions:
+            None
+        """
+        text = PdfPageCache.full_text(pages)
+        page_offsets = [page.metadata["offset"] for page in pages]
+        headings = list(re.finditer(cls.PATTERN, text))
+        entries = []
+        for i, heading in enumerate(headings):
+            start = heading.start()
+            end = headings[i + 1].start() if i + 1 < len(headings) else len(text)
+            entries.append(
+                {
+                    "chapter": i + 1,
+                    "title": " ".join(heading.group(0).split()),
+                    "start": start,
+                    "end": end,
+                    "page_start": bisect_right(page_offsets, start) - 1,
+                    "page_end": bisect_right(page_offsets, end - 1) - 1,
+                }
+            )
+        return entries
+
+    @classmethod
+    def load_or_build(
+        cls,
+        page_cache: PdfPageCache,
+        path: str,
+        cache_dir: str = "chapter_index",
+    ) -> "ChapterIndex":
+        """
+        Description:
+            The book's chapter index, read from disk or built from the cached pages.
+
+        Params:
+            page_cache (PdfPageCache): Page cache holding the book.
+            path (str): PDF path.
+            cache_dir (str): Folder holding persisted indexes.
+
+        Return:
+            ChapterIndex: The index.
+
+        Exceptions:
+            FileNotFoundError: If the PDF does not exist.
+        """
+        index_path = os.path.join(cache_dir, f"{page_cache.file_key(path)}.json")
+        if os.path.exists(index_path):
+            try:
+                with open(index_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if (
+                    data.get("pattern") == cls.PATTERN
+                    and data.get("extractor") == page_cache.extractor_name
+                ):
+                    return cls(path, data["chapters"], page_cache)
+            except (OSError, ValueError, KeyError):
+                logger.warning(f"Chapter index unreadable, rebuilding: {index_path}")
+
+        entries = cls.build_entries(page_cache.get_pages(path))
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "pattern": cls.PATTERN,
+                    "extractor": page_cache.extractor_name,
+                    "chapters": entries,
+                },
+                f,
+            )
+        os.replace(tmp_path, index_path)
+        logger.info(f"Indexed {len(entries)} chapters of {path}")
+        return cls(path, entries, page_cache)
+
+    def fingerprint(self) -> Dict[str, Any]:
+        """
+        Description:
+            Identity of the chapter split: work derived from it (summaries, quotes'
+            chapter metadata) is stale when the fingerprint changes.
+
+        Params:
+            None
+
+        Return:
+            dict: pattern, extractor and number of chapters.
+
+        Exceptions:
+            None
+        """
+        return {
+            "pattern": self.PATTERN,
+            "extractor": self.page_cache.extractor_name,
+            "chapters": len(self.entries),
+        }
+
+    def get_text(self, chapter: int) -> str:
+        """
+        Description:
+            Text of one chapter, joined from its pages only.
+
+        Params:
+            chapter (int): Chapter number.
+
+        Return:
+            str: The chapter text.
+
+        Exceptions:
+            KeyError: If the chapter does not exist.
+        """
+        entry = self._by_chapter[chapter]
+        pages = self.page_cache.get_pages(self.path)
+        span = pages[entry["page_start"] : entry["page_end"] + 1]
+        base = span[0].metadata["offset"]
+        text = PdfPageCache.full_text(span)
+        return text[entry["start"] - base : entry["end"] - base]
+
+    def get_document(self, chapter: int) -> Document:
+        """
+        Description:
+            One chapter as a Document with its index entry as metadata.
+
+        Params:
+            chapter (int): Chapter number.
+
+        Return:
+            Document: The chapter.
+
+        Exceptions:
+            KeyError: If the chapter does not exist.
+        """
+        return Document(
+            page_content=self.get_text(chapter),
+            metadata={"source": self.path, **self._by_chapter[chapter]},
+        )
+
+    def iter_documents(self) -> Iterator[Document]:
+        """
+        Description:
+            Chapter documents one at a time, in book order.
+
+        Params:
+            None
+
+        Return:
+            Iterator[Document]: The chapters.
+
+        Exceptions:
+            None
+        """
+        for entry in self.entries:
+            yield self.get_document(entry["chapter"])
+
+    def chapter_at(self, offset: int) -> Optional[Dict[str, Any]]:
+        """
+        Description:
+            The chapter containing a book text offset.
+
+        Params:
+            offset (int): Offset into the joined book text.
+
+        Return:
+            dict or None: The chapter entry, or None before the first chapter.
+
+        Exceptions:
+            None
+        """
+        i = bisect_right(self._starts, offset) - 1
+        if i < 0 or offset >= self.entries[i]["end"]:
+            return None
+        return self.entries[i]
@@ -0,0 +1,447 @@
+import asyncio
+import glob
+import heapq
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from time import monotonic
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_community.vectorstores import FAISS
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from backend.config.azure_models import AzureOpenAIModels
+from backend.config.logging_lib import logger
+from backend.rag_optimization.encoding import EncodeEmbeddings
+from backend.rag_optimization.llm_scheduler import LLMScheduler
+from backend.rag_optimization.pdf_extraction import ParallelPdfExtractor
+from backend.rag_optimization.pdf_page_cache import PdfPageCache
+from backend.rag_optimization.step_1_preprocessing import ProcessDocument
+from backend.rag_optimization.vector_store_manifest import VectorStoreManifest
+
+SHARD_MANIFEST_FILE = "vector_store_manifest.json"
+CORPUS_MANIFEST_FILE = "corpus_manifest.json"
+
+
+async def _ingest_shard_async(
+    shard_id: int,
+    pdf_paths: List[str],
+    shard_dir: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    num_shards: int,
+) -> Dict[str, Any]:
+    start_time = monotonic()
+    # Shards run side by side: split the CPUs for page extraction and the
+    # tokens-per-minute budget between them
+    page_cache = PdfPageCache(
+        extractor=ParallelPdfExtractor(
+            num_workers=max(1, (os.cpu_count() or 1) // num_shards)
+        )
+    )
+    azure_config = AzureOpenAIModels()
+    tokens_per_minute = azure_config.get_azure_openai_tokens_per_minute
+    scheduler = LLMScheduler(
+        max_in_flight=azure_config.get_azure_openai_max_in_flight,
+        tokens_per_minute=(
+            max(1, tokens_per_minute // num_shards) if tokens_per_minute else None
+        ),
+    )
+    encoder = EncodeEmbeddings(page_cache=page_cache)
+    # The embedding cache is single-process, so every shard keeps its own
+    embeddings = EncodeEmbeddings.get_embeddings(
+        os.path.join(shard_dir, "embedding_cache")
+    )
+    chunks: List[Document] = []
+    summaries: List[Document] = []
+    quotes: List[Document] = []
+    failed: Dict[str, str] = {}
+
+    for path in pdf_paths:
+        try:
+            file_chunks = await encoder.load_book_chunks(
+                path, chunk_size, chunk_overlap
+            )
+            file_summaries, file_quotes = await ProcessDocument(
+                path, page_cache=page_cache, scheduler=scheduler
+            ).preprocess_pipeline()
+        except Exception as e:
+            logger.exception(f"Shard {shard_id}: failed to process {path}")
+            failed[path] = repr(e)
+            continue
+        finally:
+            # The shard's later files never need these pages again
+            PdfPageCache.release(path)
+        # Every document carries its PDF so merged results can be traced back
+        for doc in [*file_chunks, *file_summaries, *file_quotes]:
+            doc.metadata = {**doc.metadata, "source": path}
+        chunks.extend(file_chunks)
+        summaries.extend(file_summaries)
+        quotes.extend(file_quotes)
+
+    manifest = VectorStoreManifest.load(os.path.join(shard_dir, SHARD_MANIFEST_FILE))
+    for store_name, documents in (
+        (EncodeEmbeddings.CHUNKS_STORE, chunks),
+        (EncodeEmbeddings.CHAPTER_SUMMARIES_STORE, summaries),
+        (EncodeEmbeddings.BOOK_QUOTES_STORE, quotes),
+    ):
+        await encoder.sync_vector_store(
+            os.path.join(shard_dir, store_name), documents, manifest, embeddings
+        )
+
+    return {
+        "shard": shard_id,
+        "directory": shard_dir,
+        "files": [p for p in pdf_paths if p not in failed],
+        "failed": failed,
+        "counts": {
+            EncodeEmbeddings.CHUNKS_STORE: len(chunks),
+            EncodeEmbeddings.CHAPTER_SUMMARIES_STORE: len(summaries),
+            EncodeEmbeddings.BOOK_QUOTES_STORE: len(quotes),
+        },
+        "seconds": monotonic() - start_time,
+    }
+
+
+def ingest_shard(
+    shard_id: int,
+    pdf_paths: List[str],
+    shard_dir: str,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    num_shards: int = 1,
+) -> Dict[str, Any]:
+    """
+    Description:
+        Process-pool entry point: preprocess and encode a group of PDFs into one set of
+        shard vector stores (chunks, chapter summaries, quotes) under `shard_dir`.
+
+    Params:
+        shard_id (int): Shard number.
+        pdf_paths (list[str]): PDFs assigned to this shard.
+        shard_dir (str): Output folder for the shard stores and manifest.
+        chunk_size (int): The desired size of each text chunk.
+        chunk_overlap (int): The amount of overlap between consecutive chunks.
+        num_shards (int): Shards running concurrently; the CPUs and the LLM
+            tokens-per-minute budget are divided between them.
+
+    Return:
+        dict: Shard report with files, failed files, document counts and seconds.
+
+    Exceptions:
+        RuntimeError: If building a shard store fails.
+    """
+    os.makedirs(shard_dir, exist_ok=True)
+    return asyncio.run(
+        _ingest_shard_async(
+            shard_id, pdf_paths, shard_dir, chunk_size, chunk_overlap, num_shards
+        )
+    )
+
+
+class CorpusIngestion:
+    """
+    Description:
+        Ingest a directory of PDFs. Files are spread over `num_workers` shards balanced
+        by file size; each shard runs ProcessDocument and EncodeEmbeddings in its own
+        process and writes its own vector stores and embedding cache to
+        `output_dir/shard_<n>`. The CPUs used for page extraction and the LLM
+        tokens-per-minute budget are divided between the shards.
+
+    Params:
+        pdf_dir (str): Directory searched (recursively) for *.pdf files.
+        output_dir (str): Directory the shard stores are written to.
+        num_workers (int, optional): Worker processes / shards; defaults to the CPU count.
+        chunk_size (int): The desired size of each text chunk.
+        chunk_overlap (int): The amount of overlap between consecutive chunks.
+    """
+
+    def __init__(
+        self,
+        pdf_dir: str,
+        output_dir: str = "corpus_shards",
+        num_workers: Optional[int] = None,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+    ):
+        if not isinstance(pdf_dir, str) or not isinstance(output_dir, str):
+            raise TypeError("pdf_dir and output_dir must be strings")
+        num_workers = num_workers or os.cpu_count() or 1
+        if not isinstance(num_workers, int) or num_workers < 1:
+            raise ValueError("num_workers must be a positive integer")
+        self.pdf_dir = pdf_dir
+        self.output_dir = output_dir
+        self.num_workers = num_workers
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
+    def discover_pdfs(self) -> List[str]:
+        """
+        Description:
+            List the PDFs under pdf_dir in a stable order.
+
+        Params:
+            None
+
+        Return:
+            list[str]: PDF paths.
+
+        Exceptions:
+            FileNotFoundError: If pdf_dir does not exist.
+        """
+        if not os.path.isdir(self.pdf_dir):
+            raise FileNotFoundError(self.pdf_dir)
+        return sorted(
+            glob.glob(os.path.join(self.pdf_dir, "**", "*.pdf"), recursive=True)
+        )
+
+    @staticmethod
+    def assign_shards(pdf_paths: List[str], num_shards: int) -> List[List[str]]:
+        """
+        Description:
+            Spread files over shards, largest first onto the currently lightest shard, so
+            shards finish at roughly the same time. Assignment is deterministic, which
+            keeps each shard's incremental manifest useful across runs.
+
+        Params:
+            pdf_paths (list[str]): Files to assign.
+            num_shards (int): Number of shards.
+
+        Return:
+            list[list[str]]: Non-empty file groups, one per shard.
+
+        Exceptions:
+            None
+        """
+        heap: List[Tuple[int, int]] = [(0, shard) for shard in range(num_shards)]
+        shards: List[List[str]] = [[] for _ in range(num_shards)]
+        for path in sorted(pdf_paths, key=lambda p: (-os.path.getsize(p), p)):
+            load, shard = heapq.heappop(heap)
+            shards[shard].append(path)
+            heapq.heappush(heap, (load + os.path.getsize(path), shard))
+        return [sorted(group) for group in shards if group]
+
+    async def ingest(self) -> List[Dict[str, Any]]:
+        """
+        Description:
+            Build every shard in a process pool and write `corpus_manifest.json` listing
+            the shard folders and their reports.
+
+        Params:
+            None
+
+        Return:
+            list[dict]: One report per shard.
+
+        Exceptions:
+            FileNotFoundError: If pdf_dir does not exist.
+            RuntimeError: If a shard fails to build.
+        """
+        pdf_paths = self.discover_pdfs()
+        if not pdf_paths:
+            logger.warning(f"No PDFs found in {self.pdf_dir}")
+            return []
+        groups = self.assign_shards(pdf_paths, self.num_workers)
+        logger.info(
+            f"Ingesting {len(pdf_paths)} PDFs into {len(groups)} shards "
+            f"under {self.output_dir}"
+        )
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        start_time = monotonic()
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(max_workers=len(groups)) as pool:
+            results = await asyncio.gather(
+                *[
+                    loop.run_in_executor(
+                        pool,
+                        ingest_shard,
+                        shard_id,
+                        group,
+                        os.path.join(self.output_dir, f"shard_{shard_id}"),
+                        self.chunk_size,
+                        self.chunk_overlap,
+                        len(groups),
+                    )
+                    for shard_id, group in enumerate(groups)
+                ],
+                return_exceptions=True,
+            )
+
+        reports = []
+        for shard_id, result in enumerate(results):
+            if isinstance(result, BaseException):
+                raise RuntimeError(f"Shard {shard_id} failed") from result
+            reports.append(result)
+
+        with open(
+            os.path.join(self.output_dir, CORPUS_MANIFEST_FILE), "w", encoding="utf-8"
+        ) as f:
+            json.dump({"shards": reports}, f, indent=2)
+        failed = sum(len(r["failed"]) for r in reports)
+        logger.info(
+            f"Corpus ingestion finished in {monotonic() - start_time:.2f}s "
+            f"({len(pdf_paths) - failed} PDFs ok, {failed} failed)"
+        )
+        return reports
+
+
+class ShardedRetriever(BaseRetriever):
+    """LangChain retriever over a ShardedSearcher, usable wherever `as_retriever()` is."""
+
+    searcher: Any
+    k: int = 4
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return self.searcher.similarity_search(query, k=self.k)
+
+
+class ShardedSearcher:
+    """
+    Description:
+        Searches one vector store (e.g. the chunk store) across all corpus shards. The
+        query is embedded once, every shard is searched for its own top-k in parallel
+        and the results are merged into a global top-k by distance. All shards share
+        the embedding model, so their distances are directly comparable.
+
+    Params:
+        stores (list[FAISS]): One loaded store per shard.
+        embeddings (Embeddings): Embedding function used for queries.
+    """
+
+    def __init__(self, stores: List[FAISS], embeddings: Any):
+        if not stores:
+            raise ValueError("stores must not be empty")
+        self.stores = stores
+        self.embeddings = embeddings
+
+    @classmethod
+    async def load(
+        cls,
+        output_dir: str,
+        store_name: str = EncodeEmbeddings.CHUNKS_STORE,
+        embeddings: Any = None,
+        lazy: bool = True,
+    ) -> "ShardedSearcher":
+        """
+        Description:
+            Load `store_name` from every shard listed in the corpus manifest.
+
+        Params:
+            output_dir (str): The CorpusIngestion output directory.
+            store_name (str): Which store to search.
+            embeddings (Embeddings, optional): Query embeddings; defaults to the shared model.
+            lazy (bool): Memory-map shard indexes and keep docstores on disk.
+
+        Return:
+            ShardedSearcher: Searcher over the shards that have the store.
+
+        Exceptions:
+            FileNotFoundError: If the corpus manifest is missing.
+            ValueError: If no shard has the store.
+        """
+        with open(
+            os.path.join(output_dir, CORPUS_MANIFEST_FILE), "r", encoding="utf-8"
+        ) as f:
+            shards = json.load(f)["shards"]
+        embeddings = embeddings or await asyncio.to_thread(
+            EncodeEmbeddings.get_embeddings
+        )
+        folders = [
+            os.path.join(shard["directory"], store_name)
+            for shard in shards
+            if os.path.isdir(os.path.join(shard["directory"], store_name))
+        ]
+        stores = await asyncio.gather(
+            *[
+                EncodeEmbeddings.load_vector_store(folder, embeddings, lazy)
+                for folder in folders
+            ]
+        )
+        logger.info(f"Loaded {store_name} from {len(stores)} shards")
+        return cls(list(stores), embeddings)
+
+    def similarity_search_with_score(
+        self, query: str, k: int = 4
+    ) -> List[Tuple[Document, float]]:
+        """
+        Description:
+            Global top-k over all shards.
+
+        Params:
+            query (str): Query text.
+            k (int): Number of results.
+
+        Return:
+            list[tuple[Document, float]]: Documents with L2 distance, closest first.
+
+        Exceptions:
+            None
+        """
+        vector = self.embeddings.embed_query(query)
+        if len(self.stores) == 1:
+            return self.stores[0].similarity_search_with_score_by_vector(vector, k)
+        # faiss releases the GIL while searching, so threads overlap the shard scans
+        with ThreadPoolExecutor(max_workers=len(self.stores)) as pool:
+            per_shard = pool.map(
+                lambda store: store.similarity_search_with_score_by_vector(vector, k),
+                self.stores,
+            )
+            return heapq.nsmallest(
+                k,
+                (hit for hits in per_shard for hit in hits),
+                key=lambda hit: hit[1],
+            )
+
+    def similarity_search(self, query: str, k: int = 4) -> List[Document]:
+        """
+        Description:
+            Global top-k documents over all shards.
+
+        Params:
+            query (str): Query text.
+            k (int): Number of results.
+
+        Return:
+            list[Document]: Documents, closest first.
+
+        Exceptions:
+            None
+        """
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    async def asimilarity_search(self, query: str, k: int = 4) -> List[Document]:
+        return await asyncio.to_thread(self.similarity_search, query, k)
+
+    def as_retriever(
+        self, search_kwargs: Optional[Dict[str, Any]] = None
+    ) -> ShardedRetriever:
+        """
+        Description:
+            Retriever with the same call shape as FAISS.as_retriever, so the existing
+            retrieval code can run against a sharded corpus.
+
+        Params:
+            search_kwargs (dict, optional): Supports "k".
+
+        Return:
+            ShardedRetriever: The retriever.
+
+        Exceptions:
+            None
+        """
+        return ShardedRetriever(searcher=self, k=(search_kwargs or {}).get("k", 4))
+
+
+# Example usage:
+if __name__ == "__main__":
+
+    async def _main():
+        await CorpusIngestion("pdfs", "corpus_shards").ingest()
+        searcher = await ShardedSearcher.load("corpus_shards")
+        for doc in await searcher.asimilarity_search("Who is Harry Potter?", k=5):
+            print(doc.metadata, doc.page_content[:80])
+
+    asyncio.run(_main())
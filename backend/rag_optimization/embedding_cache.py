@@ -0,0 +1,325 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from backend.config.logging_lib import logger
+
+
+class EmbeddingCache:
+    """
+    Description:
+        Persistent, content-addressed vector cache for one embedding model.
+        Vectors live in an append-only float32 file that is read through a numpy
+        memory map; a small JSON index maps the hash of the normalized text to
+        the row number. New rows are appended to a journal ("<key> <row>" lines)
+        instead of rewriting the index on every batch; the journal is folded into
+        the index once it holds as many rows as the index, so persisting n vectors
+        costs O(n) writes in total. Keys are scoped by model id (one sub-directory
+        per model), so a cache entry is effectively keyed by (model id, text hash).
+
+        The cache is single-process: writes are serialised by a thread lock only,
+        so concurrent processes must use separate cache directories.
+
+    Params:
+        cache_dir (str): Root directory of the cache.
+        model_id (str): Identifier of the embedding model that produced the vectors.
+    """
+
+    VECTORS_FILE = "vectors.f32"
+    INDEX_FILE = "index.json"
+    JOURNAL_FILE = "index.log"
+
+    _instances: Dict[Tuple[str, str], "EmbeddingCache"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, cache_dir: str, model_id: str):
+        if not isinstance(cache_dir, str) or not isinstance(model_id, str):
+            raise TypeError("cache_dir and model_id must be strings")
+        self.model_id = model_id
+        self.directory = os.path.join(
+            cache_dir, hashlib.sha256(model_id.encode("utf-8")).hexdigest()[:16]
+        )
+        os.makedirs(self.directory, exist_ok=True)
+        self.vectors_path = os.path.join(self.directory, self.VECTORS_FILE)
+        self.index_path = os.path.join(self.directory, self.INDEX_FILE)
+        self.journal_path = os.path.join(self.directory, self.JOURNAL_FILE)
+
+        self._lock = threading.Lock()
+        self._rows: Dict[str, int] = {}
+        # Rows recorded in the journal but not yet in the index file
+        self._journal_rows = 0
+        self.dim: Optional[int] = None
+        self._view: Optional[np.memmap] = None
+        self._view_rows = 0
+        self._load_index()
+
+    @classmethod
+    def open(cls, cache_dir: str, model_id: str) -> "EmbeddingCache":
+        """
+        Description:
+            Return the process-wide cache instance for (cache_dir, model_id).
+
+        Params:
+            cache_dir (str): Root directory of the cache.
+            model_id (str): Identifier of the embedding model.
+
+        Return:
+            EmbeddingCache: The shared cache instance.
+
+        Exceptions:
+            TypeError: If cache_dir or model_id is not a string.
+        """
+        key = (os.path.abspath(cache_dir), model_id)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(cache_dir, model_id)
+            return cls._instances[key]
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """
+        Description:
+            Normalize text before hashing: NFC unicode form, collapsed whitespace, stripped ends.
+
+        Params:
+            text (str): Raw text.
+
+        Return:
+            str: Normalized text.
+
+        Exceptions:
+            None
+        """
+        return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+    @classmethod
+    def text_key(cls, text: str) -> str:
+        """
+        Description:
+            Content hash used as the cache key for a text.
+
+        Params:
+            text (str): Raw text.
+
+        Return:
+            str: Hex sha256 digest of the normalized text.
+
+        Exceptions:
+            None
+        """
+        return hashlib.sha256(cls.normalize_text(text).encode("utf-8")).hexdigest()
+
+    def _load_index(self) -> None:
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            logger.warning(
+                f"Embedding cache index unreadable, starting empty: {self.index_path}"
+            )
+            return
+
+        self.dim = data.get("dim")
+        rows = data.get("rows", {})
+        if not self.dim or not os.path.exists(self.vectors_path):
+            return
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    parts = line.split()
+                    # A torn last line from an interrupted append is skipped
+                    if len(parts) == 2 and parts[1].isdigit():
+                        rows[parts[0]] = int(parts[1])
+                        self._journal_rows += 1
+
+        # Drop rows that point past the end of the vector file (interrupted write)
+        stored_rows = os.path.getsize(self.vectors_path) // (4 * self.dim)
+        self._rows = {key: row for key, row in rows.items() if row < stored_rows}
+        logger.info(
+            f"Loaded embedding cache for {self.model_id} with {len(self._rows)} vectors"
+        )
+
+    def _save_index(self) -> None:
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"model_id": self.model_id, "dim": self.dim, "rows": self._rows}, f
+            )
+        os.replace(tmp_path, self.index_path)
+        # Every journal row is in the index now; replaying it would be harmless
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self._journal_rows = 0
+
+    def _append_journal(self, keys: List[str]) -> None:
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write("".join(f"{key} {self._rows[key]}\n" for key in keys))
+        self._journal_rows += len(keys)
+
+    def _vectors(self) -> Optional[np.memmap]:
+        """Memory map over the vector file, re-opened when new rows were appended."""
+        if not self.dim or not os.path.exists(self.vectors_path):
+            return None
+        stored_rows = os.path.getsize(self.vectors_path) // (4 * self.dim)
+        if self._view is None or self._view_rows != stored_rows:
+            self._view = np.memmap(
+                self.vectors_path,
+                dtype=np.float32,
+                mode="r",
+                shape=(stored_rows, self.dim),
+            )
+            self._view_rows = stored_rows
+        return self._view
+
+    def get_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Description:
+            Look up cached vectors for a list of texts.
+
+        Params:
+            texts (list[str]): Texts to look up.
+
+        Return:
+            list: One vector (list[float]) per text, or None for a cache miss.
+
+        Exceptions:
+            None
+        """
+        keys = [self.text_key(t) for t in texts]
+        with self._lock:
+            view = self._vectors()
+            if view is None:
+                return [None] * len(texts)
+            return [
+                view[self._rows[k]].tolist() if k in self._rows else None for k in keys
+            ]
+
+    def put_many(self, texts: List[str], vectors: List[List[float]]) -> None:
+        """
+        Description:
+            Append vectors for texts that are not cached yet and record their rows
+            in the journal, compacting it into the index when it has grown as large.
+
+        Params:
+            texts (list[str]): Texts that were embedded.
+            vectors (list[list[float]]): Their embeddings, in the same order.
+
+        Return:
+            None
+
+        Exceptions:
+            ValueError: If lengths differ or the vector dimension does not match the cache.
+        """
+        if len(texts) != len(vectors):
+            raise ValueError("texts and vectors must have the same length")
+        if not texts:
+            return
+
+        array = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            if self.dim is None:
+                self.dim = int(array.shape[1])
+            if array.shape[1] != self.dim:
+                raise ValueError(
+                    f"Vector dimension {array.shape[1]} does not match cache dimension {self.dim}"
+                )
+
+            new_keys, new_rows, seen = [], [], set()
+            for key, row in zip((self.text_key(t) for t in texts), array):
+                if key in self._rows or key in seen:
+                    continue
+                seen.add(key)
+                new_keys.append(key)
+                new_rows.append(row)
+            if not new_keys:
+                return
+
+            start_row = (
+                os.path.getsize(self.vectors_path) // (4 * self.dim)
+                if os.path.exists(self.vectors_path)
+                else 0
+            )
+            # Vectors first, index second: an interrupted write leaves unreferenced rows only
+            with open(self.vectors_path, "ab") as f:
+                f.write(np.ascontiguousarray(new_rows, dtype=np.float32).tobytes())
+            for offset, key in enumerate(new_keys):
+                self._rows[key] = start_row + offset
+            journal_rows = self._journal_rows + len(new_keys)
+            if journal_rows >= len(self._rows) - journal_rows:
+                self._save_index()
+            else:
+                self._append_journal(new_keys)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Description:
+        LangChain Embeddings wrapper that serves document embeddings from an
+        EmbeddingCache and only sends cache misses to the wrapped model.
+        Query embeddings are passed straight through.
+
+    Params:
+        underlying (Embeddings): The embedding model used for cache misses.
+        cache (EmbeddingCache): Vector cache for that model.
+    """
+
+    def __init__(self, underlying: Embeddings, cache: EmbeddingCache):
+        if not isinstance(cache, EmbeddingCache):
+            raise TypeError("cache must be an EmbeddingCache")
+        self.underlying = underlying
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Description:
+            Embed documents, reusing cached vectors and embedding only the misses.
+
+        Params:
+            texts (list[str]): Texts to embed.
+
+        Return:
+            list[list[float]]: One embedding per input text, in input order.
+
+        Exceptions:
+            None
+        """
+        vectors = self.cache.get_many(texts)
+        miss_positions = [i for i, v in enumerate(vectors) if v is None]
+        self.hits += len(texts) - len(miss_positions)
+        self.misses += len(miss_positions)
+
+        if miss_positions:
+            # Embed each distinct missing text once
+            unique_texts: Dict[str, str] = {}
+            for i in miss_positions:
+                unique_texts.setdefault(self.cache.text_key(texts[i]), texts[i])
+            miss_texts = list(unique_texts.values())
+            miss_vectors = self.underlying.embed_documents(miss_texts)
+            self.cache.put_many(miss_texts, miss_vectors)
+
+            by_key = {
+                self.cache.text_key(t): v for t, v in zip(miss_texts, miss_vectors)
+            }
+            for i in miss_positions:
+                vectors[i] = list(by_key[self.cache.text_key(texts[i])])
+
+        logger.info(
+            f"Embedding cache: {len(texts) - len(miss_positions)} hits, "
+            f"{len(miss_positions)} misses"
+        )
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.underlying.embed_query(text)
@@ -0,0 +1,189 @@
+import asyncio
+import queue
+import threading
+from time import monotonic
+from typing import Any, List, Optional
+from langchain_core.embeddings import Embeddings
+from backend.config.logging_lib import logger
+
+
+class _EmbeddingJob:
+    """One submitted list of texts; completed from worker threads, awaited on the event loop."""
+
+    def __init__(self, size: int, loop: asyncio.AbstractEventLoop):
+        self.results: List[Optional[List[float]]] = [None] * size
+        self.remaining = size
+        self.loop = loop
+        self.future: asyncio.Future = loop.create_future()
+        self._lock = threading.Lock()
+
+    def _resolve(self, setter, value) -> None:
+        if not self.future.done():
+            setter(value)
+
+    def set_result(self, position: int, vector: List[float]) -> None:
+        with self._lock:
+            self.results[position] = vector
+            self.remaining -= 1
+            done = self.remaining == 0
+        if done:
+            self.loop.call_soon_threadsafe(
+                self._resolve, self.future.set_result, self.results
+            )
+
+    def set_exception(self, exc: BaseException) -> None:
+        self.loop.call_soon_threadsafe(self._resolve, self.future.set_exception, exc)
+
+
+class EmbeddingWorkQueue:
+    """
+    Description:
+        Shared embedding work queue for building several vector stores at once.
+        Callers submit lists of texts; a fixed pool of worker threads drains the
+        queue in batches of up to `batch_size` texts, mixing texts from different
+        stores into the same batch, so small stores ride along with large ones
+        instead of waiting for their turn.
+
+    Params:
+        embeddings (Embeddings): Embedding model used by the workers.
+        num_workers (int): Number of embedding worker threads.
+        batch_size (int): Maximum number of texts per embedding call.
+    """
+
+    def __init__(
+        self, embeddings: Embeddings, num_workers: int = 2, batch_size: int = 64
+    ):
+        if not isinstance(num_workers, int) or num_workers < 1:
+            raise ValueError("num_workers must be a positive integer")
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        self.embeddings = embeddings
+        self.num_workers = num_workers
+        self.batch_size = batch_size
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._workers: List[threading.Thread] = []
+        self.batches = 0
+        self.texts = 0
+        self.busy_seconds = 0.0
+        self._stats_lock = threading.Lock()
+
+    def start(self) -> None:
+        """
+        Description:
+            Start the worker threads (idempotent).
+
+        Params:
+            None
+
+        Return:
+            None
+
+        Exceptions:
+            None
+        """
+        if self._workers:
+            return
+        for i in range(self.num_workers):
+            worker = threading.Thread(
+                target=self._worker, name=f"embedding-worker-{i}", daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+        logger.info(
+            f"Started embedding work queue with {self.num_workers} workers, "
+            f"batch size {self.batch_size}"
+        )
+
+    async def close(self) -> None:
+        """
+        Description:
+            Stop the workers after the queued work has been drained.
+
+        Params:
+            None
+
+        Return:
+            None
+
+        Exceptions:
+            None
+        """
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            await asyncio.to_thread(worker.join)
+        self._workers = []
+        logger.info(
+            f"Embedding work queue closed: {self.texts} texts in {self.batches} batches, "
+            f"{self.busy_seconds:.2f}s worker time"
+        )
+
+    async def __aenter__(self) -> "EmbeddingWorkQueue":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Description:
+            Queue texts for embedding and wait until every one of them is embedded.
+
+        Params:
+            texts (list[str]): Texts to embed.
+
+        Return:
+            list[list[float]]: One embedding per text, in input order.
+
+        Exceptions:
+            RuntimeError: If the queue has not been started.
+            Exception: Whatever the embedding model raised for one of the batches.
+        """
+        if not texts:
+            return []
+        if not self._workers:
+            raise RuntimeError("EmbeddingWorkQueue must be started before use")
+        job = _EmbeddingJob(len(texts), asyncio.get_running_loop())
+        for position, text in enumerate(texts):
+            self._queue.put((job, position, text))
+        return await job.future
+
+    def _next_batch(self) -> Optional[List[Any]]:
+        item = self._queue.get()
+        if item is None:
+            return None
+        batch = [item]
+        while len(batch) < self.batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Leave the stop signal for this worker's next iteration
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _worker(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            start_time = monotonic()
+            try:
+                vectors = self.embeddings.embed_documents(
+                    [text for _, _, text in batch]
+                )
+            except Exception as e:
+                logger.exception("Embedding batch failed")
+                for job in {id(job): job for job, _, _ in batch}.values():
+                    job.set_exception(e)
+                continue
+            with self._stats_lock:
+                self.batches += 1
+                self.texts += len(batch)
+                self.busy_seconds += monotonic() - start_time
+            for (job, position, _), vector in zip(batch, vectors):
+                job.set_result(position, vector)
@@ -1,11 +1,20 @@
 import os
+import shutil
 import asyncio
-from typing import List, Tuple, Union, Any, Optional
-from langchain_community.document_loaders import PyPDFLoader
+from typing import AsyncIterable, Callable, Dict, List, Tuple, Union, Any, Optional
+import numpy as np
 from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_text_splitters import RecursiveCharacterTextSplitter
+from backend.config.embedding_models import EmbeddingModels
+from backend.rag_optimization.chapter_index import ChapterIndex
+from backend.rag_optimization.embedding_cache import CachedEmbeddings, EmbeddingCache
+from backend.rag_optimization.embedding_queue import EmbeddingWorkQueue
+from backend.rag_optimization.faiss_index_factory import FaissIndexFactory
+from backend.rag_optimization.lazy_vector_store import LazyVectorStore
+from backend.rag_optimization.pdf_page_cache import PdfPageCache
+from backend.rag_optimization.streaming_ingest import StreamingBookEncoder
+from backend.rag_optimization.vector_store_manifest import VectorStoreManifest
 from backend.config.logging_lib import logger
 
 
@@ -14,13 +23,73 @@ class EncodeEmbeddings:
     Encoder helper class to create embedding vector stores for book chunks, chapter summaries, and quotes.
     """
 
-    async def encode_book(
+    CHUNKS_STORE = "chunks_vector_store"
+    CHAPTER_SUMMARIES_STORE = "chapter_summaries_vector_store"
+    BOOK_QUOTES_STORE = "book_quotes_vectorstore"
+
+    def __init__(
+        self,
+        chunk_index: Optional[FaissIndexFactory] = None,
+        lazy_load: bool = True,
+        page_cache: Optional[PdfPageCache] = None,
+    ):
+        """
+        Description:
+            Initialize the encoder with the FAISS index layout used for the chunk store.
+
+        Params:
+            chunk_index (FaissIndexFactory, optional): Index factory for the chunk store
+                (flat, IVF-Flat, IVF-PQ, SQ8 or fp16). Defaults to an exact flat index.
+            lazy_load (bool): Load unchanged stores with a memory-mapped index and an
+                on-disk SQLite docstore instead of unpickling them into RAM.
+            page_cache (PdfPageCache, optional): Parsed-page cache shared with
+                ProcessDocument, so the PDF is only parsed once per run.
+
+        Return:
+            None
+
+        Exceptions:
+            TypeError: If chunk_index is not a FaissIndexFactory.
+        """
+        if chunk_index is not None and not isinstance(chunk_index, FaissIndexFactory):
+            raise TypeError("chunk_index must be a FaissIndexFactory")
+        self.chunk_index = chunk_index or FaissIndexFactory("flat")
+        self.lazy_load = lazy_load
+        self.page_cache = page_cache or PdfPageCache()
+
+    @staticmethod
+    def get_embeddings(cache_dir: Optional[str] = None) -> CachedEmbeddings:
+        """
+        Description:
+            Returns the shared length-bucketed embedding engine wrapped with the persistent
+            embedding cache, so only texts that were never embedded before reach the model.
+            The cache is single-process; concurrent processes need their own cache_dir.
+
+        Params:
+            cache_dir (str, optional): Embedding cache folder; defaults to
+                EMBEDDING_CACHE_DIR.
+
+        Return:
+            CachedEmbeddings: Cache-backed embeddings for the configured model.
+
+        Exceptions:
+            RuntimeError: If the embedding model cannot be loaded.
+        """
+        models = EmbeddingModels()
+        cache = EmbeddingCache.open(
+            cache_dir or models.get_embedding_cache_dir,
+            models.get_embedding_model_id(),
+        )
+        return CachedEmbeddings(models.get_embedding_engine(), cache)
+
+    async def load_book_chunks(
         self, path: str, chunk_size: int = 1000, chunk_overlap: int = 200
-    ) -> FAISS:
+    ) -> List[Document]:
         """
         Description:
-            Encodes a PDF book into a FAISS vector store using HuggingFace embeddings.
-            Loads the PDF, splits into chunks and creates a FAISS vector store.
+            Loads a PDF book, splits it into chunks and cleans the chunk text.
+            Every chunk records its `offset` in the book text and its `chapter`
+            (from the ChapterIndex; None before the first chapter).
 
         Params:
             path (str): The path to the PDF file.
@@ -28,15 +97,12 @@ class EncodeEmbeddings:
             chunk_overlap (int): The amount of overlap between consecutive chunks.
 
         Return:
-            FAISS: A FAISS vector store containing the encoded book content.
+            list[Document]: The cleaned text chunks.
 
         Exceptions:
             TypeError: If path is not a string or chunk_size/chunk_overlap are not ints.
             FileNotFoundError: If the PDF at `path` does not exist.
-            RuntimeError: If embedding or FAISS creation fails.
         """
-        logger.info(f"Starting encode_book for path: {path}")
-
         if not isinstance(path, str):
             raise TypeError("path must be a string")
         if not isinstance(chunk_size, int) or not isinstance(chunk_overlap, int):
@@ -45,39 +111,117 @@ class EncodeEmbeddings:
             logger.error(f"PDF path does not exist: {path}")
             raise FileNotFoundError(path)
 
-        try:
-            # 1. Load the PDF document using PyPDFLoader (blocking -> to_thread)
-            logger.info(f"Loading PDF using PyPDFLoader: {path}")
-            loader = PyPDFLoader(path)
-            documents: List[Document] = await asyncio.to_thread(loader.load)
+        # 1. Load the PDF pages from the shared page cache (blocking -> to_thread)
+        logger.info(f"Loading PDF pages: {path}")
+        pages = await asyncio.to_thread(self.page_cache.get_pages, path)
+        documents: List[Document] = PdfPageCache.copy_pages(pages)
 
-            # 2. Split the document into chunks for embedding (blocking -> to_thread)
-            logger.info(
-                f"Splitting documents into chunks: ({chunk_size}, {chunk_overlap})"
+        # 2. Split the document into chunks for embedding (blocking -> to_thread)
+        logger.info(f"Splitting documents into chunks: ({chunk_size}, {chunk_overlap})")
+
+        def split_docs(docs: List[Document]) -> List[Document]:
+            splitter = RecursiveCharacterTextSplitter(
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+                length_function=len,
+                add_start_index=True,
             )
+            return splitter.split_documents(docs)
 
-            def split_docs(docs: List[Document]) -> List[Document]:
-                splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=chunk_size,
-                    chunk_overlap=chunk_overlap,
-                    length_function=len,
-                )
-                return splitter.split_documents(docs)
+        texts: List[Document] = await asyncio.to_thread(split_docs, documents)
+
+        # Chunk offset = page offset + start within the page; map it to its chapter
+        chapter_index = await asyncio.to_thread(
+            ChapterIndex.load_or_build, self.page_cache, path
+        )
+        for chunk in texts:
+            offset = chunk.metadata["offset"] + chunk.metadata.pop("start_index")
+            entry = chapter_index.chapter_at(offset)
+            chunk.metadata["offset"] = offset
+            chunk.metadata["chapter"] = entry["chapter"] if entry else None
+
+        # 3. Clean up the text chunks (replace unwanted characters)
+        logger.info("Cleaning split chunks (replace tabs)")
+        return await self.replace_t_with_space(texts)
+
+    async def encode_book(
+        self,
+        path: str,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        streaming: bool = False,
+        batch_size: int = 64,
+        max_pending_batches: int = 2,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> FAISS:
+        """
+        Description:
+            Encodes a PDF book into a FAISS vector store using HuggingFace embeddings.
+            Loads the PDF, splits into chunks and creates a FAISS vector store.
+            With `streaming`, pages are read lazily and appended to the index batch by
+            batch (see StreamingBookEncoder), keeping memory bounded for large PDFs.
 
-            texts: List[Document] = await asyncio.to_thread(split_docs, documents)
+        Params:
+            path (str): The path to the PDF file.
+            chunk_size (int): The desired size of each text chunk.
+            chunk_overlap (int): The amount of overlap between consecutive chunks.
+            streaming (bool): Use the bounded-memory streaming pipeline.
+            batch_size (int): Chunks embedded per batch when streaming.
+            max_pending_batches (int): Parsed batches allowed to wait for embedding.
+            progress_callback (callable, optional): Called with progress after every
+                indexed batch when streaming.
 
-            # 3. Clean up the text chunks (replace unwanted characters)
-            logger.info("Cleaning split chunks (replace tabs)")
-            cleaned_texts = await self.replace_t_with_space(texts)
+        Return:
+            FAISS: A FAISS vector store containing the encoded book content.
+
+        Exceptions:
+            TypeError: If path is not a string or chunk_size/chunk_overlap are not ints.
+            FileNotFoundError: If the PDF at `path` does not exist.
+            RuntimeError: If embedding or FAISS creation fails.
+        """
+        logger.info(f"Starting encode_book for path: {path}")
 
+        if streaming:
+            if not isinstance(path, str):
+                raise TypeError("path must be a string")
+            if not os.path.exists(path):
+                logger.error(f"PDF path does not exist: {path}")
+                raise FileNotFoundError(path)
+            try:
+                # The index is small and persisted; the pages parsed to build it are
+                # released so streaming keeps memory bounded
+                chapter_index = await asyncio.to_thread(
+                    ChapterIndex.load_or_build, self.page_cache, path
+                )
+                PdfPageCache.release(path)
+                embeddings = await asyncio.to_thread(EncodeEmbeddings.get_embeddings)
+                encoder = StreamingBookEncoder(
+                    embeddings,
+                    batch_size,
+                    max_pending_batches,
+                    progress_callback,
+                    pdf_extractor=self.page_cache.extractor.pdf_extractor,
+                )
+                vectorstore = await encoder.encode(
+                    path, chunk_size, chunk_overlap, chapter_index
+                )
+            except Exception as e:
+                logger.exception("Error in streaming encode_book")
+                raise RuntimeError(
+                    "Failed to encode book into FAISS vector store"
+                ) from e
+            if vectorstore is None:
+                raise RuntimeError(f"No text could be extracted from {path}")
+            return vectorstore
+
+        cleaned_texts = await self.load_book_chunks(path, chunk_size, chunk_overlap)
+
+        try:
             # 4. Create HuggingFace embeddings and encode the cleaned text chunks into a FAISS vector store
             logger.info(
-                "Initializing HuggingFaceEmbeddings and building FAISS vector store"
-            )
-            embeddings = HuggingFaceEmbeddings(
-                model_name="C:/Users/703395858/PycharmProjects/agentic_ai/backend/models/all-MiniLM-L6-v2",
-                model_kwargs={"device": "cpu"},
+                "Fetching shared embedding model and building FAISS vector store"
             )
+            embeddings = await asyncio.to_thread(EncodeEmbeddings.get_embeddings)
 
             # FAISS.from_documents is blocking/heavy -> run in thread
             def build_faiss(docs: List[Document], emb):
@@ -87,7 +231,9 @@ class EncodeEmbeddings:
                 build_faiss, cleaned_texts, embeddings
             )
 
-            logger.info(f"Finished encode_book, vector store size: approx {len(texts)}")
+            logger.info(
+                f"Finished encode_book, vector store size: approx {len(cleaned_texts)}"
+            )
             return vectorstore
 
         except Exception as e:
@@ -158,10 +304,7 @@ class EncodeEmbeddings:
             )
 
         try:
-            embeddings = HuggingFaceEmbeddings(
-                model_name="C:/Users/703395858/PycharmProjects/agentic_ai/backend/models/all-MiniLM-L6-v2",
-                model_kwargs={"device": "cpu"},
-            )
+            embeddings = await asyncio.to_thread(EncodeEmbeddings.get_embeddings)
 
             def build_faiss(docs: List[Document], emb):
                 return FAISS.from_documents(docs, emb)
@@ -177,22 +320,33 @@ class EncodeEmbeddings:
             raise RuntimeError("Failed to encode chapter summaries") from e
 
     @staticmethod
-    async def encode_quotes(book_quotes_list: List[Document]) -> Union[FAISS, List]:
+    async def encode_quotes(
+        book_quotes_list: Union[List[Document], AsyncIterable[Document]],
+        batch_size: int = 64,
+    ) -> Union[FAISS, List]:
         """
         Description:
             Encodes a list of book quotes into a FAISS vector store using HuggingFace embeddings.
+            An async stream of quotes (e.g. ProcessDocument.stream_book_quotes) is consumed
+            lazily: quotes are embedded and appended in batches of batch_size as they arrive.
 
         Params:
-            book_quotes_list (list[Document]): A list of Document objects, each representing a quote from the book.
+            book_quotes_list (list[Document] or AsyncIterable[Document]): The quotes from the book.
+            batch_size (int): Quotes per embedding call when consuming a stream.
 
         Return:
             FAISS or list: A FAISS vector store containing the encoded book quotes if any quotes exist,
                           otherwise an empty list.
 
         Exceptions:
-            TypeError: If book_quotes_list is not a list of Document objects.
+            TypeError: If book_quotes_list is not a list or async iterable of Document objects.
             RuntimeError: If encoding fails.
         """
+        if isinstance(book_quotes_list, AsyncIterable):
+            return await EncodeEmbeddings._encode_quote_stream(
+                book_quotes_list, batch_size
+            )
+
         logger.info(
             f"Starting encode_quotes, count= {len(book_quotes_list)}"
             if isinstance(book_quotes_list, list)
@@ -209,10 +363,7 @@ class EncodeEmbeddings:
             return []
 
         try:
-            embeddings = HuggingFaceEmbeddings(
-                model_name="C:/Users/703395858/PycharmProjects/agentic_ai/backend/models/all-MiniLM-L6-v2",
-                model_kwargs={"device": "cpu"},
-            )
+            embeddings = await asyncio.to_thread(EncodeEmbeddings.get_embeddings)
 
             def build_faiss(docs: List[Document], emb):
                 return FAISS.from_documents(docs, emb)
@@ -227,27 +378,327 @@ class EncodeEmbeddings:
             logger.exception("Error encoding quotes")
             raise RuntimeError("Failed to encode quotes") from e
 
+    @staticmethod
+    async def _encode_quote_stream(
+        quotes: AsyncIterable[Document], batch_size: int
+    ) -> Union[FAISS, List]:
+        logger.info("Starting encode_quotes from a quote stream")
+        store: Optional[FAISS] = None
+        count = 0
+        try:
+            embeddings = await asyncio.to_thread(EncodeEmbeddings.get_embeddings)
+
+            async def add_batch(batch: List[Document]) -> None:
+                nonlocal store
+                texts = [doc.page_content for doc in batch]
+                vectors = await asyncio.to_thread(embeddings.embed_documents, texts)
+                pairs = list(zip(texts, vectors))
+                metadatas = [doc.metadata for doc in batch]
+                if store is None:
+                    store = await asyncio.to_thread(
+                        FAISS.from_embeddings, pairs, embeddings, metadatas
+                    )
+                else:
+                    await asyncio.to_thread(store.add_embeddings, pairs, metadatas)
+
+            batch: List[Document] = []
+            async for quote in quotes:
+                if not isinstance(quote, Document):
+                    raise TypeError("quote stream must yield Document objects")
+                batch.append(quote)
+                count += 1
+                if len(batch) >= batch_size:
+                    await add_batch(batch)
+                    batch = []
+            if batch:
+                await add_batch(batch)
+
+        except TypeError:
+            raise
+        except Exception as e:
+            logger.exception("Error encoding quotes")
+            raise RuntimeError("Failed to encode quotes") from e
+
+        if store is None:
+            logger.info("No quotes to encode; returning empty list")
+            return []
+        logger.info(f"Finished encode_quotes, count= {count}")
+        return store
+
+    @staticmethod
+    async def load_vector_store(
+        folder: str, embeddings: Any, lazy: bool = False
+    ) -> FAISS:
+        """
+        Description:
+            Loads a persisted FAISS vector store from disk. With `lazy`, and when the
+            folder has a SQLite docstore, the index is memory-mapped and documents are
+            read from disk on demand; such stores are meant for searching only.
+
+        Params:
+            folder (str): The folder the store was saved to.
+            embeddings (Embeddings): Embedding function used for queries.
+            lazy (bool): Prefer the memory-mapped, on-disk docstore layout.
+
+        Return:
+            FAISS: The loaded vector store.
+
+        Exceptions:
+            RuntimeError: If the store cannot be loaded.
+        """
+        if lazy and LazyVectorStore.has_lazy_layout(folder):
+            return await asyncio.to_thread(LazyVectorStore.load, folder, embeddings)
+
+        def load_faiss(folder_: str, emb):
+            return FAISS.load_local(folder_, emb, allow_dangerous_deserialization=True)
+
+        return await asyncio.to_thread(load_faiss, folder, embeddings)
+
+    @staticmethod
+    async def add_documents_to_store(
+        store: Optional[FAISS],
+        documents: List[Document],
+        ids: List[str],
+        embeddings: Any,
+        work_queue: Optional[EmbeddingWorkQueue] = None,
+        index_factory: Optional[FaissIndexFactory] = None,
+    ) -> FAISS:
+        """
+        Description:
+            Embeds documents and adds them to a FAISS store, creating the store if needed.
+            With a work queue the embedding happens on the shared queue workers; otherwise
+            FAISS embeds the documents itself in a worker thread. New stores use the
+            index layout of `index_factory` (flat when omitted).
+
+        Params:
+            store (FAISS or None): The store to extend, or None to create one.
+            documents (list[Document]): Documents to add.
+            ids (list[str]): Document ids, one per document.
+            embeddings (Embeddings): Embedding function of the store.
+            work_queue (EmbeddingWorkQueue, optional): Shared embedding queue.
+            index_factory (FaissIndexFactory, optional): Index layout for a new store.
+
+        Return:
+            FAISS: The store containing the documents.
+
+        Exceptions:
+            Exception: Propagates embedding or FAISS errors.
+        """
+        texts = [doc.page_content for doc in documents]
+        metadatas = [doc.metadata for doc in documents]
+
+        if (
+            store is None
+            and index_factory is not None
+            and index_factory.index_type != "flat"
+        ):
+            # Trained index types need all vectors up front
+            if work_queue is None:
+                vectors = await asyncio.to_thread(embeddings.embed_documents, texts)
+            else:
+                vectors = await work_queue.embed(texts)
+            return await asyncio.to_thread(
+                index_factory.build_vector_store,
+                texts,
+                vectors,
+                embeddings,
+                metadatas,
+                ids,
+            )
+
+        if work_queue is None:
+            if store is None:
+
+                def build_faiss(docs: List[Document], emb, ids_: List[str]):
+                    return FAISS.from_documents(docs, emb, ids=ids_)
+
+                return await asyncio.to_thread(build_faiss, documents, embeddings, ids)
+            await asyncio.to_thread(store.add_documents, documents, ids=ids)
+            return store
+
+        vectors = await work_queue.embed(texts)
+        text_embeddings = list(zip(texts, vectors))
+        if store is None:
+
+            def build_faiss_from_embeddings(pairs, emb, metas, ids_):
+                return FAISS.from_embeddings(pairs, emb, metadatas=metas, ids=ids_)
+
+            return await asyncio.to_thread(
+                build_faiss_from_embeddings, text_embeddings, embeddings, metadatas, ids
+            )
+        await asyncio.to_thread(
+            store.add_embeddings, text_embeddings, metadatas=metadatas, ids=ids
+        )
+        return store
+
+    async def sync_vector_store(
+        self,
+        folder: str,
+        documents: List[Document],
+        manifest: VectorStoreManifest,
+        embeddings: Any,
+        source: Optional[Dict[str, Any]] = None,
+        rebuild: bool = False,
+        work_queue: Optional[EmbeddingWorkQueue] = None,
+        index_factory: Optional[FaissIndexFactory] = None,
+    ) -> Union[FAISS, List]:
+        """
+        Description:
+            Brings the FAISS store in `folder` in line with `documents`. When the manifest
+            knows the store, only the added/removed documents are applied as a delta;
+            otherwise (or if patching fails) the store is rebuilt. The result is saved
+            and recorded in the manifest.
+
+        Params:
+            folder (str): The folder the store is persisted in.
+            documents (list[Document]): The documents the store should contain.
+            manifest (VectorStoreManifest): Manifest of the persisted stores.
+            embeddings (Embeddings): Embedding function for new documents.
+            source (dict, optional): Fingerprint of the store inputs to record.
+            rebuild (bool): Force a full rebuild instead of a delta.
+            work_queue (EmbeddingWorkQueue, optional): Shared queue to embed new documents on.
+            index_factory (FaissIndexFactory, optional): Index layout used when rebuilding.
+
+        Return:
+            FAISS or list: The up-to-date vector store, or an empty list if there are no documents.
+
+        Exceptions:
+            RuntimeError: If building the store fails.
+        """
+        ids = VectorStoreManifest.document_ids(documents)
+
+        if not documents:
+            logger.info(f"No documents for {folder}; dropping persisted store")
+            if os.path.isdir(folder):
+                await asyncio.to_thread(shutil.rmtree, folder)
+            manifest.record_store(folder, [], source)
+            manifest.save()
+            return []
+
+        store: Optional[FAISS] = None
+        if (
+            not rebuild
+            and manifest.store_ids(folder) is not None
+            and os.path.exists(folder)
+        ):
+            to_add, to_delete = manifest.diff(folder, ids)
+            try:
+                if not to_add and not to_delete:
+                    store = await self.load_vector_store(
+                        folder, embeddings, self.lazy_load
+                    )
+                    logger.info(f"{folder} is up to date")
+                    manifest.record_store(folder, ids, source)
+                    manifest.save()
+                    return store
+
+                # Patching needs the in-memory docstore; lazy stores are read-only
+                store = await self.load_vector_store(folder, embeddings)
+                logger.info(
+                    f"Patching {folder}: +{len(to_add)} / -{len(to_delete)} documents"
+                )
+                if to_delete:
+                    await asyncio.to_thread(store.delete, to_delete)
+                if to_add:
+                    documents_by_id = dict(zip(ids, documents))
+                    await self.add_documents_to_store(
+                        store,
+                        [documents_by_id[i] for i in to_add],
+                        to_add,
+                        embeddings,
+                        work_queue,
+                    )
+            except Exception:
+                logger.warning(f"Could not patch {folder}; rebuilding it")
+                store = None
+
+        if store is None:
+            logger.info(f"Building {folder} from {len(documents)} documents")
+            store = await self.add_documents_to_store(
+                None, documents, ids, embeddings, work_queue, index_factory
+            )
+
+        await asyncio.to_thread(store.save_local, folder)
+        await asyncio.to_thread(LazyVectorStore.save_docstore, store, folder)
+        manifest.record_store(folder, ids, source)
+        manifest.save()
+        return store
+
+    @staticmethod
+    def benchmark_chunk_index_types(
+        chunks_vector_store: FAISS,
+        k: int = 10,
+        num_queries: int = 200,
+        configurations: Optional[List[Dict[str, Any]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Description:
+            Reports recall@k, latency and bytes per vector of the candidate index layouts
+            on the vectors of an existing flat chunk store, using a sample of the stored
+            vectors as queries.
+
+        Params:
+            chunks_vector_store (FAISS): A chunk store built with the flat index.
+            k (int): Neighbours per query.
+            num_queries (int): Number of sampled query vectors.
+            configurations (list[dict], optional): FaissIndexFactory kwargs to compare.
+
+        Return:
+            list[dict]: One report row per configuration.
+
+        Exceptions:
+            TypeError: If chunks_vector_store is not a FAISS store.
+        """
+        if not isinstance(chunks_vector_store, FAISS):
+            raise TypeError("chunks_vector_store must be a FAISS instance")
+        index = chunks_vector_store.index
+        vectors = index.reconstruct_n(0, index.ntotal)
+        rng = np.random.default_rng(0)
+        queries = vectors[
+            rng.choice(len(vectors), min(num_queries, len(vectors)), replace=False)
+        ]
+        return FaissIndexFactory.benchmark(vectors, queries, k, configurations)
+
     async def create_vector_db(
         self,
         chapter_summaries_input: Tuple[Any],
         book_quotes_list: List[Document],
         hp_pdf_path: str,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        manifest_path: str = "vector_store_manifest.json",
+        build_mode: str = "sequential",
+        num_workers: int = 2,
+        batch_size: int = 64,
     ) -> Tuple[Union[FAISS, Any], Union[FAISS, Any], Union[FAISS, List, Any]]:
         """
         Description:
             Creating Vector Stores and Retrievers for Book and Chapter Summaries.
-            Loads existing FAISS stores if present, otherwise builds them and saves to disk.
+            A manifest records the source PDF hash, chunking parameters, embedding model
+            and per-store document hashes. Stores whose inputs are unchanged are loaded
+            from disk; changed stores are patched with add/delete deltas, and everything
+            is rebuilt only when the embedding model changes.
+            In "concurrent" build mode the three stores are synced at the same time and
+            share one embedding work queue with cross-store batching.
 
         Params:
             chapter_summaries_input (list[Document]): Chapter summaries to encode.
             book_quotes_list (list[Document]): Book quotes to encode.
             hp_pdf_path (str): Path to the PDF source used for chunking/encoding.
+            chunk_size (int): The desired size of each book chunk.
+            chunk_overlap (int): The overlap between consecutive book chunks.
+            manifest_path (str): Location of the vector store manifest.
+            build_mode (str): "sequential" builds the stores one after another; "concurrent"
+                builds them together on one shared embedding work queue.
+            num_workers (int): Embedding worker threads in concurrent mode.
+            batch_size (int): Texts per embedding batch in concurrent mode.
 
         Return:
             tuple: (chunks_vector_store, chapter_summaries_vector_store, book_quotes_vectorstore)
 
         Exceptions:
             TypeError: If inputs are not of expected types.
+            ValueError: If build_mode is unknown.
             RuntimeError: If building/loading vector stores fails.
         """
         logger.info("Starting create_vector_db")
@@ -264,74 +715,120 @@ class EncodeEmbeddings:
             raise TypeError("book_quotes_list must be a list of Document objects")
         if not isinstance(hp_pdf_path, str):
             raise TypeError("hp_pdf_path must be a string")
+        if build_mode not in ("sequential", "concurrent"):
+            raise ValueError("build_mode must be 'sequential' or 'concurrent'")
 
         chunks_vector_store: Optional[FAISS] = None
         chapter_summaries_vector_store: Optional[FAISS] = None
         book_quotes_vectorstore: Union[FAISS, List, Any] = []
 
         try:
-            # If vector stores exist on disk, load them
-            if (
-                os.path.exists("chunks_vector_store")
-                and os.path.exists("chapter_summaries_vector_store")
-                and os.path.exists("book_quotes_vectorstore")
-            ):
-                logger.info("Found existing vector stores; loading from disk")
-                embeddings = HuggingFaceEmbeddings(
-                    model_name="C:/Users/703395858/PycharmProjects/agentic_ai/backend/models/all-MiniLM-L6-v2",
-                    model_kwargs={"device": "cpu"},
-                )
+            manifest = await asyncio.to_thread(VectorStoreManifest.load, manifest_path)
+            model_id = EmbeddingModels().get_embedding_model_id()
+            rebuild = manifest.embedding_model != model_id
+            if rebuild:
+                logger.info("No manifest or embedding model changed; rebuilding stores")
+                manifest.embedding_model = model_id
+                manifest.stores = {}
+
+            embeddings = await asyncio.to_thread(EncodeEmbeddings.get_embeddings)
+            work_queue = (
+                EmbeddingWorkQueue(embeddings, num_workers, batch_size)
+                if build_mode == "concurrent"
+                else None
+            )
 
-                def load_faiss(folder: str, emb):
-                    return FAISS.load_local(
-                        folder, emb, allow_dangerous_deserialization=True
+            # 1. Book chunks: skip loading and splitting the PDF when nothing changed
+            async def sync_chunks() -> Union[FAISS, List]:
+                chunk_source = {
+                    "pdf_sha256": await asyncio.to_thread(
+                        VectorStoreManifest.file_sha256, hp_pdf_path
+                    ),
+                    "extractor": self.page_cache.extractor_name,
+                    "chapter_pattern": ChapterIndex.PATTERN,
+                    "chunk_size": chunk_size,
+                    "chunk_overlap": chunk_overlap,
+                    "index": self.chunk_index.describe(),
+                }
+                recorded_source = manifest.store_source(self.CHUNKS_STORE) or {}
+                # Older manifests recorded the query-time nprobe with the layout
+                if isinstance(recorded_source.get("index"), dict):
+                    recorded_source = {
+                        **recorded_source,
+                        "index": {
+                            key: value
+                            for key, value in recorded_source["index"].items()
+                            if key != "nprobe"
+                        },
+                    }
+                if (
+                    not rebuild
+                    and recorded_source == chunk_source
+                    and os.path.exists(self.CHUNKS_STORE)
+                ):
+                    logger.info(f"{self.CHUNKS_STORE} is up to date; loading from disk")
+                    store = await self.load_vector_store(
+                        self.CHUNKS_STORE, embeddings, self.lazy_load
                     )
-
-                chunks_vector_store = await asyncio.to_thread(
-                    load_faiss, "chunks_vector_store", embeddings
-                )
-                chapter_summaries_vector_store = await asyncio.to_thread(
-                    load_faiss, "chapter_summaries_vector_store", embeddings
+                    FaissIndexFactory.set_nprobe(store.index, self.chunk_index.nprobe)
+                    return store
+                chunks = await self.load_book_chunks(
+                    hp_pdf_path, chunk_size=chunk_size, chunk_overlap=chunk_overlap
                 )
-                book_quotes_vectorstore = await asyncio.to_thread(
-                    load_faiss, "book_quotes_vectorstore", embeddings
+                # A different index layout cannot be patched, only rebuilt
+                index_changed = recorded_source.get("index") != chunk_source["index"]
+                store = await self.sync_vector_store(
+                    self.CHUNKS_STORE,
+                    chunks,
+                    manifest,
+                    embeddings,
+                    source=chunk_source,
+                    rebuild=rebuild or index_changed,
+                    work_queue=work_queue,
+                    index_factory=self.chunk_index,
                 )
-
-                logger.info("Loaded vector stores from disk successfully")
-            else:
-                logger.info("Vector stores not found; encoding fresh vector stores")
-
-                # 1. Encode the book into a vector store of chunks
-                chunks_vector_store = await self.encode_book(
-                    hp_pdf_path, chunk_size=1000, chunk_overlap=200
+                # A patched store keeps the nprobe it was saved with
+                if not isinstance(store, list):
+                    FaissIndexFactory.set_nprobe(store.index, self.chunk_index.nprobe)
+                return store
+
+            # 2. Chapter summaries
+            async def sync_summaries() -> Union[FAISS, List]:
+                return await self.sync_vector_store(
+                    self.CHAPTER_SUMMARIES_STORE,
+                    chapter_summaries_input,
+                    manifest,
+                    embeddings,
+                    rebuild=rebuild,
+                    work_queue=work_queue,
                 )
 
-                # 2. Encode the chapter summaries into a vector store
-                chapter_summaries_vector_store = await self.encode_chapter_summaries(
-                    chapter_summaries_input
+            # 3. Book quotes
+            async def sync_quotes() -> Union[FAISS, List]:
+                return await self.sync_vector_store(
+                    self.BOOK_QUOTES_STORE,
+                    book_quotes_list,
+                    manifest,
+                    embeddings,
+                    rebuild=rebuild,
+                    work_queue=work_queue,
                 )
 
-                # 3. Encode the book quotes into a vector store
-                book_quotes_vectorstore = await self.encode_quotes(book_quotes_list)
-
-                # 4. Save the vector stores to disk for future use (blocking -> to_thread)
-                logger.info("Saving vector stores to disk")
-                if isinstance(chunks_vector_store, FAISS):
-                    await asyncio.to_thread(
-                        chunks_vector_store.save_local, "chunks_vector_store"
-                    )
-                if isinstance(chapter_summaries_vector_store, FAISS):
-                    await asyncio.to_thread(
-                        chapter_summaries_vector_store.save_local,
-                        "chapter_summaries_vector_store",
-                    )
-                if isinstance(book_quotes_vectorstore, FAISS):
-                    await asyncio.to_thread(
-                        book_quotes_vectorstore.save_local, "book_quotes_vectorstore"
+            if work_queue is None:
+                chunks_vector_store = await sync_chunks()
+                chapter_summaries_vector_store = await sync_summaries()
+                book_quotes_vectorstore = await sync_quotes()
+            else:
+                # All three stores feed one embedding queue, so wall time tracks the largest store
+                async with work_queue:
+                    (
+                        chunks_vector_store,
+                        chapter_summaries_vector_store,
+                        book_quotes_vectorstore,
+                    ) = await asyncio.gather(
+                        sync_chunks(), sync_summaries(), sync_quotes()
                     )
 
-                logger.info("Saved vector stores to disk successfully")
-
         except Exception as e:
             logger.exception("Error in create_vector_db")
             raise RuntimeError("Failed to create or load vector DBs") from e
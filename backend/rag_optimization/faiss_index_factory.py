@@ -0,0 +1,315 @@
+import math
+from time import monotonic
+from typing import Any, Dict, List, Optional
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from backend.config.logging_lib import logger
+
+
+class FaissIndexFactory:
+    """
+    Description:
+        Builds (optionally compressed) FAISS indexes for LangChain FAISS vector stores.
+        Supported index types:
+            - "flat":     exact search, 4 * dim bytes per vector
+            - "ivf_flat": inverted lists over full vectors, searches `nprobe` lists
+            - "ivf_pq":   inverted lists over product-quantized codes (`pq_m` bytes per vector)
+            - "sq8":      8-bit scalar quantization, dim bytes per vector
+            - "sq_fp16":  16-bit float scalar quantization, 2 * dim bytes per vector
+        Trainable indexes are trained on a random sample of the vectors.
+
+    Params:
+        index_type (str): One of INDEX_TYPES.
+        nlist (int, optional): Number of inverted lists; defaults to ~4 * sqrt(n).
+        nprobe (int): Inverted lists visited per query for IVF indexes.
+        pq_m (int, optional): PQ sub-quantizers; defaults to dim / 8 (must divide dim).
+        pq_nbits (int): Bits per PQ code.
+        training_sample_size (int): Maximum number of vectors used for training.
+    """
+
+    INDEX_TYPES = ("flat", "ivf_flat", "ivf_pq", "sq8", "sq_fp16")
+
+    # faiss k-means wants roughly this many training points per centroid
+    MIN_POINTS_PER_CENTROID = 39
+
+    def __init__(
+        self,
+        index_type: str = "flat",
+        nlist: Optional[int] = None,
+        nprobe: int = 8,
+        pq_m: Optional[int] = None,
+        pq_nbits: int = 8,
+        training_sample_size: int = 50000,
+    ):
+        if index_type not in self.INDEX_TYPES:
+            raise ValueError(f"index_type must be one of {self.INDEX_TYPES}")
+        if not isinstance(nprobe, int) or nprobe < 1:
+            raise ValueError("nprobe must be a positive integer")
+        self.index_type = index_type
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.pq_m = pq_m
+        self.pq_nbits = pq_nbits
+        self.training_sample_size = training_sample_size
+
+    def describe(self) -> Dict[str, Any]:
+        """
+        Description:
+            Settings that determine the index layout (recorded in the store manifest).
+            nprobe is left out: it only affects queries and is applied with
+            set_nprobe() when the index is built or loaded, so changing it never
+            forces a rebuild.
+
+        Params:
+            None
+
+        Return:
+            dict: The index settings.
+
+        Exceptions:
+            None
+        """
+        return {
+            "index_type": self.index_type,
+            "nlist": self.nlist,
+            "pq_m": self.pq_m,
+            "pq_nbits": self.pq_nbits,
+        }
+
+    def _factory_string(self, dim: int, num_vectors: int) -> str:
+        if self.index_type == "flat":
+            return "Flat"
+        if self.index_type == "sq8":
+            return "SQ8"
+        if self.index_type == "sq_fp16":
+            return "SQfp16"
+
+        nlist = self.nlist or max(1, int(4 * math.sqrt(num_vectors)))
+        max_nlist = max(1, num_vectors // self.MIN_POINTS_PER_CENTROID)
+        if nlist > max_nlist:
+            logger.warning(
+                f"nlist={nlist} is too large for {num_vectors} vectors; using {max_nlist}"
+            )
+            nlist = max_nlist
+        if self.index_type == "ivf_flat":
+            return f"IVF{nlist},Flat"
+
+        pq_m = self.pq_m or self._default_pq_m(dim)
+        if dim % pq_m != 0:
+            raise ValueError(f"pq_m={pq_m} must divide the vector dimension {dim}")
+        # Each PQ sub-quantizer is a k-means with 2 ** nbits centroids
+        pq_nbits = min(
+            self.pq_nbits,
+            max(1, int(math.log2(max(num_vectors // self.MIN_POINTS_PER_CENTROID, 2)))),
+        )
+        if pq_nbits != self.pq_nbits:
+            logger.warning(
+                f"Too few vectors for {self.pq_nbits}-bit PQ; using {pq_nbits}"
+            )
+        return f"IVF{nlist},PQ{pq_m}x{pq_nbits}"
+
+    @staticmethod
+    def _default_pq_m(dim: int) -> int:
+        for m in range(max(1, dim // 8), 0, -1):
+            if dim % m == 0:
+                return m
+        return 1
+
+    def build_index(self, vectors: np.ndarray) -> Any:
+        """
+        Description:
+            Create an empty FAISS index for the configured type and train it on a sample
+            of `vectors`. The vectors themselves are not added.
+
+        Params:
+            vectors (np.ndarray): float32 array of shape (n, dim) used for training.
+
+        Return:
+            faiss.Index: The trained, empty index.
+
+        Exceptions:
+            ValueError: If vectors is not a non-empty 2-D array.
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) == 0:
+            raise ValueError("vectors must be a non-empty 2-D array")
+        num_vectors, dim = vectors.shape
+
+        factory_string = self._factory_string(dim, num_vectors)
+        index = faiss.index_factory(dim, factory_string)
+
+        if not index.is_trained:
+            if num_vectors > self.training_sample_size:
+                rng = np.random.default_rng(0)
+                sample = vectors[
+                    rng.choice(num_vectors, self.training_sample_size, replace=False)
+                ]
+            else:
+                sample = vectors
+            start_time = monotonic()
+            index.train(sample)
+            logger.info(
+                f"Trained {factory_string} on {len(sample)} vectors in "
+                f"{monotonic() - start_time:.2f}s"
+            )
+
+        self.set_nprobe(index, self.nprobe)
+        return index
+
+    @staticmethod
+    def set_nprobe(index: Any, nprobe: int) -> None:
+        """
+        Description:
+            Set the number of probed inverted lists on IVF indexes (no-op otherwise).
+
+        Params:
+            index (faiss.Index): The index.
+            nprobe (int): Inverted lists visited per query.
+
+        Return:
+            None
+
+        Exceptions:
+            None
+        """
+        try:
+            faiss.extract_index_ivf(index).nprobe = nprobe
+        except RuntimeError:
+            pass
+
+    def build_vector_store(
+        self,
+        texts: List[str],
+        vectors: List[List[float]],
+        embeddings: Any,
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+    ) -> FAISS:
+        """
+        Description:
+            Build a LangChain FAISS vector store backed by the configured index type.
+
+        Params:
+            texts (list[str]): Document texts.
+            vectors (list[list[float]]): Precomputed embeddings, one per text.
+            embeddings (Embeddings): Embedding function used for queries.
+            metadatas (list[dict], optional): Document metadata.
+            ids (list[str], optional): Document ids.
+
+        Return:
+            FAISS: The populated vector store.
+
+        Exceptions:
+            ValueError: If texts and vectors differ in length.
+        """
+        if len(texts) != len(vectors):
+            raise ValueError("texts and vectors must have the same length")
+        index = self.build_index(np.asarray(vectors, dtype=np.float32))
+        store = FAISS(
+            embedding_function=embeddings,
+            index=index,
+            docstore=InMemoryDocstore(),
+            index_to_docstore_id={},
+        )
+        store.add_embeddings(list(zip(texts, vectors)), metadatas=metadatas, ids=ids)
+        return store
+
+    @staticmethod
+    def bytes_per_vector(index: Any) -> float:
+        """
+        Description:
+            Serialized index size divided by the number of stored vectors.
+
+        Params:
+            index (faiss.Index): A populated index.
+
+        Return:
+            float: Bytes per vector (including index overhead).
+
+        Exceptions:
+            None
+        """
+        if index.ntotal == 0:
+            return 0.0
+        return faiss.serialize_index(index).nbytes / index.ntotal
+
+    @classmethod
+    def benchmark(
+        cls,
+        vectors: np.ndarray,
+        queries: np.ndarray,
+        k: int = 10,
+        configurations: Optional[List[Dict[str, Any]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Description:
+            Compare index configurations on recall@k (against exact flat search),
+            query latency and bytes per vector, so a setting can be picked per deployment.
+
+        Params:
+            vectors (np.ndarray): Corpus vectors, shape (n, dim).
+            queries (np.ndarray): Query vectors, shape (q, dim).
+            k (int): Neighbours per query.
+            configurations (list[dict], optional): FaissIndexFactory kwargs to compare;
+                defaults to one configuration per index type.
+
+        Return:
+            list[dict]: One row per configuration with recall_at_k, ms_per_query,
+                        bytes_per_vector and train_seconds.
+
+        Exceptions:
+            ValueError: If vectors or queries are malformed.
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        queries = np.ascontiguousarray(queries, dtype=np.float32)
+        configurations = configurations or [
+            {"index_type": index_type} for index_type in cls.INDEX_TYPES
+        ]
+
+        exact = faiss.IndexFlatL2(vectors.shape[1])
+        exact.add(vectors)
+        _, truth = exact.search(queries, k)
+
+        report = []
+        for configuration in configurations:
+            factory = cls(**configuration)
+            start_time = monotonic()
+            index = factory.build_index(vectors)
+            train_seconds = monotonic() - start_time
+            index.add(vectors)
+
+            start_time = monotonic()
+            _, found = index.search(queries, k)
+            ms_per_query = (monotonic() - start_time) * 1000 / len(queries)
+
+            hits = sum(
+                len(set(truth_row) & set(found_row))
+                for truth_row, found_row in zip(truth, found)
+            )
+            row = dict(factory.describe())
+            row.update(
+                {
+                    "nprobe": factory.nprobe,
+                    "recall_at_k": hits / (len(queries) * k),
+                    "ms_per_query": ms_per_query,
+                    "bytes_per_vector": cls.bytes_per_vector(index),
+                    "train_seconds": train_seconds,
+                }
+            )
+            report.append(row)
+            logger.info(
+                f"{factory.index_type}: recall@{k}={row['recall_at_k']:.3f}, "
+                f"{ms_per_query:.3f} ms/query, {row['bytes_per_vector']:.1f} B/vector"
+            )
+        return report
+
+
+# Example usage:
+if __name__ == "__main__":
+    rng = np.random.default_rng(42)
+    corpus = rng.standard_normal((20000, 384)).astype(np.float32)
+    query_vectors = rng.standard_normal((200, 384)).astype(np.float32)
+    for result in FaissIndexFactory.benchmark(corpus, query_vectors, k=10):
+        print(result)
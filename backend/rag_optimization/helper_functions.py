@@ -11,13 +11,15 @@ import textwrap
 
 # Third-party imports
 import tiktoken
-import PyPDF2
 
 # import pylcs
 import pandas as pd
 import dill
 from langchain.docstore.document import Document
 
+# Local imports
+from backend.config.pdf_extractors import get_pdf_extractor
+
 
 # =============================================================================
 # TEXT PROCESSING FUNCTIONS
@@ -96,24 +98,20 @@ def split_into_chapters(book_path):
         list: A list of Document objects, each representing a chapter with its
               text content and chapter number metadata.
     """
-    with open(book_path, "rb") as pdf_file:
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        documents = pdf_reader.pages
-
-        # Concatenate text from all pages
-        text = " ".join([doc.extract_text() for doc in documents])
+    # Concatenate text from all pages
+    text = " ".join(get_pdf_extractor().extract_pages(book_path))
 
-        # Split text into chapters based on chapter title pattern
-        chapters = re.split(r"(CHAPTER\s[A-Z]+(?:\s[A-Z]+)*)", text)
+    # Split text into chapters based on chapter title pattern
+    chapters = re.split(r"(CHAPTER\s[A-Z]+(?:\s[A-Z]+)*)", text)
 
-        # Create Document objects with chapter metadata
-        chapter_docs = []
-        chapter_num = 1
-        for i in range(1, len(chapters), 2):
-            chapter_text = chapters[i] + chapters[i + 1]  # Combine title and content
-            doc = Document(page_content=chapter_text, metadata={"chapter": chapter_num})
-            chapter_docs.append(doc)
-            chapter_num += 1
+    # Create Document objects with chapter metadata
+    chapter_docs = []
+    chapter_num = 1
+    for i in range(1, len(chapters), 2):
+        chapter_text = chapters[i] + chapters[i + 1]  # Combine title and content
+        doc = Document(page_content=chapter_text, metadata={"chapter": chapter_num})
+        chapter_docs.append(doc)
+        chapter_num += 1
 
     return chapter_docs
 
@@ -0,0 +1,277 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterator, List, MutableMapping, Union
+import faiss
+from langchain_community.docstore.base import AddableMixin, Docstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from backend.config.logging_lib import logger
+
+
+class SQLiteDocstore(Docstore, AddableMixin):
+    """
+    Description:
+        On-disk docstore backed by SQLite. Document text and metadata are read only
+        when a search hit needs them, so loading a store does not unpickle the corpus.
+        Also holds the index position -> docstore id table used by FAISS.
+
+    Params:
+        path (str): Location of the SQLite database file.
+    """
+
+    def __init__(self, path: str):
+        if not isinstance(path, str):
+            raise TypeError("path must be a string")
+        self.path = path
+        self._lock = threading.Lock()
+        # FAISS searches run in worker threads; access is serialised by _lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents "
+                "(doc_id TEXT PRIMARY KEY, text TEXT NOT NULL, metadata TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS positions "
+                "(position INTEGER PRIMARY KEY, doc_id TEXT NOT NULL)"
+            )
+
+    def search(self, search: str) -> Union[str, Document]:
+        """
+        Description:
+            Fetch one document by docstore id.
+
+        Params:
+            search (str): The docstore id.
+
+        Return:
+            Document or str: The document, or a "not found" message like InMemoryDocstore.
+
+        Exceptions:
+            None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, metadata FROM documents WHERE doc_id = ?", (search,)
+            ).fetchone()
+        if row is None:
+            return f"ID {search} not found."
+        return Document(id=search, page_content=row[0], metadata=json.loads(row[1]))
+
+    def add(self, texts: Dict[str, Document]) -> None:
+        """
+        Description:
+            Insert documents keyed by docstore id.
+
+        Params:
+            texts (dict[str, Document]): Documents to insert.
+
+        Return:
+            None
+
+        Exceptions:
+            ValueError: If an id is already present.
+        """
+        rows = [
+            (doc_id, doc.page_content, json.dumps(doc.metadata, default=str))
+            for doc_id, doc in texts.items()
+        ]
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany("INSERT INTO documents VALUES (?, ?, ?)", rows)
+        except sqlite3.IntegrityError as e:
+            raise ValueError(f"Tried to add ids that already exist: {e}") from e
+
+    def delete(self, ids: List) -> None:
+        """
+        Description:
+            Delete documents by docstore id.
+
+        Params:
+            ids (list[str]): Ids to delete.
+
+        Return:
+            None
+
+        Exceptions:
+            None
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM documents WHERE doc_id = ?", [(i,) for i in ids]
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class SQLiteIndexToDocstoreId(MutableMapping):
+    """
+    Description:
+        FAISS position -> docstore id mapping read from the docstore's positions table,
+        used in place of the in-memory dict LangChain normally unpickles.
+
+    Params:
+        docstore (SQLiteDocstore): The docstore owning the positions table.
+    """
+
+    def __init__(self, docstore: SQLiteDocstore):
+        self.docstore = docstore
+
+    def __getitem__(self, position: int) -> str:
+        with self.docstore._lock:
+            row = self.docstore._conn.execute(
+                "SELECT doc_id FROM positions WHERE position = ?", (int(position),)
+            ).fetchone()
+        if row is None:
+            raise KeyError(position)
+        return row[0]
+
+    def __setitem__(self, position: int, doc_id: str) -> None:
+        with self.docstore._lock, self.docstore._conn:
+            self.docstore._conn.execute(
+                "INSERT OR REPLACE INTO positions VALUES (?, ?)",
+                (int(position), doc_id),
+            )
+
+    def __delitem__(self, position: int) -> None:
+        with self.docstore._lock, self.docstore._conn:
+            self.docstore._conn.execute(
+                "DELETE FROM positions WHERE position = ?", (int(position),)
+            )
+
+    def __iter__(self) -> Iterator[int]:
+        with self.docstore._lock:
+            rows = self.docstore._conn.execute(
+                "SELECT position FROM positions ORDER BY position"
+            ).fetchall()
+        return iter(row[0] for row in rows)
+
+    def __len__(self) -> int:
+        with self.docstore._lock:
+            return self.docstore._conn.execute(
+                "SELECT COUNT(*) FROM positions"
+            ).fetchone()[0]
+
+    def update(self, other: Any = (), **kwargs: Any) -> None:
+        rows = [(int(k), v) for k, v in dict(other, **kwargs).items()]
+        with self.docstore._lock, self.docstore._conn:
+            self.docstore._conn.executemany(
+                "INSERT OR REPLACE INTO positions VALUES (?, ?)", rows
+            )
+
+
+class LazyVectorStore:
+    """
+    Description:
+        Save/load helpers for the lazy FAISS layout: the regular `index.faiss` written by
+        FAISS.save_local plus a `docstore.sqlite` next to it. Loading memory-maps the
+        index and opens the SQLite docstore, so start-up time and resident memory do not
+        grow with the corpus; text is only read for the top-k hits.
+    """
+
+    INDEX_FILE = "index.faiss"
+    DOCSTORE_FILE = "docstore.sqlite"
+
+    @classmethod
+    def has_lazy_layout(cls, folder: str) -> bool:
+        """
+        Description:
+            Whether `folder` contains both the FAISS index and the SQLite docstore.
+
+        Params:
+            folder (str): Store folder.
+
+        Return:
+            bool: True if the store can be loaded lazily.
+
+        Exceptions:
+            None
+        """
+        return os.path.exists(os.path.join(folder, cls.INDEX_FILE)) and os.path.exists(
+            os.path.join(folder, cls.DOCSTORE_FILE)
+        )
+
+    @classmethod
+    def save_docstore(cls, store: FAISS, folder: str) -> None:
+        """
+        Description:
+            Write the docstore and position mapping of an in-memory FAISS store to
+            `folder/docstore.sqlite` (the index itself is written by FAISS.save_local).
+
+        Params:
+            store (FAISS): The vector store to export.
+            folder (str): Store folder.
+
+        Return:
+            None
+
+        Exceptions:
+            TypeError: If store is not a FAISS instance.
+            ValueError: If a mapped document is missing from the docstore.
+        """
+        if not isinstance(store, FAISS):
+            raise TypeError("store must be a FAISS instance")
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, cls.DOCSTORE_FILE)
+        tmp_path = path + ".tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        documents: Dict[str, Document] = {}
+        for doc_id in store.index_to_docstore_id.values():
+            doc = store.docstore.search(doc_id)
+            if not isinstance(doc, Document):
+                raise ValueError(f"Could not find document for id {doc_id}")
+            documents[doc_id] = doc
+
+        docstore = SQLiteDocstore(tmp_path)
+        try:
+            docstore.add(documents)
+            SQLiteIndexToDocstoreId(docstore).update(store.index_to_docstore_id)
+        finally:
+            docstore.close()
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, folder: str, embeddings: Any, mmap: bool = True) -> FAISS:
+        """
+        Description:
+            Load a store saved in the lazy layout.
+
+        Params:
+            folder (str): Store folder.
+            embeddings (Embeddings): Embedding function used for queries.
+            mmap (bool): Memory-map the index instead of reading it into RAM.
+
+        Return:
+            FAISS: A read-only vector store with an on-disk docstore.
+
+        Exceptions:
+            FileNotFoundError: If the folder is not in the lazy layout.
+        """
+        if not cls.has_lazy_layout(folder):
+            raise FileNotFoundError(f"No lazy vector store in {folder}")
+
+        flags = 0
+        if mmap:
+            flags = (
+                getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+                | faiss.IO_FLAG_READ_ONLY
+            )
+        index = faiss.read_index(os.path.join(folder, cls.INDEX_FILE), flags)
+        docstore = SQLiteDocstore(os.path.join(folder, cls.DOCSTORE_FILE))
+        logger.info(f"Lazily loaded {folder} ({index.ntotal} vectors, mmap={mmap})")
+        return FAISS(
+            embedding_function=embeddings,
+            index=index,
+            docstore=docstore,
+            index_to_docstore_id=SQLiteIndexToDocstoreId(docstore),
+        )
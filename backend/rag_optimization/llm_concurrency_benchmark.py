@@ -0,0 +1,155 @@
+import argparse
+import asyncio
+import threading
+import time
+from time import monotonic
+from typing import Any, Dict, List, Optional
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.prompts import PromptTemplate
+from backend.config.logging_lib import logger
+
+MODES = ("thread", "ainvoke", "abatch")
+
+
+class _SimulatedChatModel(BaseChatModel):
+    """Chat model that answers after a fixed delay: blocking in invoke, awaited in ainvoke."""
+
+    latency: float = 0.5
+
+    @property
+    def _llm_type(self) -> str:
+        return "simulated-latency"
+
+    def _generate(
+        self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs
+    ) -> ChatResult:
+        time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage("ok"))])
+
+    async def _agenerate(
+        self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs
+    ) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage("ok"))])
+
+
+async def _peak_threads(stop: asyncio.Event, peak: List[int]) -> None:
+    while not stop.is_set():
+        peak[0] = max(peak[0], threading.active_count())
+        await asyncio.sleep(0.01)
+
+
+async def run_questions(chain: Any, questions: List[str], mode: str) -> List[Any]:
+    """
+    Description:
+        Answer all questions at once with one of the execution modes:
+        "thread" (asyncio.to_thread(chain.invoke), the old path), "ainvoke" (one
+        native coroutine per question) or "abatch" (chain.abatch with every
+        question in flight).
+
+    Params:
+        chain (Any): The chain to run.
+        questions (list[str]): Questions, all issued concurrently.
+        mode (str): One of MODES.
+
+    Return:
+        list[Any]: Chain outputs in question order.
+
+    Exceptions:
+        ValueError: If mode is unknown.
+    """
+    inputs = [{"question": question} for question in questions]
+    if mode == "thread":
+        return await asyncio.gather(
+            *[asyncio.to_thread(chain.invoke, data) for data in inputs]
+        )
+    if mode == "ainvoke":
+        return await asyncio.gather(*[chain.ainvoke(data) for data in inputs])
+    if mode == "abatch":
+        return await chain.abatch(inputs, config={"max_concurrency": len(inputs)})
+    raise ValueError(f"Unknown mode {mode!r}; expected one of {MODES}")
+
+
+async def benchmark_concurrency(
+    llm: Any, in_flight_levels: List[int], modes: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Description:
+        Measure how each execution mode scales with the number of in-flight
+        questions: wall time, throughput and the peak number of OS threads.
+
+    Params:
+        llm (Any): Chat model to call.
+        in_flight_levels (list[int]): Concurrent question counts to try.
+        modes (list[str], optional): Modes to compare; defaults to all MODES.
+
+    Return:
+        list[dict]: One row per (mode, in_flight) with seconds,
+                    questions_per_second and peak_threads.
+
+    Exceptions:
+        ValueError: If a mode is unknown.
+    """
+    chain = (
+        PromptTemplate(
+            template="Answer in one word: {question}", input_variables=["question"]
+        )
+        | llm
+        | StrOutputParser()
+    )
+    rows = []
+    for mode in modes or MODES:
+        for in_flight in in_flight_levels:
+            questions = [f"question {i}" for i in range(in_flight)]
+            stop, peak = asyncio.Event(), [threading.active_count()]
+            sampler = asyncio.create_task(_peak_threads(stop, peak))
+            start_time = monotonic()
+            await run_questions(chain, questions, mode)
+            seconds = monotonic() - start_time
+            stop.set()
+            await sampler
+            rows.append(
+                {
+                    "mode": mode,
+                    "in_flight": in_flight,
+                    "seconds": seconds,
+                    "questions_per_second": in_flight / seconds if seconds else 0.0,
+                    "peak_threads": peak[0],
+                }
+            )
+            logger.info(f"LLM concurrency benchmark: {rows[-1]}")
+    return rows
+
+
+# Example usage:
+#   python -m backend.rag_optimization.llm_concurrency_benchmark --simulated-latency 0.5
+#   python -m backend.rag_optimization.llm_concurrency_benchmark --in-flight 1 10 50
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare LLM execution modes")
+    parser.add_argument(
+        "--in-flight", type=int, nargs="+", default=[1, 10, 50, 100, 200, 400]
+    )
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument(
+        "--simulated-latency",
+        type=float,
+        help="Use a local model with this response time instead of Azure OpenAI",
+    )
+    args = parser.parse_args()
+
+    if args.simulated_latency is not None:
+        model = _SimulatedChatModel(latency=args.simulated_latency)
+    else:
+        from backend.config.azure_models import AzureOpenAIModels
+
+        model = AzureOpenAIModels().get_azure_model_4()
+
+    print(f"{'mode':<8} {'in_flight':>9} {'seconds':>8} {'q/s':>8} {'threads':>8}")
+    for result in asyncio.run(benchmark_concurrency(model, args.in_flight, args.modes)):
+        print(
+            f"{result['mode']:<8} {result['in_flight']:>9} {result['seconds']:>8.2f} "
+            f"{result['questions_per_second']:>8.1f} {result['peak_threads']:>8}"
+        )
@@ -0,0 +1,280 @@
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from backend.config.logging_lib import logger
+
+
+class _TokenBudget:
+    """Tokens-per-minute bucket: refills continuously, holds at most one minute of tokens."""
+
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = float(tokens_per_minute)
+        self.available = float(tokens_per_minute)
+        self.rate = tokens_per_minute / 60.0
+        self.updated = monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = monotonic()
+        self.available = min(
+            self.capacity, self.available + (now - self.updated) * self.rate
+        )
+        self.updated = now
+
+    async def acquire(self, tokens: int) -> None:
+        # A request larger than the whole budget waits for a full bucket
+        tokens = min(float(tokens), self.capacity)
+        async with self._lock:
+            self._refill()
+            while self.available < tokens:
+                await asyncio.sleep((tokens - self.available) / self.rate)
+                self._refill()
+            self.available -= tokens
+
+
+class LLMScheduler:
+    """
+    Description:
+        Schedules LLM calls under Azure OpenAI rate limits, either blocking calls
+        (`chain.invoke`, run_in_thread) or native async ones (`chain.ainvoke`,
+        run_async). At most `max_in_flight` calls run at once; blocking calls run on
+        a dedicated thread pool of that size (instead of the shared default
+        executor), async calls on the event loop itself. Each call first draws its
+        estimated token count from a tokens-per-minute budget. Rate-limit, timeout and
+        5xx errors are retried with full-jitter exponential backoff, honouring
+        Retry-After when the error carries it. Queue time, run time and attempts are
+        recorded per call.
+
+    Params:
+        max_in_flight (int): Maximum concurrent LLM calls.
+        tokens_per_minute (int, optional): Token budget per minute; None or 0 disables it.
+        max_retries (int): Retries after the first attempt for retryable errors.
+        base_delay (float): Backoff base in seconds.
+        max_delay (float): Backoff cap in seconds.
+    """
+
+    RETRYABLE_STATUS_CODES = (408, 409, 429, 500, 502, 503, 504)
+    RETRYABLE_ERRORS = (
+        "RateLimitError",
+        "APITimeoutError",
+        "APIConnectionError",
+        "InternalServerError",
+    )
+
+    def __init__(
+        self,
+        max_in_flight: int = 4,
+        tokens_per_minute: Optional[int] = None,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ):
+        if not isinstance(max_in_flight, int) or max_in_flight < 1:
+            raise ValueError("max_in_flight must be a positive integer")
+        if tokens_per_minute is not None and tokens_per_minute < 0:
+            raise ValueError("tokens_per_minute must not be negative")
+        self.max_in_flight = max_in_flight
+        self.tokens_per_minute = tokens_per_minute or None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timings: List[Dict[str, Any]] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Created lazily so they bind to the running event loop
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._budget: Optional[_TokenBudget] = None
+
+    def _ensure_started(self) -> None:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+            if self.tokens_per_minute:
+                self._budget = _TokenBudget(self.tokens_per_minute)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_in_flight, thread_name_prefix="llm-call"
+            )
+
+    @classmethod
+    def is_retryable(cls, error: BaseException) -> bool:
+        """
+        Description:
+            Whether an LLM client error is worth retrying (rate limits, timeouts, 5xx).
+
+        Params:
+            error (BaseException): The raised error.
+
+        Return:
+            bool: True if the call should be retried.
+
+        Exceptions:
+            None
+        """
+        status = getattr(error, "status_code", None)
+        return (
+            status in cls.RETRYABLE_STATUS_CODES
+            or type(error).__name__ in cls.RETRYABLE_ERRORS
+        )
+
+    def backoff_delay(self, attempt: int, error: BaseException) -> float:
+        """
+        Description:
+            Delay before retry number `attempt` (0-based): the server's Retry-After if
+            given, otherwise a uniform draw from [0, min(max_delay, base * 2 ** attempt)].
+
+        Params:
+            attempt (int): Retry number.
+            error (BaseException): The error being retried.
+
+        Return:
+            float: Seconds to wait.
+
+        Exceptions:
+            None
+        """
+        response = getattr(error, "response", None)
+        retry_after = getattr(response, "headers", {}).get("retry-after")
+        try:
+            if retry_after is not None:
+                return min(self.max_delay, float(retry_after))
+        except ValueError:
+            pass
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    async def _schedule(
+        self, call: Callable[[], Awaitable[Any]], tokens: int, label: str
+    ) -> Any:
+        self._ensure_started()
+        timing = {
+            "label": label,
+            "tokens": tokens,
+            "queued_seconds": 0.0,
+            "run_seconds": 0.0,
+            "attempts": 0,
+            "ok": False,
+        }
+        self.timings.append(timing)
+
+        attempt = 0
+        while True:
+            queued_at = monotonic()
+            async with self._slots:
+                if self._budget is not None and tokens:
+                    await self._budget.acquire(tokens)
+                timing["queued_seconds"] += monotonic() - queued_at
+                timing["attempts"] += 1
+                started_at = monotonic()
+                try:
+                    result = await call()
+                    timing["ok"] = True
+                    return result
+                except Exception as e:
+                    if not self.is_retryable(e) or attempt >= self.max_retries:
+                        raise
+                    delay = self.backoff_delay(attempt, e)
+                    logger.warning(
+                        f"LLM call {label} failed with {type(e).__name__}; "
+                        f"retry {attempt + 1}/{self.max_retries} in {delay:.1f}s"
+                    )
+                finally:
+                    timing["run_seconds"] += monotonic() - started_at
+            # Back off outside the slot so other calls can proceed
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def run_in_thread(
+        self, fn: Callable[..., Any], *args: Any, tokens: int = 0, label: str = ""
+    ) -> Any:
+        """
+        Description:
+            Run a blocking LLM call under the concurrency limit and token budget.
+
+        Params:
+            fn (callable): Blocking function, e.g. chain.invoke.
+            *args: Arguments for fn.
+            tokens (int): Estimated prompt + completion tokens for the call.
+            label (str): Name used in the timing report (e.g. "chapter 3").
+
+        Return:
+            Any: fn's result.
+
+        Exceptions:
+            Exception: fn's error once it is not retryable or retries are exhausted.
+        """
+        loop = asyncio.get_running_loop()
+        return await self._schedule(
+            lambda: loop.run_in_executor(self._executor, fn, *args), tokens, label
+        )
+
+    async def run_async(
+        self,
+        fn: Callable[..., Awaitable[Any]],
+        *args: Any,
+        tokens: int = 0,
+        label: str = "",
+    ) -> Any:
+        """
+        Description:
+            Await a native async LLM call (e.g. chain.ainvoke) under the concurrency
+            limit and token budget. The call runs on the event loop, so waiting on
+            the API holds no thread.
+
+        Params:
+            fn (callable): Coroutine function, e.g. chain.ainvoke.
+            *args: Arguments for fn.
+            tokens (int): Estimated prompt + completion tokens for the call.
+            label (str): Name used in the timing report (e.g. "chapter 3").
+
+        Return:
+            Any: fn's result.
+
+        Exceptions:
+            Exception: fn's error once it is not retryable or retries are exhausted.
+        """
+        return await self._schedule(lambda: fn(*args), tokens, label)
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Description:
+            Summary of all scheduled calls.
+
+        Params:
+            None
+
+        Return:
+            dict: calls (per-call timings), retries, total and max queue/run seconds.
+
+        Exceptions:
+            None
+        """
+        return {
+            "calls": list(self.timings),
+            "retries": sum(max(0, t["attempts"] - 1) for t in self.timings),
+            "total_queued_seconds": sum(t["queued_seconds"] for t in self.timings),
+            "total_run_seconds": sum(t["run_seconds"] for t in self.timings),
+            "max_queued_seconds": max(
+                (t["queued_seconds"] for t in self.timings), default=0.0
+            ),
+            "max_run_seconds": max(
+                (t["run_seconds"] for t in self.timings), default=0.0
+            ),
+        }
+
+    def close(self) -> None:
+        """
+        Description:
+            Shut down the scheduler's thread pool.
+
+        Params:
+            None
+
+        Return:
+            None
+
+        Exceptions:
+            None
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,270 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import PromptTemplate
+from backend.config.logging_lib import logger
+from backend.rag_optimization.llm_scheduler import LLMScheduler
+from backend.rag_optimization.summary_cache import SummaryCache
+from backend.rag_optimization.token_counter import TokenCounter
+
+
+class MapReduceSummarizer:
+    """
+    Description:
+        Map-reduce summarization of long texts. The text is split on line
+        boundaries into chunks of at most `map_tokens` tokens, every chunk is
+        summarized concurrently through the LLMScheduler (so the in-flight and
+        tokens-per-minute limits apply), and the partial summaries are reduced
+        level by level, packing up to `reduce_tokens` tokens of summaries into each
+        reduce call, until one summary remains.
+
+        Every map and reduce result is written to a SummaryCache as soon as it
+        arrives. If a call fails, the level still runs to completion and then
+        raises; running the summarizer again on the same text reuses the finished
+        results and only repeats the failed calls.
+
+    Params:
+        llm (Any): LangChain chat model used for map and reduce calls.
+        prompt_template (str): Summarization prompt with a `{text}` variable.
+        deployment (str): LLM deployment name, part of the cache key.
+        scheduler (LLMScheduler, optional): Scheduler for the LLM calls.
+        cache (SummaryCache, optional): Store for partial summaries.
+        token_model (str): Model name used to count tokens.
+        map_tokens (int): Maximum tokens of text per map call.
+        reduce_tokens (int): Maximum tokens of summaries per reduce call.
+        completion_tokens (int): Expected completion tokens per call, for the budget.
+        async_native (bool): Await chain.ainvoke instead of running chain.invoke on
+            the scheduler's threads.
+    """
+
+    def __init__(
+        self,
+        llm: Any,
+        prompt_template: str,
+        deployment: str,
+        scheduler: Optional[LLMScheduler] = None,
+        cache: Optional[SummaryCache] = None,
+        token_model: str = TokenCounter.DEFAULT_MODEL,
+        map_tokens: int = 8000,
+        reduce_tokens: int = 16000,
+        completion_tokens: int = 2000,
+        async_native: bool = True,
+    ):
+        if "{text}" not in prompt_template:
+            raise ValueError("prompt_template must contain a {text} variable")
+        if map_tokens < 1 or reduce_tokens < 1:
+            raise ValueError("map_tokens and reduce_tokens must be positive")
+        self.prompt_template = prompt_template
+        self.deployment = deployment
+        self.scheduler = scheduler or LLMScheduler()
+        self.cache = cache or SummaryCache("chapter_summary_cache/partials")
+        self.token_model = token_model
+        self.map_tokens = map_tokens
+        self.reduce_tokens = reduce_tokens
+        self.completion_tokens = completion_tokens
+        self.async_native = async_native
+        self.chain = (
+            PromptTemplate(template=prompt_template, input_variables=["text"])
+            | llm
+            | StrOutputParser()
+        )
+        self.prompt_tokens = TokenCounter.count(prompt_template, token_model)
+
+    def split(self, text: str) -> List[str]:
+        """
+        Description:
+            Split text into chunks of at most map_tokens tokens, cutting between
+            lines; a single line longer than the budget is cut on token boundaries.
+
+        Params:
+            text (str): Text to split.
+
+        Return:
+            list[str]: Chunks in order; joined they give back the text.
+
+        Exceptions:
+            TypeError: If text is not a string.
+        """
+        if not isinstance(text, str):
+            raise TypeError("text must be a string")
+        lines = text.splitlines(keepends=True)
+        counts = TokenCounter.count_batch(lines, self.token_model)
+
+        chunks: List[str] = []
+        current: List[str] = []
+        current_tokens = 0
+        for line, num_tokens in zip(lines, counts):
+            if current and current_tokens + num_tokens > self.map_tokens:
+                chunks.append("".join(current))
+                current, current_tokens = [], 0
+            if num_tokens > self.map_tokens:
+                encoding = TokenCounter.get_encoding(self.token_model)
+                tokens = encoding.encode(line, disallowed_special=())
+                for start in range(0, len(tokens), self.map_tokens):
+                    chunks.append(
+                        encoding.decode(tokens[start : start + self.map_tokens])
+                    )
+                continue
+            current.append(line)
+            current_tokens += num_tokens
+        if current:
+            chunks.append("".join(current))
+        return chunks
+
+    def group_for_reduce(self, summaries: List[str]) -> List[List[str]]:
+        """
+        Description:
+            Pack consecutive summaries into reduce groups of at most reduce_tokens
+            tokens. Every group but a trailing one holds at least two summaries, so
+            each level shrinks.
+
+        Params:
+            summaries (list[str]): Summaries of one level, in text order.
+
+        Return:
+            list[list[str]]: Groups in order.
+
+        Exceptions:
+            None
+        """
+        counts = TokenCounter.count_batch(summaries, self.token_model)
+        groups: List[List[str]] = []
+        current: List[str] = []
+        current_tokens = 0
+        for summary, num_tokens in zip(summaries, counts):
+            if len(current) >= 2 and current_tokens + num_tokens > self.reduce_tokens:
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append(summary)
+            current_tokens += num_tokens
+        if current:
+            groups.append(current)
+        return groups
+
+    async def _summarize_piece(
+        self, text: str, level: int, index: int, label: str
+    ) -> Dict[str, Any]:
+        key = SummaryCache.make_key(text, self.prompt_template, self.deployment)
+        summary = await asyncio.to_thread(self.cache.get, key)
+        cached = summary is not None
+        if not cached:
+            text_tokens = await asyncio.to_thread(
+                TokenCounter.count, text, self.token_model
+            )
+            run, call = (
+                (self.scheduler.run_async, self.chain.ainvoke)
+                if self.async_native
+                else (self.scheduler.run_in_thread, self.chain.invoke)
+            )
+            summary = await run(
+                call,
+                {"text": text},
+                tokens=text_tokens + self.prompt_tokens + self.completion_tokens,
+                label=f"{label} level {level} part {index}",
+            )
+            await asyncio.to_thread(self.cache.put, key, summary, self.deployment)
+        return {"level": level, "index": index, "summary": summary, "cached": cached}
+
+    async def _run_level(
+        self, texts: List[str], level: int, label: str, results: List[Optional[str]]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        tasks = [
+            asyncio.create_task(self._summarize_piece(text, level, i, label))
+            for i, text in enumerate(texts)
+        ]
+        errors: List[BaseException] = []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    event = await next_done
+                except Exception as e:
+                    errors.append(e)
+                    continue
+                results[event["index"]] = event["summary"]
+                yield {**event, "total": len(texts), "final": False}
+        finally:
+            for task in tasks:
+                task.cancel()
+        if errors:
+            stage = "map" if level == 0 else "reduce"
+            raise RuntimeError(
+                f"{len(errors)} of {len(texts)} {stage} calls failed for {label}; "
+                f"finished parts are cached, rerun to resume"
+            ) from errors[0]
+
+    async def astream(
+        self, text: str, label: str = ""
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Description:
+            Summarize text, yielding every partial summary as soon as it is ready.
+
+        Params:
+            text (str): Text to summarize.
+            label (str): Name used in logs and scheduler timings (e.g. "chapter 3").
+
+        Return:
+            AsyncIterator[dict]: Events with level (0 = map), index, total, summary,
+                                 cached and final; the last event has final=True and
+                                 holds the complete summary.
+
+        Exceptions:
+            TypeError: If text is not a string.
+            ValueError: If text is blank.
+            RuntimeError: If any map or reduce call fails.
+        """
+        # Tokenizing a whole chapter is CPU-bound; keep it off the event loop
+        chunks = await asyncio.to_thread(self.split, text)
+        if not text.strip():
+            raise ValueError("text must not be blank")
+        logger.info(
+            f"Map-reduce summary of {label}: {len(chunks)} chunks of <= "
+            f"{self.map_tokens} tokens"
+        )
+        level = 0
+        texts = chunks
+        while True:
+            results: List[Optional[str]] = [None] * len(texts)
+            async for event in self._run_level(texts, level, label, results):
+                yield event
+            if len(results) == 1:
+                break
+            groups = await asyncio.to_thread(self.group_for_reduce, results)
+            level += 1
+            logger.info(
+                f"Map-reduce summary of {label}: reducing {len(results)} summaries "
+                f"in {len(groups)} calls (level {level})"
+            )
+            texts = ["\n\n".join(group) for group in groups]
+
+        yield {
+            "level": level,
+            "index": 0,
+            "total": 1,
+            "summary": results[0],
+            "cached": False,
+            "final": True,
+        }
+
+    async def summarize(self, text: str, label: str = "") -> str:
+        """
+        Description:
+            Summarize text and return only the final summary.
+
+        Params:
+            text (str): Text to summarize.
+            label (str): Name used in logs and scheduler timings.
+
+        Return:
+            str: The summary.
+
+        Exceptions:
+            TypeError: If text is not a string.
+            ValueError: If text is blank.
+            RuntimeError: If any map or reduce call fails.
+        """
+        summary = ""
+        async for event in self.astream(text, label):
+            if event["final"]:
+                summary = event["summary"]
+        return summary
@@ -0,0 +1,297 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.documents import Document
+from backend.config.logging_lib import logger
+from backend.rag_optimization.pdf_extraction import ParallelPdfExtractor
+from backend.rag_optimization.vector_store_manifest import VectorStoreManifest
+
+
+class PdfPageCache:
+    """
+    Description:
+        Parse each PDF once. Pages are extracted with the configured backend (see
+        backend.config.pdf_extractors) and kept per process (keyed by the file's
+        sha256 and the backend) and on disk as `<cache_dir>/<sha256>-<backend>.json`, so
+        chapter splitting, quote extraction and chunking all work from the same pages
+        instead of parsing the file three times. Every page is a Document with
+        metadata {"source", "page", "offset"}, where `offset` is the page's start in
+        the joined book text returned by full_text().
+
+        The returned page Documents are shared between callers and must be treated as
+        read-only; use copy_pages() before modifying them. At most MAX_FILES files
+        are held in memory (least recently used are dropped first); release() drops
+        a file as soon as a caller is done with it.
+
+    Params:
+        cache_dir (str): Folder holding the persisted page files.
+        extractor (ParallelPdfExtractor, optional): Page extractor used on a cache miss.
+    """
+
+    # Separator appended after every page when the book text is joined
+    PAGE_SEPARATOR = " "
+    # Files whose pages are kept in memory per process
+    MAX_FILES = 8
+
+    _pages: "OrderedDict[Tuple[str, str], List[Document]]" = OrderedDict()
+    _failures: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    _hashes: Dict[Tuple[str, int, int], str] = {}
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        cache_dir: str = "pdf_page_cache",
+        extractor: Optional[ParallelPdfExtractor] = None,
+    ):
+        if not isinstance(cache_dir, str):
+            raise TypeError("cache_dir must be a string")
+        self.cache_dir = cache_dir
+        self.extractor = extractor or ParallelPdfExtractor()
+        self.extractor_name = self.extractor.backend
+
+    @classmethod
+    def file_key(cls, path: str) -> str:
+        """
+        Description:
+            sha256 of the PDF, memoised on (path, size, mtime) so repeated lookups in
+            one run do not re-read the file.
+
+        Params:
+            path (str): PDF path.
+
+        Return:
+            str: Hex digest.
+
+        Exceptions:
+            FileNotFoundError: If the PDF does not exist.
+        """
+        stat = os.stat(path)
+        memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        digest = cls._hashes.get(memo_key)
+        if digest is None:
+            digest = VectorStoreManifest.file_sha256(path)
+            cls._hashes[memo_key] = digest
+        return digest
+
+    def extract_page_texts(self, path: str) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """
+        Description:
+            Extract the text of every page (page ranges in parallel, see
+            ParallelPdfExtractor); failed pages yield empty text.
+
+        Params:
+            path (str): PDF path.
+
+        Return:
+            tuple[list[str], list[dict]]: Page texts in order, and {"page", "error"}
+                                          for every page that failed.
+
+        Exceptions:
+            FileNotFoundError: If the PDF does not exist.
+        """
+        result = self.extractor.extract(path)
+        return result["texts"], result["failures"]
+
+    def _cache_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, f"{digest}-{self.extractor_name}.json")
+
+    def _read(self, digest: str) -> Any:
+        cache_path = self._cache_path(digest)
+        if not os.path.exists(cache_path):
+            return None
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            logger.warning(f"Page cache unreadable, re-parsing: {cache_path}")
+            return None
+        return data if data.get("extractor") == self.extractor_name else None
+
+    def _write(self, digest: str, data: Dict[str, Any]) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cache_path = self._cache_path(digest)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, cache_path)
+
+    def get_pages(self, path: str) -> List[Document]:
+        """
+        Description:
+            Pages of a PDF, parsed at most once per file content.
+
+        Params:
+            path (str): PDF path.
+
+        Return:
+            list[Document]: Shared, read-only page documents in page order.
+
+        Exceptions:
+            TypeError: If path is not a string.
+            FileNotFoundError: If the PDF does not exist.
+        """
+        return self._load(path)[0]
+
+    def _load(self, path: str) -> Tuple[List[Document], List[Dict[str, Any]]]:
+        if not isinstance(path, str):
+            raise TypeError("path must be a string")
+        digest = self.file_key(path)
+        key = (digest, self.extractor_name)
+        pages, failures = self._pages.get(key), self._failures.get(key)
+        if pages is not None and failures is not None:
+            try:
+                self._pages.move_to_end(key)
+            except KeyError:
+                # Evicted meanwhile; the pages already fetched are still valid
+                pass
+            return pages, failures
+
+        with self._lock:
+            pages = self._pages.get(key)
+            if pages is not None:
+                return pages, self._failures[key]
+
+            data = self._read(digest)
+            if data is None:
+                logger.info(f"Parsing PDF pages with {self.extractor_name}: {path}")
+                texts, failures = self.extract_page_texts(path)
+                offsets, offset = [], 0
+                for text in texts:
+                    offsets.append(offset)
+                    offset += len(text) + len(self.PAGE_SEPARATOR)
+                data = {
+                    "extractor": self.extractor_name,
+                    "sha256": digest,
+                    "pages": [
+                        {"page": i, "offset": offsets[i], "text": text}
+                        for i, text in enumerate(texts)
+                    ],
+                    "failed_pages": failures,
+                }
+                self._write(digest, data)
+            else:
+                logger.info(f"Loaded {len(data['pages'])} cached pages for {path}")
+
+            pages = [
+                Document(
+                    page_content=page["text"],
+                    metadata={
+                        "source": path,
+                        "page": page["page"],
+                        "offset": page["offset"],
+                    },
+                )
+                for page in data["pages"]
+            ]
+            failures = data.get("failed_pages", [])
+            self._failures[key] = failures
+            self._pages[key] = pages
+            while len(self._pages) > self.MAX_FILES:
+                evicted, _ = self._pages.popitem(last=False)
+                self._failures.pop(evicted, None)
+            return pages, failures
+
+    def get_failed_pages(self, path: str) -> List[Dict[str, Any]]:
+        """
+        Description:
+            Pages whose text could not be extracted (their text is empty).
+
+        Params:
+            path (str): PDF path.
+
+        Return:
+            list[dict]: {"page", "error"} per failed page.
+
+        Exceptions:
+            TypeError: If path is not a string.
+            FileNotFoundError: If the PDF does not exist.
+        """
+        return list(self._load(path)[1])
+
+    @classmethod
+    def full_text(cls, pages: List[Document]) -> str:
+        """
+        Description:
+            Join pages into the book text the `offset` metadata refers to.
+
+        Params:
+            pages (list[Document]): Pages from get_pages().
+
+        Return:
+            str: The joined text.
+
+        Exceptions:
+            None
+        """
+        return "".join(page.page_content + cls.PAGE_SEPARATOR for page in pages)
+
+    @staticmethod
+    def copy_pages(pages: List[Document]) -> List[Document]:
+        """
+        Description:
+            Private copies of shared pages for callers that clean text in place.
+
+        Params:
+            pages (list[Document]): Pages from get_pages().
+
+        Return:
+            list[Document]: Copies with their own metadata dicts.
+
+        Exceptions:
+            None
+        """
+        return [
+            Document(page_content=page.page_content, metadata=dict(page.metadata))
+            for page in pages
+        ]
+
+    @classmethod
+    def release(cls, path: str) -> None:
+        """
+        Description:
+            Drop the in-process pages of one PDF, for every backend (the on-disk
+            cache is kept). Call it once a file has been fully processed.
+
+        Params:
+            path (str): PDF path.
+
+        Return:
+            None
+
+        Exceptions:
+            None
+        """
+        abs_path = os.path.abspath(path)
+        with cls._lock:
+            digests = {
+                digest
+                for memo_key, digest in cls._hashes.items()
+                if memo_key[0] == abs_path
+            }
+            for key in [key for key in cls._pages if key[0] in digests]:
+                del cls._pages[key]
+                cls._failures.pop(key, None)
+            for memo_key in [key for key in cls._hashes if key[0] == abs_path]:
+                del cls._hashes[memo_key]
+
+    @classmethod
+    def clear(cls) -> None:
+        """
+        Description:
+            Drop the in-process pages (the on-disk cache is kept).
+
+        Params:
+            None
+
+        Return:
+            None
+
+        Exceptions:
+            None
+        """
+        with cls._lock:
+            cls._pages.clear()
+            cls._failures.clear()
+            cls._hashes.clear()
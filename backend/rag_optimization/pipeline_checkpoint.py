@@ -0,0 +1,321 @@
+import argparse
+import json
+import os
+import shutil
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from langchain_core.documents import Document
+from backend.config.logging_lib import logger
+from backend.rag_optimization.pdf_page_cache import PdfPageCache
+
+
+class PipelineCheckpoint:
+    """
+    Description:
+        Durable per-stage checkpoints for one book in a local work directory
+        (`<work_dir>/<pdf sha256>/`). Stage outputs are saved as JSON documents as
+        soon as they are produced: whole-stage outputs (e.g. quotes) in
+        `<stage>.json`, and per-unit outputs (one summary per chapter) in
+        `<stage>/<unit>.json`, so a rerun after a failure resumes from the last
+        completed unit. `state.json` records each stage's status, unit count, run
+        time and completion time for the status command, plus an optional
+        fingerprint of the stage's inputs (e.g. the chapter index) so dependent
+        stages can be reset when it changes. All writes are atomic.
+
+    Params:
+        pdf_path (str): The book the checkpoints belong to.
+        work_dir (str): Root folder for checkpoints.
+    """
+
+    STAGES = ("chapters", "quotes", "summaries", "stores")
+    STATE_FILE = "state.json"
+
+    def __init__(self, pdf_path: str, work_dir: str = "pipeline_work"):
+        if not isinstance(pdf_path, str) or not isinstance(work_dir, str):
+            raise TypeError("pdf_path and work_dir must be strings")
+        self.pdf_path = pdf_path
+        self.run_dir = os.path.join(work_dir, PdfPageCache.file_key(pdf_path))
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _write_json(path: str, data: Any) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read_json(path: str) -> Any:
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            logger.warning(f"Checkpoint unreadable, ignoring: {path}")
+            return None
+
+    @staticmethod
+    def _to_json(doc: Document) -> Dict[str, Any]:
+        return {"page_content": doc.page_content, "metadata": doc.metadata}
+
+    @staticmethod
+    def _from_json(data: Dict[str, Any]) -> Document:
+        return Document(page_content=data["page_content"], metadata=data["metadata"])
+
+    def _check_stage(self, stage: str) -> None:
+        if stage not in self.STAGES:
+            raise ValueError(f"Unknown stage {stage!r}; expected one of {self.STAGES}")
+
+    def state(self) -> Dict[str, Any]:
+        """
+        Description:
+            Recorded stage states.
+
+        Params:
+            None
+
+        Return:
+            dict: {"pdf_path", "stages": {stage: {"status", "units", "seconds",
+                  "updated_at", "fingerprint" (if recorded)}}}.
+
+        Exceptions:
+            None
+        """
+        return self._read_json(os.path.join(self.run_dir, self.STATE_FILE)) or {
+            "pdf_path": self.pdf_path,
+            "stages": {},
+        }
+
+    def record(
+        self,
+        stage: str,
+        status: str,
+        seconds: float = 0.0,
+        units: Optional[int] = None,
+        fingerprint: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Description:
+            Record a stage's status and add to its run time.
+
+        Params:
+            stage (str): One of STAGES.
+            status (str): "running", "done" or "failed".
+            seconds (float): Run time to add for this attempt.
+            units (int, optional): Completed units (documents) of the stage.
+            fingerprint (dict, optional): JSON-serializable identity of the stage's
+                output, returned by fingerprint().
+
+        Return:
+            None
+
+        Exceptions:
+            ValueError: If stage is unknown.
+        """
+        self._check_stage(stage)
+        with self._lock:
+            state = self.state()
+            entry = state["stages"].setdefault(stage, {"seconds": 0.0, "units": 0})
+            entry["status"] = status
+            entry["seconds"] += seconds
+            if units is not None:
+                entry["units"] = units
+            if fingerprint is not None:
+                entry["fingerprint"] = fingerprint
+            entry["updated_at"] = datetime.now(timezone.utc).isoformat()
+            self._write_json(os.path.join(self.run_dir, self.STATE_FILE), state)
+
+    def is_done(self, stage: str) -> bool:
+        """
+        Description:
+            Whether a stage completed in an earlier run.
+
+        Params:
+            stage (str): One of STAGES.
+
+        Return:
+            bool: True if the stage is recorded as done.
+
+        Exceptions:
+            ValueError: If stage is unknown.
+        """
+        self._check_stage(stage)
+        return self.state()["stages"].get(stage, {}).get("status") == "done"
+
+    def fingerprint(self, stage: str) -> Optional[Dict[str, Any]]:
+        """
+        Description:
+            Fingerprint recorded with a stage, if any.
+
+        Params:
+            stage (str): One of STAGES.
+
+        Return:
+            dict or None: The fingerprint passed to record().
+
+        Exceptions:
+            ValueError: If stage is unknown.
+        """
+        self._check_stage(stage)
+        return self.state()["stages"].get(stage, {}).get("fingerprint")
+
+    def save_documents(self, stage: str, documents: List[Document]) -> None:
+        """
+        Description:
+            Save a whole-stage output.
+
+        Params:
+            stage (str): One of STAGES.
+            documents (list[Document]): The stage's documents.
+
+        Return:
+            None
+
+        Exceptions:
+            ValueError: If stage is unknown.
+            OSError: If the checkpoint cannot be written.
+        """
+        self._check_stage(stage)
+        self._write_json(
+            os.path.join(self.run_dir, f"{stage}.json"),
+            [self._to_json(doc) for doc in documents],
+        )
+
+    def load_documents(self, stage: str) -> Optional[List[Document]]:
+        """
+        Description:
+            Load a whole-stage output.
+
+        Params:
+            stage (str): One of STAGES.
+
+        Return:
+            list[Document] or None: The documents, or None if never saved.
+
+        Exceptions:
+            ValueError: If stage is unknown.
+        """
+        self._check_stage(stage)
+        data = self._read_json(os.path.join(self.run_dir, f"{stage}.json"))
+        return None if data is None else [self._from_json(d) for d in data]
+
+    def save_unit(self, stage: str, unit: str, document: Document) -> None:
+        """
+        Description:
+            Save one completed unit of a stage (e.g. one chapter summary).
+
+        Params:
+            stage (str): One of STAGES.
+            unit (str): Unit name, unique within the stage.
+            document (Document): The unit's output.
+
+        Return:
+            None
+
+        Exceptions:
+            ValueError: If stage is unknown.
+            OSError: If the checkpoint cannot be written.
+        """
+        self._check_stage(stage)
+        self._write_json(
+            os.path.join(self.run_dir, stage, f"{unit}.json"), self._to_json(document)
+        )
+
+    def load_unit(self, stage: str, unit: str) -> Optional[Document]:
+        """
+        Description:
+            Load one unit saved by an earlier run.
+
+        Params:
+            stage (str): One of STAGES.
+            unit (str): Unit name.
+
+        Return:
+            Document or None: The unit's output, or None if not completed.
+
+        Exceptions:
+            ValueError: If stage is unknown.
+        """
+        self._check_stage(stage)
+        data = self._read_json(os.path.join(self.run_dir, stage, f"{unit}.json"))
+        return None if data is None else self._from_json(data)
+
+    def reset(self, stage: Optional[str] = None) -> None:
+        """
+        Description:
+            Delete the checkpoints of one stage, or of the whole book.
+
+        Params:
+            stage (str, optional): Stage to reset; None resets everything.
+
+        Return:
+            None
+
+        Exceptions:
+            ValueError: If stage is unknown.
+        """
+        if stage is None:
+            shutil.rmtree(self.run_dir, ignore_errors=True)
+            return
+        self._check_stage(stage)
+        shutil.rmtree(os.path.join(self.run_dir, stage), ignore_errors=True)
+        stage_file = os.path.join(self.run_dir, f"{stage}.json")
+        if os.path.exists(stage_file):
+            os.remove(stage_file)
+        with self._lock:
+            state = self.state()
+            if state["stages"].pop(stage, None) is not None:
+                self._write_json(os.path.join(self.run_dir, self.STATE_FILE), state)
+
+    def format_status(self) -> str:
+        """
+        Description:
+            Human-readable table of stage status, units and timings.
+
+        Params:
+            None
+
+        Return:
+            str: The status table.
+
+        Exceptions:
+            None
+        """
+        stages = self.state()["stages"]
+        lines = [
+            f"Pipeline checkpoints for {self.pdf_path} ({self.run_dir})",
+            f"{'stage':<10} {'status':<8} {'units':>6} {'seconds':>9}  updated",
+        ]
+        for stage in self.STAGES:
+            entry = stages.get(stage)
+            if entry is None:
+                lines.append(f"{stage:<10} {'pending':<8} {'-':>6} {'-':>9}  -")
+                continue
+            lines.append(
+                f"{stage:<10} {entry['status']:<8} {entry['units']:>6} "
+                f"{entry['seconds']:>9.2f}  {entry['updated_at']}"
+            )
+        lines.append(
+            f"total run time: {sum(e['seconds'] for e in stages.values()):.2f}s"
+        )
+        return "\n".join(lines)
+
+
+# Example usage:
+#   python -m backend.rag_optimization.pipeline_checkpoint status book.pdf
+#   python -m backend.rag_optimization.pipeline_checkpoint reset book.pdf --stage summaries
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect preprocessing checkpoints")
+    parser.add_argument("command", choices=["status", "reset"])
+    parser.add_argument("pdf_path")
+    parser.add_argument("--work-dir", default="pipeline_work")
+    parser.add_argument("--stage", choices=PipelineCheckpoint.STAGES)
+    args = parser.parse_args()
+
+    checkpoint = PipelineCheckpoint(args.pdf_path, args.work_dir)
+    if args.command == "reset":
+        checkpoint.reset(args.stage)
+    print(checkpoint.format_status())
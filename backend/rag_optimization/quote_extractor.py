@@ -0,0 +1,155 @@
+import asyncio
+import threading
+from bisect import bisect_right
+from typing import AsyncIterator, Iterator, List
+import regex as re
+from langchain_core.documents import Document
+
+
+class QuoteExtractor:
+    """
+    Description:
+        Extracts long double-quoted passages ("..." or “...”) from a book in one
+        pass. The pages are cleaned (newlines and tabs become spaces, which keeps every
+        offset) and joined with PAGE_SEPARATOR into one stream, so a quote that runs
+        over a page break is found like any other. Quotes are deduplicated on their whitespace-normalised
+        text and carry the pages they span:
+        {"source", "page", "page_start", "page_end", "offset"}, where `offset` is the
+        quote's start in the joined text (the same text PdfPageCache.full_text builds).
+
+        astream() runs the scan in one worker thread and yields quotes as they are
+        found, so consumers can start before the whole book has been scanned.
+
+    Params:
+        min_length (int): Minimum characters inside the quotes.
+        max_length (int): Maximum characters inside the quotes; stops an unbalanced
+            quote mark from swallowing the following pages.
+
+        A quote never contains another quote mark, so a short line of dialogue is
+        skipped instead of being stretched to the next quote.
+    """
+
+    PAGE_SEPARATOR = " "
+
+    def __init__(self, min_length: int = 50, max_length: int = 2000):
+        if not isinstance(min_length, int) or min_length < 1:
+            raise ValueError("min_length must be a positive integer")
+        if not isinstance(max_length, int) or max_length < min_length:
+            raise ValueError("max_length must be an integer >= min_length")
+        self.min_length = min_length
+        self.max_length = max_length
+        self.pattern = re.compile(
+            rf'["\u201c]([^"\u201c\u201d]{{{min_length},{max_length}}})["\u201d]'
+        )
+
+    def iter_quotes(self, pages: List[Document]) -> Iterator[Document]:
+        """
+        Description:
+            Scan the joined pages once and yield each new quote.
+
+        Params:
+            pages (list[Document]): Pages in reading order; they are not modified.
+
+        Return:
+            Iterator[Document]: Quote documents in book order.
+
+        Exceptions:
+            TypeError: If pages is not a list of Document objects.
+        """
+        if not isinstance(pages, list) or not all(
+            isinstance(d, Document) for d in pages
+        ):
+            raise TypeError("pages must be a list of Document objects")
+
+        starts: List[int] = []
+        parts: List[str] = []
+        offset = 0
+        for page in pages:
+            starts.append(offset)
+            text = page.page_content.replace("\n", " ").replace("\t", " ")
+            parts.append(text + self.PAGE_SEPARATOR)
+            offset += len(text) + len(self.PAGE_SEPARATOR)
+        stream = "".join(parts)
+
+        seen = set()
+        for match in self.pattern.finditer(stream):
+            quote = match.group(1)
+            key = " ".join(quote.split())
+            if key in seen:
+                continue
+            seen.add(key)
+            first = bisect_right(starts, match.start(1)) - 1
+            last = bisect_right(starts, match.end(1) - 1) - 1
+            metadata = pages[first].metadata
+            page_start = metadata.get("page", first)
+            page_end = pages[last].metadata.get("page", last)
+            yield Document(
+                page_content=quote,
+                metadata={
+                    "source": metadata.get("source"),
+                    "page": page_start,
+                    "page_start": page_start,
+                    "page_end": page_end,
+                    "offset": match.start(1),
+                },
+            )
+
+    async def astream(self, pages: List[Document]) -> AsyncIterator[Document]:
+        """
+        Description:
+            Run iter_quotes() in a worker thread and yield quotes as they are found.
+
+        Params:
+            pages (list[Document]): Pages in reading order.
+
+        Return:
+            AsyncIterator[Document]: Quote documents in book order.
+
+        Exceptions:
+            TypeError: If pages is not a list of Document objects.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+
+        def scan() -> None:
+            try:
+                for quote in self.iter_quotes(pages):
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, quote)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+
+        worker = loop.run_in_executor(None, scan)
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Lets the scan finish early when the consumer stops iterating
+            stop.set()
+            await worker
+
+    async def extract(self, pages: List[Document]) -> List[Document]:
+        """
+        Description:
+            All quotes of the pages as a list.
+
+        Params:
+            pages (list[Document]): Pages in reading order.
+
+        Return:
+            list[Document]: Quote documents in book order.
+
+        Exceptions:
+            TypeError: If pages is not a list of Document objects.
+        """
+        return [quote async for quote in self.astream(pages)]
@@ -2,6 +2,7 @@
 from dotenv import load_dotenv
 import os
 import asyncio
+from time import monotonic
 from backend.config.logging_lib import logger
 from backend.rag_optimization.build_graph import GraphRetrieval
 from backend.rag_optimization.encoding import EncodeEmbeddings
@@ -34,14 +35,23 @@ async def main():
 
     # ✅ Do not overwrite book_quotes_list
     encoding_handler = EncodeEmbeddings()
-    (
-        chunks_vector_store,
-        chapter_summaries_vector_store,
-        book_quotes_vectorstore,
-    ) = await encoding_handler.create_vector_db(
-        chapter_summaries, book_quotes_list, hp_pdf_path
-    )
+    # Unchanged stores are loaded from disk (see the vector store manifest)
+    start_time = monotonic()
+    handler.checkpoint.record("stores", "running")
+    try:
+        (
+            chunks_vector_store,
+            chapter_summaries_vector_store,
+            book_quotes_vectorstore,
+        ) = await encoding_handler.create_vector_db(
+            chapter_summaries, book_quotes_list, hp_pdf_path, build_mode="concurrent"
+        )
+    except Exception:
+        handler.checkpoint.record("stores", "failed", monotonic() - start_time)
+        raise
+    handler.checkpoint.record("stores", "done", monotonic() - start_time, 3)
     logger.info("Vector stores created successfully")
+    logger.info(handler.checkpoint.format_status())
 
     retriever_handler = RetrieveData(
         chunks_vector_store=chunks_vector_store,
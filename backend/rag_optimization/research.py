@@ -1,11 +1,16 @@
 import asyncio
-from typing import ClassVar, Any, Dict
+import threading
+from typing import ClassVar, Any, Dict, Optional
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import PromptTemplate
 from pydantic import BaseModel, Field
 from backend.config.azure_models import AzureOpenAIModels
+from backend.config.config import CacheConfig
 from backend.utils.constants import QUESTION_ANSWER_COT_PROMPT_TEMPLATE
 from backend.config.logging_lib import logger
+from backend.rag_optimization.answer_cache import AnswerCache
+from backend.rag_optimization.chain_registry import ChainRegistry
+from backend.rag_optimization.semantic_cache import SemanticCache
 
 
 # Define the output schema for the answer
@@ -54,28 +59,95 @@ class RewriteQuestion(BaseModel):
     Output schema for the rewritten question.
     """
 
-    llm_model: ClassVar = AzureOpenAIModels().get_azure_model_4()
+    azure_models: ClassVar = AzureOpenAIModels()
+    llm_model: ClassVar = azure_models.get_azure_model_4()
+    # Await chain.ainvoke on the event loop instead of chain.invoke on a thread
+    async_native: ClassVar[bool] = azure_models.get_azure_openai_async_native
+    cache_config: ClassVar = CacheConfig()
+    # Rewrites of earlier (paraphrased) questions, created on first use
+    rewrite_cache: ClassVar[Optional[SemanticCache]] = None
+    rewrite_cache_lock: ClassVar = threading.Lock()
+    # Answers keyed on (question, context digest, model settings); None when disabled
+    answer_cache: ClassVar[Optional[AnswerCache]] = (
+        AnswerCache(
+            cache_config.get_answer_cache_dir,
+            cache_config.get_answer_cache_max_bytes,
+        )
+        if cache_config.get_answer_cache_enabled
+        else None
+    )
 
     @staticmethod
-    async def rewrite_question(state: Dict[str, Any]) -> Dict[str, str]:
+    def get_rewrite_cache() -> Optional[SemanticCache]:
         """
         Description:
-            Rewrites the given question using the LLM to optimize it for vectorstore retrieval.
+            The process-wide semantic cache of question rewrites, built on first use
+            with the retrieval embedding model and the REWRITE_CACHE_* settings.
 
         Params:
-            state (dict): A dictionary containing the question to rewrite, with key "question".
+            None
 
         Return:
-            dict: A dictionary with the rewritten question under the key "question".
+            SemanticCache or None: The cache, or None when REWRITE_CACHE_ENABLED is off.
 
         Exceptions:
-            TypeError: If state is not a dict or missing 'question'.
-            RuntimeError: If LLM call fails.
+            RuntimeError: If the embedding model cannot be loaded.
         """
-        logger.info("Starting rewrite_question")
-        if not isinstance(state, dict) or "question" not in state:
-            raise TypeError("state must be a dict containing a 'question' key")
+        if not RewriteQuestion.cache_config.get_rewrite_cache_enabled:
+            return None
+        with RewriteQuestion.rewrite_cache_lock:
+            if RewriteQuestion.rewrite_cache is None:
+                # Imported here: encoding pulls in FAISS and the embedding stack
+                from backend.rag_optimization.encoding import EncodeEmbeddings
+
+                RewriteQuestion.rewrite_cache = SemanticCache(
+                    EncodeEmbeddings.get_embeddings(),
+                    threshold=RewriteQuestion.cache_config.get_rewrite_cache_threshold,
+                    ttl_seconds=RewriteQuestion.cache_config.get_rewrite_cache_ttl_seconds,
+                    max_entries=RewriteQuestion.cache_config.get_rewrite_cache_max_entries,
+                )
+            return RewriteQuestion.rewrite_cache
+
+    @staticmethod
+    async def invoke_chain(chain: Any, input_data: Dict[str, Any]) -> Any:
+        """
+        Description:
+            Run a chain without blocking the event loop: natively with ainvoke, so an
+            in-flight question holds no thread, or with invoke on a worker thread
+            when async_native is off.
+
+        Params:
+            chain (Any): The LCEL chain.
+            input_data (dict): The chain's input variables.
+
+        Return:
+            Any: The chain's output.
+
+        Exceptions:
+            Exception: Whatever the chain raises.
+        """
+        if RewriteQuestion.async_native:
+            return await chain.ainvoke(input_data)
+        # chain.invoke is blocking — run in a thread
+        return await asyncio.to_thread(chain.invoke, input_data)
+
+    # --- Chain builders, each run once per process through ChainRegistry ---
+
+    @staticmethod
+    def _build_rewrite_question_chain() -> Any:
+        """
+        Description:
+            Builds the question rewriting chain (prompt | LLM | JSON parser).
 
+        Params:
+            None
+
+        Return:
+            Any: The compiled chain.
+
+        Exceptions:
+            None
+        """
         # Create a JSON parser for the output schema
         rewrite_question_string_parser = JsonOutputParser(
             pydantic_object=RewriteQuestion
@@ -105,14 +177,222 @@ class RewriteQuestion(BaseModel):
         question_rewriter = (
             rewrite_prompt | rewrite_llm | rewrite_question_string_parser
         )
+        return question_rewriter
+
+    @staticmethod
+    def _build_answer_question_from_context_chain() -> Any:
+        """
+        Description:
+            Builds the chain-of-thought answering chain with structured output.
+
+        Params:
+            None
+
+        Return:
+            Any: The compiled chain.
+
+        Exceptions:
+            None
+        """
+        # Initialize the LLM for answering questions with chain-of-thought reasoning
+        question_answer_from_context_llm = RewriteQuestion.llm_model
+
+        # Create the prompt object
+        question_answer_from_context_cot_prompt = PromptTemplate(
+            template=QUESTION_ANSWER_COT_PROMPT_TEMPLATE,
+            input_variables=["context", "question"],
+        )
+
+        # Combine the prompt and LLM into a chain with structured output
+        question_answer_from_context_cot_chain = (
+            question_answer_from_context_cot_prompt
+            | question_answer_from_context_llm.with_structured_output(
+                QuestionAnswerFromContext
+            )
+        )
+        return question_answer_from_context_cot_chain
+
+    @staticmethod
+    def _build_is_relevant_content_chain() -> Any:
+        """
+        Description:
+            Builds the context relevance chain (prompt | LLM | JSON parser).
+
+        Params:
+            None
+
+        Return:
+            Any: The compiled chain.
+
+        Exceptions:
+            None
+        """
+        # Prompt template for checking if the retrieved context is relevant to the query
+        is_relevant_content_prompt_template = """
+        You receive a query: {query} and a context: {context} retrieved from a vector store. 
+        You need to determine if the document is relevant to the query. 
+        {format_instructions}
+        """
+
+        # JSON parser for the output schema
+        is_relevant_json_parser = JsonOutputParser(pydantic_object=Relevance)
+
+        # Initialize the LLM for relevance checking
+        is_relevant_llm = RewriteQuestion.llm_model
+
+        # Create the prompt object for the LLM
+        is_relevant_content_prompt = PromptTemplate(
+            template=is_relevant_content_prompt_template,
+            input_variables=["query", "context"],
+            partial_variables={
+                "format_instructions": is_relevant_json_parser.get_format_instructions()
+            },
+        )
+
+        # Combine prompt, LLM, and parser into a chain
+        is_relevant_content_chain = (
+            is_relevant_content_prompt | is_relevant_llm | is_relevant_json_parser
+        )
+        return is_relevant_content_chain
+
+    @staticmethod
+    def _build_is_grounded_on_facts_chain() -> Any:
+        """
+        Description:
+            Builds the fact-checking chain with structured output.
+
+        Params:
+            None
+
+        Return:
+            Any: The compiled chain.
+
+        Exceptions:
+            None
+        """
+        # Initialize the LLM for fact-checking (using same model)
+        is_grounded_on_facts_llm = RewriteQuestion.llm_model
+
+        # Define the prompt template for fact-checking
+        is_grounded_on_facts_prompt_template = """
+        You are a fact-checker that determines if the given answer {answer} is grounded in the given context {context}
+        You don't mind if it doesn't make sense, as long as it is grounded in the context.
+        Output a JSON containing the answer to the question, and apart from the JSON format don't output any 
+        additional text.
+        """
+
+        # Create the prompt object
+        is_grounded_on_facts_prompt = PromptTemplate(
+            template=is_grounded_on_facts_prompt_template,
+            input_variables=["context", "answer"],
+        )
+
+        # Create the LLM chain for fact-checking
+        is_grounded_on_facts_chain = (
+            is_grounded_on_facts_prompt
+            | is_grounded_on_facts_llm.with_structured_output(IsGroundedOnFacts)
+        )
+        return is_grounded_on_facts_chain
+
+    @staticmethod
+    def _build_can_be_answered_chain() -> Any:
+        """
+        Description:
+            Builds the chain deciding whether the context fully answers the question.
+
+        Params:
+            None
+
+        Return:
+            Any: The compiled chain.
+
+        Exceptions:
+            None
+        """
+        # Define the prompt template for the LLM
+        can_be_answered_prompt_template = """
+        You receive a query: {question} and a context: {context}. 
+        You need to determine if the question can be fully answered based on the context.
+        {format_instructions}
+        """
+
+        # Create a JSON parser for the output schema
+        can_be_answered_json_parser = JsonOutputParser(pydantic_object=QuestionAnswer)
+
+        # Create the prompt object for the LLM
+        answer_question_prompt = PromptTemplate(
+            template=can_be_answered_prompt_template,
+            input_variables=["question", "context"],
+            partial_variables={
+                "format_instructions": can_be_answered_json_parser.get_format_instructions()
+            },
+        )
+
+        # Initialize the LLM for this task
+        can_be_answered_llm = RewriteQuestion.llm_model
+
+        # Compose the chain: prompt -> LLM -> output parser
+        can_be_answered_chain = (
+            answer_question_prompt | can_be_answered_llm | can_be_answered_json_parser
+        )
+        return can_be_answered_chain
+
+    @staticmethod
+    async def rewrite_question(state: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Description:
+            Rewrites the given question using the LLM to optimize it for vectorstore retrieval.
+            Paraphrases of an already rewritten question are answered from the semantic
+            rewrite cache without an LLM call; cache errors fall back to the LLM. Only
+            the user's original question uses the cache: when the graph loops back
+            with an earlier rewrite (recorded in "original_question"), the rewrite is
+            itself a paraphrase of the cached question and would just get the same
+            rewrite back, so the LLM is asked for a new one.
+
+        Params:
+            state (dict): A dictionary containing the question to rewrite, with key "question",
+                and "original_question" once the question has been rewritten before.
+
+        Return:
+            dict: A dictionary with the rewritten question under the key "question" and
+                the user's question under "original_question".
+
+        Exceptions:
+            TypeError: If state is not a dict or missing 'question'.
+            RuntimeError: If LLM call fails.
+        """
+        logger.info("Starting rewrite_question")
+        if not isinstance(state, dict) or "question" not in state:
+            raise TypeError("state must be a dict containing a 'question' key")
+
+        question_rewriter = ChainRegistry.get(
+            "rewrite_question", RewriteQuestion._build_rewrite_question_chain
+        )
 
         question = state["question"]
-        logger.info("Rewriting the question: %s", question)
+        original_question = state.get("original_question") or question
+        logger.info(f"Rewriting the question: {question}")
+
+        rewrite_cache = None
+        if not state.get("original_question"):
+            try:
+                rewrite_cache = await asyncio.to_thread(
+                    RewriteQuestion.get_rewrite_cache
+                )
+                if rewrite_cache is not None:
+                    cached_question = await rewrite_cache.aget(question)
+                    if cached_question is not None:
+                        logger.info(f"Rewrite cache: {rewrite_cache.stats()}")
+                        return {
+                            "question": cached_question,
+                            "original_question": original_question,
+                        }
+            except Exception:
+                logger.exception("Rewrite cache lookup failed, calling the LLM")
 
         try:
-            # chain.invoke is blocking — run in a thread
-            result = await asyncio.to_thread(
-                question_rewriter.invoke, {"question": question}
+            result = await RewriteQuestion.invoke_chain(
+                question_rewriter, {"question": question}
             )
 
             # result may be dict-like or object — normalize
@@ -129,8 +409,14 @@ class RewriteQuestion(BaseModel):
             if not new_question:
                 raise RuntimeError("LLM did not return a rewritten question")
 
-            logger.info("Finished rewrite_question: %s", new_question)
-            return {"question": new_question}
+            if rewrite_cache is not None:
+                try:
+                    await rewrite_cache.aput(question, new_question)
+                except Exception:
+                    logger.exception("Failed to cache the rewritten question")
+
+            logger.info(f"Finished rewrite_question: {new_question}")
+            return {"question": new_question, "original_question": original_question}
 
         except Exception as e:
             logger.exception("Error in rewrite_question")
@@ -138,17 +424,82 @@ class RewriteQuestion(BaseModel):
 
     """--- LLM-based Function to Answer a Question from Context Using Chain-of-Thought Reasoning ---"""
 
+    @staticmethod
+    def answer_settings() -> Dict[str, Any]:
+        """
+        Description:
+            Model settings that determine an answer, part of the answer cache key.
+
+        Params:
+            None
+
+        Return:
+            dict: deployment, model, temperature, max_tokens and the prompt template.
+
+        Exceptions:
+            None
+        """
+        llm = RewriteQuestion.llm_model
+        return {
+            "deployment": getattr(llm, "deployment_name", None),
+            "model": getattr(llm, "model_name", None),
+            "temperature": getattr(llm, "temperature", None),
+            "max_tokens": getattr(llm, "max_tokens", None),
+            "prompt": QUESTION_ANSWER_COT_PROMPT_TEMPLATE,
+        }
+
+    @staticmethod
+    async def update_answer_cache(state: Dict[str, Any], keep: bool) -> None:
+        """
+        Description:
+            Store a graded answer in the answer cache, or remove it. Only answers
+            the grader accepted are cached, so a rejected answer is never served
+            again, neither to the hallucination retry nor to later callers.
+
+        Params:
+            state (dict): Graph state with "question", "context" and "answer";
+                "use_answer_cache" False leaves the cache alone.
+            keep (bool): True stores the answer, False deletes any cached copy.
+
+        Return:
+            None
+
+        Exceptions:
+            None
+        """
+        answer_cache = RewriteQuestion.answer_cache
+        if answer_cache is None or not state.get("use_answer_cache", True):
+            return
+        question = state["question"]
+        cache_key = AnswerCache.make_key(
+            question, state["context"], RewriteQuestion.answer_settings()
+        )
+        try:
+            if keep:
+                await asyncio.to_thread(
+                    answer_cache.put, cache_key, state["answer"], question
+                )
+            else:
+                await asyncio.to_thread(answer_cache.delete, cache_key)
+        except OSError:
+            logger.exception("Failed to update the answer cache")
+
     async def answer_question_from_context(
-        self, state: Dict[str, Any]
+        self, state: Dict[str, Any], use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Description:
             Answers a question from a given context using chain-of-thought reasoning.
+            The answer to the same question over identical context and model settings
+            is served from the on-disk answer cache, which holds only answers that
+            grade_generation_v_documents_and_question accepted.
 
         Params:
             state (dict): A dictionary containing:
                 - "question": The query question.
                 - "context" or "aggregated_context": The context to answer the question from.
+                - "use_answer_cache" (optional): False bypasses the answer cache.
+            use_cache (bool): False bypasses the answer cache for this call.
 
         Return:
             dict: A dictionary containing:
@@ -170,21 +521,9 @@ class RewriteQuestion(BaseModel):
                 "state must be a dict containing 'question' and 'context' or 'aggregated_context'"
             )
 
-        # Initialize the LLM for answering questions with chain-of-thought reasoning
-        question_answer_from_context_llm = self.llm_model
-
-        # Create the prompt object
-        question_answer_from_context_cot_prompt = PromptTemplate(
-            template=QUESTION_ANSWER_COT_PROMPT_TEMPLATE,
-            input_variables=["context", "question"],
-        )
-
-        # Combine the prompt and LLM into a chain with structured output
-        question_answer_from_context_cot_chain = (
-            question_answer_from_context_cot_prompt
-            | question_answer_from_context_llm.with_structured_output(
-                QuestionAnswerFromContext
-            )
+        question_answer_from_context_cot_chain = ChainRegistry.get(
+            "answer_question_from_context",
+            RewriteQuestion._build_answer_question_from_context_chain,
         )
 
         # Use 'aggregated_context' if available, otherwise fall back to 'context'
@@ -193,10 +532,28 @@ class RewriteQuestion(BaseModel):
 
         input_data = {"question": question, "context": context}
 
+        answer_cache = (
+            RewriteQuestion.answer_cache
+            if use_cache and state.get("use_answer_cache", True)
+            else None
+        )
+        if answer_cache is not None:
+            cache_key = AnswerCache.make_key(
+                question, context, RewriteQuestion.answer_settings()
+            )
+            cached_answer = await asyncio.to_thread(answer_cache.get, cache_key)
+            if cached_answer is not None:
+                logger.info(f"Answer cache hit: {answer_cache.stats()}")
+                return {
+                    "answer": cached_answer,
+                    "context": context,
+                    "question": question,
+                }
+
         logger.info("Invoking LLM to answer the question from context")
         try:
-            output = await asyncio.to_thread(
-                question_answer_from_context_cot_chain.invoke, input_data
+            output = await RewriteQuestion.invoke_chain(
+                question_answer_from_context_cot_chain, input_data
             )
 
             # Normalize output
@@ -245,31 +602,8 @@ class RewriteQuestion(BaseModel):
         ):
             raise TypeError("state must be a dict containing 'question' and 'context'")
 
-        # Prompt template for checking if the retrieved context is relevant to the query
-        is_relevant_content_prompt_template = """
-        You receive a query: {query} and a context: {context} retrieved from a vector store. 
-        You need to determine if the document is relevant to the query. 
-        {format_instructions}
-        """
-
-        # JSON parser for the output schema
-        is_relevant_json_parser = JsonOutputParser(pydantic_object=Relevance)
-
-        # Initialize the LLM for relevance checking
-        is_relevant_llm = self.llm_model
-
-        # Create the prompt object for the LLM
-        is_relevant_content_prompt = PromptTemplate(
-            template=is_relevant_content_prompt_template,
-            input_variables=["query", "context"],
-            partial_variables={
-                "format_instructions": is_relevant_json_parser.get_format_instructions()
-            },
-        )
-
-        # Combine prompt, LLM, and parser into a chain
-        is_relevant_content_chain = (
-            is_relevant_content_prompt | is_relevant_llm | is_relevant_json_parser
+        is_relevant_content_chain = ChainRegistry.get(
+            "is_relevant_content", RewriteQuestion._build_is_relevant_content_chain
         )
 
         question = state["question"]
@@ -279,8 +613,8 @@ class RewriteQuestion(BaseModel):
 
         logger.info("Invoking LLM to check relevance")
         try:
-            output = await asyncio.to_thread(
-                is_relevant_content_chain.invoke, input_data
+            output = await RewriteQuestion.invoke_chain(
+                is_relevant_content_chain, input_data
             )
             # Normalize output
             if isinstance(output, dict):
@@ -332,56 +666,11 @@ class RewriteQuestion(BaseModel):
                 "state must be a dict containing 'context', 'answer', and 'question'"
             )
 
-        # Initialize the LLM for fact-checking (using same model)
-        is_grounded_on_facts_llm = RewriteQuestion.llm_model
-
-        # Define the prompt template for fact-checking
-        is_grounded_on_facts_prompt_template = """
-        You are a fact-checker that determines if the given answer {answer} is grounded in the given context {context}
-        You don't mind if it doesn't make sense, as long as it is grounded in the context.
-        Output a JSON containing the answer to the question, and apart from the JSON format don't output any 
-        additional text.
-        """
-
-        # Create the prompt object
-        is_grounded_on_facts_prompt = PromptTemplate(
-            template=is_grounded_on_facts_prompt_template,
-            input_variables=["context", "answer"],
-        )
-
-        # Create the LLM chain for fact-checking
-        is_grounded_on_facts_chain = (
-            is_grounded_on_facts_prompt
-            | is_grounded_on_facts_llm.with_structured_output(IsGroundedOnFacts)
+        is_grounded_on_facts_chain = ChainRegistry.get(
+            "is_grounded_on_facts", RewriteQuestion._build_is_grounded_on_facts_chain
         )
-
-        """--- LLM Chain to Determine if a Question Can Be Fully Answered from Context ---"""
-
-        # Define the prompt template for the LLM
-        can_be_answered_prompt_template = """
-        You receive a query: {question} and a context: {context}. 
-        You need to determine if the question can be fully answered based on the context.
-        {format_instructions}
-        """
-
-        # Create a JSON parser for the output schema
-        can_be_answered_json_parser = JsonOutputParser(pydantic_object=QuestionAnswer)
-
-        # Create the prompt object for the LLM
-        answer_question_prompt = PromptTemplate(
-            template=can_be_answered_prompt_template,
-            input_variables=["question", "context"],
-            partial_variables={
-                "format_instructions": can_be_answered_json_parser.get_format_instructions()
-            },
-        )
-
-        # Initialize the LLM for this task
-        can_be_answered_llm = RewriteQuestion.llm_model
-
-        # Compose the chain: prompt -> LLM -> output parser
-        can_be_answered_chain = (
-            answer_question_prompt | can_be_answered_llm | can_be_answered_json_parser
+        can_be_answered_chain = ChainRegistry.get(
+            "can_be_answered", RewriteQuestion._build_can_be_answered_chain
         )
 
         # Extract relevant fields from state
@@ -392,8 +681,8 @@ class RewriteQuestion(BaseModel):
         try:
             # 1. Check if the answer is grounded in the provided context (fact-checking)
             logger.info("Invoking LLM to check grounding in facts")
-            result = await asyncio.to_thread(
-                is_grounded_on_facts_chain.invoke,
+            result = await RewriteQuestion.invoke_chain(
+                is_grounded_on_facts_chain,
                 {"context": context, "answer": answer},
             )
 
@@ -408,6 +697,8 @@ class RewriteQuestion(BaseModel):
             if not grounded_on_facts:
                 # If not grounded, label as hallucination
                 print("The answer is hallucination.")
+                # Drop a cached copy so the retry asks the LLM again
+                await RewriteQuestion.update_answer_cache(state, keep=False)
                 return "hallucination"
             else:
                 print("The answer is grounded in the facts.")
@@ -417,8 +708,8 @@ class RewriteQuestion(BaseModel):
                 logger.info(
                     "Invoking LLM to determine if question can be fully answered"
                 )
-                output = await asyncio.to_thread(
-                    can_be_answered_chain.invoke, input_data
+                output = await RewriteQuestion.invoke_chain(
+                    can_be_answered_chain, input_data
                 )
 
                 if isinstance(output, dict):
@@ -428,6 +719,7 @@ class RewriteQuestion(BaseModel):
 
                 if can_be_answered:
                     print("The question can be fully answered.")
+                    await RewriteQuestion.update_answer_cache(state, keep=True)
                     return "useful"
                 else:
                     print("The question cannot be fully answered.")
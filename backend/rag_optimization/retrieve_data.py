@@ -1,9 +1,11 @@
+from collections import deque
 from pprint import pprint
-from typing import Any, Optional, Dict, List
+from time import monotonic
+from typing import Any, ClassVar, Deque, Optional, Dict, List
 from langchain_community.vectorstores import FAISS
 from langchain_core.prompts import PromptTemplate
 from pydantic import BaseModel, Field
-from backend.config.azure_models import AzureOpenAIModels
+from backend.rag_optimization.chain_registry import ChainRegistry
 from backend.rag_optimization.research import RewriteQuestion
 from backend.config.logging_lib import logger
 import asyncio
@@ -37,6 +39,21 @@ class RetrieveData(RewriteQuestion):
     chapter_summaries_query_retriever: Optional[Any] = None
     book_quotes_query_retriever: Optional[Any] = None
 
+    # Per-store retrieval timeouts in seconds (None waits indefinitely)
+    store_timeouts: Dict[str, Optional[float]] = Field(
+        default_factory=lambda: {
+            "chunks": 10.0,
+            "chapter_summaries": 10.0,
+            "book_quotes": 10.0,
+        }
+    )
+    # Retrievals kept in retrieval_timings; older entries are dropped
+    RETRIEVAL_TIMINGS_LIMIT: ClassVar[int] = 100
+    # One entry per recent retrieval: question, total_seconds and per-store status/seconds
+    retrieval_timings: Deque[Dict[str, Any]] = Field(
+        default_factory=lambda: deque(maxlen=RetrieveData.RETRIEVAL_TIMINGS_LIMIT)
+    )
+
     def __init__(
         self,
         chunks_vector_store: FAISS,
@@ -88,6 +105,55 @@ class RetrieveData(RewriteQuestion):
         # lightweight operation — run inline
         return text.replace('"', '\\"').replace("'", "\\'")
 
+    @staticmethod
+    def _search(retriever: Any, question: str) -> List[Any]:
+        # Some retrievers expose .invoke, some expose .get_relevant_documents. Use whatever is present.
+        if hasattr(retriever, "invoke"):
+            return retriever.invoke(question)
+        return retriever.get_relevant_documents(question)
+
+    async def retrieve_from_store(
+        self, store: str, retriever: Any, question: str
+    ) -> Dict[str, Any]:
+        """
+        Description:
+            Query one store under its timeout (store_timeouts). A store that times out
+            or fails yields no documents instead of failing the whole retrieval.
+            The timeout only stops waiting: a search that overruns keeps its
+            executor thread busy until it returns, so a store that hangs can still
+            fill the default thread pool.
+
+        Params:
+            store (str): Store name, a key of store_timeouts.
+            retriever (Any): The store's retriever.
+            question (str): The query.
+
+        Return:
+            dict: store, status ("ok", "timeout" or "error"), seconds and documents.
+
+        Exceptions:
+            None
+        """
+        timeout = self.store_timeouts.get(store)
+        start_time = monotonic()
+        status, documents = "ok", []
+        try:
+            documents = await asyncio.wait_for(
+                asyncio.to_thread(self._search, retriever, question), timeout
+            )
+        except asyncio.TimeoutError:
+            status = "timeout"
+            logger.warning(f"Retrieval from {store} timed out after {timeout}s")
+        except Exception:
+            status = "error"
+            logger.exception(f"Retrieval from {store} failed")
+        return {
+            "store": store,
+            "status": status,
+            "seconds": monotonic() - start_time,
+            "documents": documents,
+        }
+
     async def retrieve_context_per_question(
         self, state: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -97,6 +163,10 @@ class RetrieveData(RewriteQuestion):
             - Book chunks
             - Chapter summaries
             - Book quotes
+            The stores are queried concurrently, each under its own timeout; a store
+            that times out or fails is left out of the context. Per-store latency is
+            logged and kept in retrieval_timings (the last RETRIEVAL_TIMINGS_LIMIT
+            retrievals).
 
         Params:
             state (dict): A dictionary containing the question to answer, with key "question".
@@ -108,62 +178,61 @@ class RetrieveData(RewriteQuestion):
 
         Exceptions:
             TypeError: If state is not a dict or missing 'question'.
-            RuntimeError: If retriever calls fail.
+            RuntimeError: If every configured store fails.
         """
         logger.info("Starting retrieve_context_per_question")
         if not isinstance(state, dict) or "question" not in state:
             raise TypeError("state must be a dict containing a 'question' key")
         question = state["question"]
 
-        context, context_summaries, book_quotes = "", "", ""
-
-        try:
-            # Retrieve relevant book chunks
-            if self.chunks_query_retriever is not None:
-                logger.info("Retrieving relevant chunks...")
-                # Some retrievers expose .invoke, some expose .get_relevant_documents. Use whatever is present.
-                if hasattr(self.chunks_query_retriever, "invoke"):
-                    docs = await asyncio.to_thread(
-                        self.chunks_query_retriever.invoke, question
-                    )
-                else:
-                    docs = await asyncio.to_thread(
-                        self.chunks_query_retriever.get_relevant_documents, question
-                    )
-                # join page_content safely
-                context = " ".join(getattr(doc, "page_content", "") for doc in docs)
-
-            # Retrieve relevant chapter summaries
-            if self.chapter_summaries_query_retriever is not None:
-                logger.info("Retrieving relevant chapter summaries...")
-                docs_summaries = await asyncio.to_thread(
-                    self.chapter_summaries_query_retriever.get_relevant_documents,
-                    question,
-                )
-                context_summaries = " ".join(
-                    f"{getattr(doc, 'page_content', '')} (Chapter {doc.metadata.get('chapter')})"
-                    for doc in docs_summaries
-                )
+        retrievers = {
+            "chunks": self.chunks_query_retriever,
+            "chapter_summaries": self.chapter_summaries_query_retriever,
+            "book_quotes": self.book_quotes_query_retriever,
+        }
+        start_time = monotonic()
+        results = await asyncio.gather(
+            *[
+                self.retrieve_from_store(store, retriever, question)
+                for store, retriever in retrievers.items()
+                if retriever is not None
+            ]
+        )
+        by_store = {result["store"]: result for result in results}
+        self.retrieval_timings.append(
+            {
+                "question": question,
+                "total_seconds": monotonic() - start_time,
+                "stores": {
+                    store: {"status": r["status"], "seconds": r["seconds"]}
+                    for store, r in by_store.items()
+                },
+            }
+        )
+        logger.info(f"Retrieval latency: {self.retrieval_timings[-1]}")
+        if results and all(r["status"] != "ok" for r in results):
+            raise RuntimeError("Failed to retrieve context from vector stores")
 
-            # Retrieve relevant book quotes
-            if self.book_quotes_query_retriever is not None:
-                logger.info("Retrieving relevant book quotes...")
-                docs_book_quotes = await asyncio.to_thread(
-                    self.book_quotes_query_retriever.get_relevant_documents, question
-                )
-                book_quotes = " ".join(
-                    getattr(doc, "page_content", "") for doc in docs_book_quotes
-                )
+        def documents(store: str) -> List[Any]:
+            return by_store[store]["documents"] if store in by_store else []
 
-            # Aggregate all contexts and escape problematic characters
-            all_contexts = context + " " + context_summaries + " " + book_quotes
-            all_contexts = await self.escape_quotes(all_contexts)
-            logger.info("Finished retrieve_context_per_question")
-            return {"context": all_contexts, "question": question}
+        # join page_content safely
+        context = " ".join(
+            getattr(doc, "page_content", "") for doc in documents("chunks")
+        )
+        context_summaries = " ".join(
+            f"{getattr(doc, 'page_content', '')} (Chapter {doc.metadata.get('chapter')})"
+            for doc in documents("chapter_summaries")
+        )
+        book_quotes = " ".join(
+            getattr(doc, "page_content", "") for doc in documents("book_quotes")
+        )
 
-        except Exception as e:
-            logger.exception("Error while retrieving context for question")
-            raise RuntimeError("Failed to retrieve context from vector stores") from e
+        # Aggregate all contexts and escape problematic characters
+        all_contexts = context + " " + context_summaries + " " + book_quotes
+        all_contexts = await self.escape_quotes(all_contexts)
+        logger.info("Finished retrieve_context_per_question")
+        return {"context": all_contexts, "question": question}
 
     async def run_retriever_pipeline(self) -> Any:
         """
@@ -241,34 +310,22 @@ class RetrieveData(RewriteQuestion):
             logger.exception("Error in run_retriever_pipeline")
             raise RuntimeError("Retriever pipeline failed") from e
 
-    async def keep_only_relevant_content(self, state: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def _build_keep_only_relevant_content_chain() -> Any:
         """
         Description:
-            Filters and keeps only the relevant content from the retrieved documents that is relevant to the query.
+            Builds the relevant-content filtering chain with structured output; run
+            once per process through ChainRegistry.
 
         Params:
-            state (dict): A dictionary containing:
-                - "question": The query question.
-                - "context": The retrieved documents as a string.
+            None
 
         Return:
-            dict: A dictionary containing:
-                - "relevant_context": The filtered relevant content.
-                - "context": The original context.
-                - "question": The original question.
+            Any: The compiled chain.
 
         Exceptions:
-            TypeError: If state is not a dict or missing keys.
-            RuntimeError: If the LLM filtering fails.
+            None
         """
-        logger.info("Starting keep_only_relevant_content")
-        if (
-            not isinstance(state, dict)
-            or "question" not in state
-            or "context" not in state
-        ):
-            raise TypeError("state must be a dict containing 'question' and 'context'")
-
         # Prompt template for filtering relevant content from retrieved documents
         keep_only_relevant_content_prompt_template = """
              You receive a query: {query} and retrieved documents: {retrieved_documents} from a vector store.
@@ -288,13 +345,47 @@ class RetrieveData(RewriteQuestion):
         )
 
         # Initialize the LLM for filtering relevant content
-        keep_only_relevant_content_llm = AzureOpenAIModels().get_azure_model_4()
+        keep_only_relevant_content_llm = RetrieveData.llm_model
 
         # Create the LLM chain for filtering relevant content
         keep_only_relevant_content_chain = (
             keep_only_relevant_content_prompt
             | keep_only_relevant_content_llm.with_structured_output(KeepRelevantContent)
         )
+        return keep_only_relevant_content_chain
+
+    async def keep_only_relevant_content(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Description:
+            Filters and keeps only the relevant content from the retrieved documents that is relevant to the query.
+
+        Params:
+            state (dict): A dictionary containing:
+                - "question": The query question.
+                - "context": The retrieved documents as a string.
+
+        Return:
+            dict: A dictionary containing:
+                - "relevant_context": The filtered relevant content.
+                - "context": The original context.
+                - "question": The original question.
+
+        Exceptions:
+            TypeError: If state is not a dict or missing keys.
+            RuntimeError: If the LLM filtering fails.
+        """
+        logger.info("Starting keep_only_relevant_content")
+        if (
+            not isinstance(state, dict)
+            or "question" not in state
+            or "context" not in state
+        ):
+            raise TypeError("state must be a dict containing 'question' and 'context'")
+
+        keep_only_relevant_content_chain = ChainRegistry.get(
+            "keep_only_relevant_content",
+            RetrieveData._build_keep_only_relevant_content_chain,
+        )
         question = state["question"]
         context = state["context"]
 
@@ -303,9 +394,8 @@ class RetrieveData(RewriteQuestion):
         try:
             logger.info("Keeping only the relevant content...")
             pprint("--------------------")
-            # chain.invoke may be blocking — run in a thread
-            output = await asyncio.to_thread(
-                keep_only_relevant_content_chain.invoke, input_data
+            output = await self.invoke_chain(
+                keep_only_relevant_content_chain, input_data
             )
 
             # handle output with structured model
@@ -0,0 +1,226 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Dict, Optional
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from backend.config.logging_lib import logger
+
+
+class SemanticCache:
+    """
+    Description:
+        In-memory cache keyed by meaning instead of exact text. Each entry's key is
+        embedded and stored, L2-normalised, in a small fixed-size matrix. A lookup
+        embeds the query and takes the most similar stored key (one matrix-vector
+        product). It is a hit when the cosine similarity reaches `threshold`, so a
+        paraphrase of a cached question reuses its value.
+
+        Entries expire `ttl_seconds` after they were stored. When the cache is full,
+        the least recently used entry is evicted. Hits, misses, expirations and
+        evictions are counted for stats().
+
+    Params:
+        embeddings (Embeddings): Model used to embed keys.
+        threshold (float): Minimum cosine similarity for a hit.
+        ttl_seconds (float): Lifetime of an entry; 0 or less never expires.
+        max_entries (int): Capacity before LRU eviction.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        threshold: float = 0.92,
+        ttl_seconds: float = 86400.0,
+        max_entries: int = 1000,
+    ):
+        if not -1.0 <= threshold <= 1.0:
+            raise ValueError("threshold must be a cosine similarity in [-1, 1]")
+        if not isinstance(max_entries, int) or max_entries < 1:
+            raise ValueError("max_entries must be a positive integer")
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # slot -> {"key", "value", "stored_at"}, least recently used first
+        self._entries: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._matrix: Optional[np.ndarray] = None
+        self._free = list(range(max_entries - 1, -1, -1))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.asarray(self.embeddings.embed_query(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _is_expired(self, entry: Dict[str, Any], now: float) -> bool:
+        return self.ttl_seconds > 0 and now - entry["stored_at"] > self.ttl_seconds
+
+    def _remove(self, slot: int) -> None:
+        del self._entries[slot]
+        self._matrix[slot] = 0.0
+        self._free.append(slot)
+
+    def _scores(self, vector: np.ndarray) -> np.ndarray:
+        # Free slots are zero rows; mask them so they never win, whatever the threshold
+        scores = self._matrix @ vector
+        scores[self._free] = -np.inf
+        return scores
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Description:
+            Value of the most similar cached key, if it is similar enough and alive.
+
+        Params:
+            key (str): Lookup text (e.g. a user question).
+
+        Return:
+            Any or None: The cached value, or None on a miss.
+
+        Exceptions:
+            Exception: Whatever the embedding model raises.
+        """
+        vector = self._embed(key)
+        with self._lock:
+            now = monotonic()
+            for slot in [
+                s for s, e in self._entries.items() if self._is_expired(e, now)
+            ]:
+                self._remove(slot)
+                self.expired += 1
+            if not self._entries:
+                self.misses += 1
+                return None
+            scores = self._scores(vector)
+            slot = int(np.argmax(scores))
+            similarity = float(scores[slot])
+            if similarity < self.threshold:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(slot)
+            self.hits += 1
+            entry = self._entries[slot]
+        logger.info(
+            f"Semantic cache hit ({similarity:.3f}): {key!r} ~ {entry['key']!r}"
+        )
+        return entry["value"]
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Description:
+            Store a value, evicting the least recently used entry when full. A key
+            that matches a cached one above the threshold replaces it.
+
+        Params:
+            key (str): Text the value belongs to.
+            value (Any): Value to cache.
+
+        Return:
+            None
+
+        Exceptions:
+            Exception: Whatever the embedding model raises.
+        """
+        vector = self._embed(key)
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = np.zeros(
+                    (self.max_entries, vector.shape[0]), dtype=np.float32
+                )
+            if self._entries:
+                scores = self._scores(vector)
+                slot = int(np.argmax(scores))
+                if scores[slot] >= self.threshold:
+                    self._remove(slot)
+            if not self._free:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            slot = self._free.pop()
+            self._matrix[slot] = vector
+            self._entries[slot] = {"key": key, "value": value, "stored_at": monotonic()}
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """
+        Description:
+            get() with the embedding computed off the event loop.
+
+        Params:
+            key (str): Lookup text.
+
+        Return:
+            Any or None: The cached value, or None on a miss.
+
+        Exceptions:
+            Exception: Whatever the embedding model raises.
+        """
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(self, key: str, value: Any) -> None:
+        """
+        Description:
+            put() with the embedding computed off the event loop.
+
+        Params:
+            key (str): Text the value belongs to.
+            value (Any): Value to cache.
+
+        Return:
+            None
+
+        Exceptions:
+            Exception: Whatever the embedding model raises.
+        """
+        await asyncio.to_thread(self.put, key, value)
+
+    def clear(self) -> None:
+        """
+        Description:
+            Drop every entry; the counters are kept.
+
+        Params:
+            None
+
+        Return:
+            None
+
+        Exceptions:
+            None
+        """
+        with self._lock:
+            self._entries.clear()
+            self._matrix = None
+            self._free = list(range(self.max_entries - 1, -1, -1))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Description:
+            Cache size and hit-rate metrics.
+
+        Params:
+            None
+
+        Return:
+            dict: entries, hits, misses, hit_rate, expired and evictions.
+
+        Exceptions:
+            None
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "expired": self.expired,
+                "evictions": self.evictions,
+            }
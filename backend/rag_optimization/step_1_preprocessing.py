@@ -1,25 +1,48 @@
 import asyncio
+import os
 from time import monotonic
-from typing import Any
-import pdfplumber
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
 from langchain.chains.summarize import load_summarize_chain
-from langchain_community.document_loaders import PyPDFLoader
 import regex as re
 from langchain_core.documents import Document
 from langchain_core.prompts import PromptTemplate
-import tiktoken
 from backend.config.azure_models import AzureOpenAIModels
 from backend.config.logging_lib import logger
+from backend.rag_optimization.chapter_index import ChapterIndex
+from backend.rag_optimization.llm_scheduler import LLMScheduler
+from backend.rag_optimization.map_reduce_summarizer import MapReduceSummarizer
+from backend.rag_optimization.pdf_page_cache import PdfPageCache
+from backend.rag_optimization.pipeline_checkpoint import PipelineCheckpoint
+from backend.rag_optimization.quote_extractor import QuoteExtractor
+from backend.rag_optimization.summary_cache import SummaryCache
+from backend.rag_optimization.token_counter import TokenCounter
 
 
 class ProcessDocument:
-    def __init__(self, input_pdf_path: str):
+    # Completion budget of the summarization model (get_azure_model_4 max_tokens)
+    SUMMARY_COMPLETION_TOKENS = 2000
+
+    def __init__(
+        self,
+        input_pdf_path: str,
+        page_cache: Optional[PdfPageCache] = None,
+        scheduler: Optional[LLMScheduler] = None,
+        summary_cache: Optional[SummaryCache] = None,
+        checkpoint: Optional[PipelineCheckpoint] = None,
+    ):
         """
         Description:
             Initialize the ProcessDocument handler with the PDF path.
 
         Params:
             input_pdf_path (str): Path to the input PDF file.
+            page_cache (PdfPageCache, optional): Parsed-page cache shared with encoding.
+            scheduler (LLMScheduler, optional): Rate-limited scheduler for summarization
+                calls; defaults to the AZURE_OPENAI_MAX_IN_FLIGHT / _TOKENS_PER_MINUTE
+                settings.
+            summary_cache (SummaryCache, optional): On-disk chapter summary cache.
+            checkpoint (PipelineCheckpoint, optional): Stage checkpoints used to resume
+                preprocess_pipeline; defaults to one under "pipeline_work".
 
         Return:
             None
@@ -30,45 +53,56 @@ class ProcessDocument:
         if not isinstance(input_pdf_path, str):
             raise TypeError("input_pdf_path must be a string")
         self.input_pdf_path = input_pdf_path
+        self.page_cache = page_cache or PdfPageCache()
+        azure_config = AzureOpenAIModels()
+        if scheduler is None:
+            scheduler = LLMScheduler(
+                max_in_flight=azure_config.get_azure_openai_max_in_flight,
+                tokens_per_minute=azure_config.get_azure_openai_tokens_per_minute,
+            )
+        self.scheduler = scheduler
+        self.summary_cache = summary_cache or SummaryCache()
+        # Map and reduce results of long chapters, kept apart from the chapter hit counts
+        self.partial_summary_cache = SummaryCache(
+            os.path.join(self.summary_cache.cache_dir, "partials")
+        )
+        # Created on first use, since it hashes the PDF
+        self.checkpoint = checkpoint
+        # Tokenizer used for routing and rate limiting summarization calls
+        self.token_model = (
+            azure_config.get_gpt_model_preview or TokenCounter.DEFAULT_MODEL
+        )
+        # Await ainvoke on the event loop rather than invoke on scheduler threads
+        self.async_native = azure_config.get_azure_openai_async_native
         logger.info(
             f"Initialized ProcessDocument with file path: {self.input_pdf_path}"
         )
 
-    async def split_into_chapters(self) -> list[Document]:
+    async def get_chapter_index(self) -> ChapterIndex:
         """
         Description:
-            Splits a PDF into chapters based on regex chapter patterns using pdfplumber.
+            The book's chapter index (page ranges and offsets into the cached pages),
+            read from disk or built from the cached pages.
 
         Params:
             None
 
         Return:
-            list[Document]: List of Document objects with chapter text and metadata.
+            ChapterIndex: The chapter index.
 
         Exceptions:
             FileNotFoundError: If the PDF file does not exist.
             ValueError: If no text can be extracted from the PDF.
         """
-        logger.info(f"Starting chapter split for PDF: {self.input_pdf_path}")
-
         try:
-            async with asyncio.Semaphore(1):  # Prevent race condition on file read
-                # Use asyncio.to_thread for blocking pdfplumber operations
-                def extract_text_pdfplumber(path):
-                    full_text = ""
-                    with pdfplumber.open(path) as pdf:
-                        for i, page in enumerate(pdf.pages):
-                            try:
-                                page_text = page.extract_text() or ""
-                                full_text += page_text + " "
-                            except Exception as e:
-                                logger.warning(
-                                    f"Failed to extract text from page {i}: {e}"
-                                )
-                    return full_text
-
-                text = await asyncio.to_thread(
-                    extract_text_pdfplumber, self.input_pdf_path
+            pages = await asyncio.to_thread(
+                self.page_cache.get_pages, self.input_pdf_path
+            )
+            failed_pages = self.page_cache.get_failed_pages(self.input_pdf_path)
+            if failed_pages:
+                logger.warning(
+                    f"Chapters built without {len(failed_pages)} unreadable pages: "
+                    f"{failed_pages}"
                 )
 
         except FileNotFoundError:
@@ -78,21 +112,35 @@ class ProcessDocument:
             logger.exception("Unexpected error while splitting chapters")
             raise
 
-        if not text.strip():
+        if not any(page.page_content.strip() for page in pages):
             raise ValueError("No text could be extracted from PDF.")
 
-        # Split into chapters using regex
-        chapters = await asyncio.to_thread(
-            re.split, r"(CHAPTER\s[A-Z]+(?:\s[A-Z]+)*)", text
+        return await asyncio.to_thread(
+            ChapterIndex.load_or_build, self.page_cache, self.input_pdf_path
         )
-        chapter_docs = []
-        chapter_num = 1
-        for i in range(1, len(chapters), 2):
-            chapter_text = chapters[i] + chapters[i + 1]
-            doc = Document(page_content=chapter_text, metadata={"chapter": chapter_num})
-            chapter_docs.append(doc)
-            chapter_num += 1
 
+    async def split_into_chapters(self) -> list[Document]:
+        """
+        Description:
+            Splits a PDF into chapters based on regex chapter patterns, using the
+            chapter index over the shared page cache. Every chapter carries its index
+            entry (chapter, title, page range and offsets) as metadata.
+
+        Params:
+            None
+
+        Return:
+            list[Document]: List of Document objects with chapter text and metadata.
+
+        Exceptions:
+            FileNotFoundError: If the PDF file does not exist.
+            ValueError: If no text can be extracted from the PDF.
+        """
+        logger.info(f"Starting chapter split for PDF: {self.input_pdf_path}")
+        chapter_index = await self.get_chapter_index()
+        chapter_docs = await asyncio.to_thread(
+            lambda: list(chapter_index.iter_documents())
+        )
         logger.info(f"Finished splitting into {len(chapter_docs)} chapters")
         return chapter_docs
 
@@ -127,10 +175,12 @@ class ProcessDocument:
     ) -> list[Document]:
         """
         Description:
-            Extract long quotes from documents.
+            Extract long quotes from documents in a single pass over the joined
+            pages (see QuoteExtractor); quotes spanning a page break are kept,
+            duplicates are dropped and each quote records the pages it spans.
 
         Params:
-            documents (list[Document]): Input documents.
+            documents (list[Document]): Input documents in reading order.
             min_length (int): Minimum length of a quote.
 
         Return:
@@ -140,21 +190,28 @@ class ProcessDocument:
             TypeError: If documents is not a list of Document objects.
         """
         logger.info("Starting quote extraction")
-        if not isinstance(documents, list) or not all(
-            isinstance(d, Document) for d in documents
-        ):
-            raise TypeError("documents must be a list of Document objects")
-        quotes_as_documents = []
-        quote_pattern = re.compile(rf'"(.{{{min_length},}}?)"', re.DOTALL)
+        quotes_as_documents = await QuoteExtractor(min_length).extract(documents)
+        logger.info(f"Extracted {len(quotes_as_documents)} quotes")
+        return quotes_as_documents
 
-        for doc in documents:
-            content = doc.page_content.replace("\n", " ")
-            found_quotes = await asyncio.to_thread(quote_pattern.findall, content)
-            for quote in found_quotes:
-                quotes_as_documents.append(Document(page_content=quote))
+    async def stream_book_quotes(self, min_length: int = 50) -> AsyncIterator[Document]:
+        """
+        Description:
+            Yield the book's quotes as the scan finds them, e.g. to feed
+            EncodeEmbeddings.encode_quotes without collecting them first.
 
-        logger.info("Extracted %d quotes: {len(quotes_as_documents)}")
-        return quotes_as_documents
+        Params:
+            min_length (int): Minimum length of a quote.
+
+        Return:
+            AsyncIterator[Document]: Quote documents in book order.
+
+        Exceptions:
+            FileNotFoundError: If the PDF file does not exist.
+        """
+        pages = await asyncio.to_thread(self.page_cache.get_pages, self.input_pdf_path)
+        async for quote in QuoteExtractor(min_length).astream(pages):
+            yield quote
 
     @staticmethod
     async def replace_double_lines_with_one_line(text: str) -> str:
@@ -177,10 +234,12 @@ class ProcessDocument:
         return cleaned_text
 
     @staticmethod
-    async def num_tokens_from_string(string: str, encoding_name: str) -> int:
+    def num_tokens_from_string(string: str, encoding_name: str) -> int:
         """
         Description:
-            Count tokens in a string with tiktoken.
+            Count tokens in a string with the shared TokenCounter (cached encodings,
+            Azure model names such as "gpt-35-turbo" are understood). Tokenizing is
+            CPU-bound; from a coroutine, run it with asyncio.to_thread.
 
         Params:
             string (str): Text to encode.
@@ -194,17 +253,22 @@ class ProcessDocument:
         """
         if not isinstance(string, str) or not isinstance(encoding_name, str):
             raise TypeError("Both string and encoding_name must be strings")
-        encoding = tiktoken.encoding_for_model(encoding_name)
-        num_tokens = await asyncio.to_thread(lambda: len(encoding.encode(string)))
-        return num_tokens
+        return TokenCounter.count(string, encoding_name)
 
-    async def create_chapter_summary(self, chapter: Document) -> Document:
+    async def create_chapter_summary(
+        self, chapter: Document, num_tokens: Optional[int] = None
+    ) -> Document:
         """
         Description:
-            Generate a summary for a chapter.
+            Generate a summary for a chapter. Summaries are cached on disk by chapter
+            text, prompt and deployment, so unchanged chapters make no LLM call.
+            Chapters over the token threshold go through MapReduceSummarizer, whose
+            partial summaries are logged as they arrive and cached, so a failed run
+            resumes where it stopped.
 
         Params:
             chapter (Document): Chapter document.
+            num_tokens (int, optional): Precomputed token count of the chapter.
 
         Return:
             Document: Summary document.
@@ -228,49 +292,189 @@ class ProcessDocument:
         )
         chapter_txt = chapter.page_content
 
-        llm = AzureOpenAIModels().get_azure_model_4()
-        gpt_4o_mini_max_tokens = 50000
-        model_name = "gpt-35-turbo-"
-        num_tokens = await self.num_tokens_from_string(
-            chapter_txt, encoding_name=model_name
+        azure_models = AzureOpenAIModels()
+        deployment = azure_models.get_gpt_model_preview_deployment_name
+        cache_key = SummaryCache.make_key(
+            chapter_txt, summarization_prompt_template, deployment
         )
+        cached_summary = await asyncio.to_thread(self.summary_cache.get, cache_key)
+        if cached_summary is not None:
+            logger.info(f"Using cached summary for chapter: {chapter.metadata}")
+            return Document(page_content=cached_summary, metadata=chapter.metadata)
 
-        if num_tokens < gpt_4o_mini_max_tokens:
-            chain = load_summarize_chain(
-                llm, chain_type="stuff", prompt=summarization_prompt, verbose=False
-            )
-        else:
-            chain = load_summarize_chain(
-                llm,
-                chain_type="map_reduce",
-                map_prompt=summarization_prompt,
-                combine_prompt=summarization_prompt,
-                verbose=False,
-            )
-        start_time = monotonic()
-        doc_chapter = Document(page_content=chapter_txt)
+        llm = azure_models.get_azure_model_4()
+        gpt_4o_mini_max_tokens = 50000
+        if num_tokens is None:
+            # The byte bound routes most chapters without a full count; a single
+            # call is charged its exact count, map-reduce charges every piece itself
+            if await asyncio.to_thread(
+                TokenCounter.fits,
+                chapter_txt,
+                gpt_4o_mini_max_tokens - 1,
+                self.token_model,
+            ):
+                num_tokens = await asyncio.to_thread(
+                    TokenCounter.count, chapter_txt, self.token_model
+                )
+            else:
+                num_tokens = gpt_4o_mini_max_tokens
 
+        start_time = monotonic()
+        label = f"chapter {chapter.metadata.get('chapter')}"
         try:
-            summary_result = await asyncio.to_thread(
-                chain.invoke, {"input_documents": [doc_chapter]}
-            )
+            if num_tokens < gpt_4o_mini_max_tokens:
+                chain = load_summarize_chain(
+                    llm, chain_type="stuff", prompt=summarization_prompt, verbose=False
+                )
+                run, call = (
+                    (self.scheduler.run_async, chain.ainvoke)
+                    if self.async_native
+                    else (self.scheduler.run_in_thread, chain.invoke)
+                )
+                summary_result = await run(
+                    call,
+                    {"input_documents": [Document(page_content=chapter_txt)]},
+                    tokens=num_tokens + self.SUMMARY_COMPLETION_TOKENS,
+                    label=label,
+                )
+                output_text = summary_result["output_text"]
+            else:
+                summarizer = MapReduceSummarizer(
+                    llm,
+                    summarization_prompt_template,
+                    deployment,
+                    scheduler=self.scheduler,
+                    cache=self.partial_summary_cache,
+                    token_model=self.token_model,
+                    completion_tokens=self.SUMMARY_COMPLETION_TOKENS,
+                    async_native=self.async_native,
+                )
+                async for event in summarizer.astream(chapter_txt, label=label):
+                    if not event["final"]:
+                        logger.info(
+                            f"{label}: level {event['level']} part "
+                            f"{event['index'] + 1}/{event['total']} summarized"
+                            f"{' (cached)' if event['cached'] else ''}"
+                        )
+                    else:
+                        output_text = event["summary"]
         except Exception as e:
             logger.exception("Error during summarization")
             raise RuntimeError("Summarization failed") from e
 
-        logger.info(f"Chain type: {chain.__class__.__name__}")
         logger.info(f"Run time: {monotonic() - start_time}")
-        summary_text = await self.replace_double_lines_with_one_line(
-            summary_result["output_text"]
+        summary_text = await self.replace_double_lines_with_one_line(output_text)
+        await asyncio.to_thread(
+            self.summary_cache.put, cache_key, summary_text, deployment
         )
         doc_summary = Document(page_content=summary_text, metadata=chapter.metadata)
         logger.info(f"Finished summarization for chapter: {chapter.metadata}")
         return doc_summary
 
+    async def _run_stage(
+        self,
+        checkpoint: PipelineCheckpoint,
+        stage: str,
+        build: Callable[[], Awaitable[list[Document]]],
+    ) -> list[Document]:
+        """
+        Description:
+            Load a stage's checkpointed output, or build it and checkpoint it.
+
+        Params:
+            checkpoint (PipelineCheckpoint): The book's checkpoints.
+            stage (str): Stage name.
+            build (callable): Coroutine function producing the stage's documents.
+
+        Return:
+            list[Document]: The stage's documents.
+
+        Exceptions:
+            Exception: Whatever build raised.
+        """
+        if checkpoint.is_done(stage):
+            documents = await asyncio.to_thread(checkpoint.load_documents, stage)
+            if documents is not None:
+                logger.info(
+                    f"Resuming: loaded {len(documents)} {stage} from checkpoint"
+                )
+                return documents
+        start_time = monotonic()
+        checkpoint.record(stage, "running")
+        try:
+            documents = await build()
+        except Exception:
+            checkpoint.record(stage, "failed", monotonic() - start_time)
+            raise
+        await asyncio.to_thread(checkpoint.save_documents, stage, documents)
+        checkpoint.record(stage, "done", monotonic() - start_time, len(documents))
+        return documents
+
+    async def _summarize_chapters(
+        self, checkpoint: PipelineCheckpoint, chapter_index: ChapterIndex
+    ) -> list[Document]:
+        """
+        Description:
+            Summarize all chapters, checkpointing every summary as soon as it is done
+            and skipping chapters summarized by an earlier run. A chapter's text is
+            only loaded from the page cache when its summary is missing. Every
+            chapter is attempted before a failure is raised, so a rerun only repeats
+            the chapters that failed.
+
+        Params:
+            checkpoint (PipelineCheckpoint): The book's checkpoints.
+            chapter_index (ChapterIndex): The book's chapter index.
+
+        Return:
+            list[Document]: Summaries in chapter order.
+
+        Exceptions:
+            RuntimeError: If any chapter could not be summarized.
+        """
+        start_time = monotonic()
+        checkpoint.record("summaries", "running")
+
+        def load_chapter(chapter_num: int) -> Document:
+            chapter = chapter_index.get_document(chapter_num)
+            chapter.page_content = chapter.page_content.replace("\t", " ")
+            return chapter
+
+        async def summarize(chapter_num: int) -> Document:
+            unit = str(chapter_num)
+            summary = await asyncio.to_thread(checkpoint.load_unit, "summaries", unit)
+            if summary is None:
+                chapter = await asyncio.to_thread(load_chapter, chapter_num)
+                summary = await self.create_chapter_summary(chapter)
+                await asyncio.to_thread(
+                    checkpoint.save_unit, "summaries", unit, summary
+                )
+            return summary
+
+        results = await asyncio.gather(
+            *[summarize(entry["chapter"]) for entry in chapter_index.entries],
+            return_exceptions=True,
+        )
+        failures = [r for r in results if isinstance(r, BaseException)]
+        checkpoint.record(
+            "summaries",
+            "failed" if failures else "done",
+            monotonic() - start_time,
+            len(results) - len(failures),
+        )
+        if failures:
+            raise RuntimeError(
+                f"{len(failures)} of {len(chapter_index)} chapter summaries failed; "
+                f"completed summaries are checkpointed"
+            ) from failures[0]
+        return list(results)
+
     async def preprocess_pipeline(self) -> tuple[tuple[Any], list[Document]]:
         """
         Description:
             Full preprocessing pipeline: split, clean, extract quotes, summarize.
+            The chapter index, quotes and every chapter summary are checkpointed as
+            they complete, so a rerun after a failure resumes from the last completed
+            unit; chapter text is loaded only for chapters that still need a summary.
 
         Params:
             None
@@ -283,20 +487,61 @@ class ProcessDocument:
         """
         logger.info("Starting preprocessing pipeline")
         try:
-            chapters = await self.split_into_chapters()
-            chapters = await self.replace_t_with_space(chapters)
-            logger.info(f"length of Chapters are: {len(chapters)}")
-
-            loader = PyPDFLoader(self.input_pdf_path)
-            document = await asyncio.to_thread(loader.load)
-            document_cleaned = await self.replace_t_with_space(document)
-            book_quotes_list = await self.extract_book_quotes_as_documents(
-                document_cleaned
+            if self.checkpoint is None:
+                self.checkpoint = await asyncio.to_thread(
+                    PipelineCheckpoint, self.input_pdf_path
+                )
+            checkpoint = self.checkpoint
+
+            # The chapter index is persisted by PDF hash, so it is its own checkpoint
+            start_time = monotonic()
+            chapter_index = await self.get_chapter_index()
+            fingerprint = chapter_index.fingerprint()
+            if checkpoint.fingerprint("chapters") != fingerprint:
+                # Summaries and the quotes' chapter metadata of an earlier chapter
+                # split no longer apply
+                for stage in ("summaries", "quotes"):
+                    await asyncio.to_thread(checkpoint.reset, stage)
+            checkpoint.record(
+                "chapters",
+                "done",
+                monotonic() - start_time,
+                len(chapter_index),
+                fingerprint=fingerprint,
             )
+            logger.info(f"length of Chapters are: {len(chapter_index)}")
+
+            async def build_quotes() -> list[Document]:
+                pages = await asyncio.to_thread(
+                    self.page_cache.get_pages, self.input_pdf_path
+                )
+                quotes = await self.extract_book_quotes_as_documents(pages)
+                for quote in quotes:
+                    entry = chapter_index.chapter_at(quote.metadata["offset"])
+                    quote.metadata["chapter"] = entry["chapter"] if entry else None
+                return quotes
+
+            book_quotes_list = await self._run_stage(checkpoint, "quotes", build_quotes)
             logger.info(f"Book Quotes List length: {len(book_quotes_list)}")
 
-            chapter_summaries = await asyncio.gather(
-                *[self.create_chapter_summary(ch) for ch in chapters]
+            chapter_summaries = await self._summarize_chapters(
+                checkpoint, chapter_index
+            )
+            logger.info(
+                f"Chapter summaries: {self.summary_cache.hits} cached, "
+                f"{self.summary_cache.misses} generated"
+            )
+            report = self.scheduler.report()
+            for timing in report["calls"]:
+                logger.info(
+                    f"Summarized {timing['label']}: queued "
+                    f"{timing['queued_seconds']:.2f}s, ran {timing['run_seconds']:.2f}s, "
+                    f"{timing['attempts']} attempt(s)"
+                )
+            logger.info(
+                f"Summarization: {report['retries']} retries, max queue "
+                f"{report['max_queued_seconds']:.2f}s, max run "
+                f"{report['max_run_seconds']:.2f}s"
             )
         except Exception as e:
             logger.exception("Error in preprocessing pipeline")
@@ -0,0 +1,183 @@
+import asyncio
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from backend.config.logging_lib import logger
+from backend.config.pdf_extractors import PdfTextExtractor, get_pdf_extractor
+from backend.rag_optimization.chapter_index import ChapterIndex
+from backend.rag_optimization.pdf_page_cache import PdfPageCache
+
+
+class StreamingBookEncoder:
+    """
+    Description:
+        Bounded-memory ingestion of a PDF into a FAISS vector store. Pages are read
+        lazily, split and cleaned one at a time, grouped into batches of `batch_size`
+        chunks and embedded batch by batch; each batch is appended to the index as soon
+        as it is embedded. A producer task parses pages while the consumer embeds, and
+        the queue between them holds at most `max_pending_batches` batches, so a slow
+        embedding model pauses PDF parsing instead of letting chunks pile up in memory.
+
+    Params:
+        embeddings (Embeddings): Embedding model for the chunks.
+        batch_size (int): Chunks per embedding call / index append.
+        max_pending_batches (int): Batches allowed to wait for embedding (backpressure).
+        progress_callback (callable, optional): Called after every indexed batch with a
+            dict of pages, chunks, batches and elapsed_seconds.
+        pdf_extractor (PdfTextExtractor, optional): Page text backend; defaults to the
+            PDF_EXTRACTOR setting.
+    """
+
+    def __init__(
+        self,
+        embeddings: Any,
+        batch_size: int = 64,
+        max_pending_batches: int = 2,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        pdf_extractor: Optional[PdfTextExtractor] = None,
+    ):
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        if not isinstance(max_pending_batches, int) or max_pending_batches < 1:
+            raise ValueError("max_pending_batches must be a positive integer")
+        if progress_callback is not None and not callable(progress_callback):
+            raise TypeError("progress_callback must be callable")
+        self.embeddings = embeddings
+        self.batch_size = batch_size
+        self.max_pending_batches = max_pending_batches
+        self.progress_callback = progress_callback
+        self.pdf_extractor = pdf_extractor or get_pdf_extractor()
+
+    async def _produce(
+        self,
+        path: str,
+        splitter: RecursiveCharacterTextSplitter,
+        batches: asyncio.Queue,
+        progress: Dict[str, Any],
+        chapter_index: Optional[ChapterIndex],
+    ) -> None:
+        pages = self.pdf_extractor.iter_pages(path)
+        batch: List[Document] = []
+        # Start of the current page in the joined book text (PdfPageCache.full_text)
+        page_offset = 0
+        try:
+            while True:
+                result = await asyncio.to_thread(next, pages, None)
+                if result is None:
+                    break
+                page_num, text, error = result
+                if error is not None:
+                    logger.warning(f"Failed to extract page {page_num}: {error}")
+                page = Document(
+                    page_content=text,
+                    metadata={"source": path, "page": page_num, "offset": page_offset},
+                )
+                page_offset += len(text) + len(PdfPageCache.PAGE_SEPARATOR)
+                progress["pages"] += 1
+                for chunk in splitter.split_documents([page]):
+                    chunk.metadata["offset"] += chunk.metadata.pop("start_index")
+                    if chapter_index is not None:
+                        entry = chapter_index.chapter_at(chunk.metadata["offset"])
+                        chunk.metadata["chapter"] = entry["chapter"] if entry else None
+                    chunk.page_content = chunk.page_content.replace("\t", " ")
+                    batch.append(chunk)
+                    if len(batch) == self.batch_size:
+                        # Blocks while the consumer is max_pending_batches behind
+                        await batches.put(batch)
+                        batch = []
+            if batch:
+                await batches.put(batch)
+        except Exception:
+            # Wake the consumer, which re-raises the error when it awaits the producer
+            await batches.put(None)
+            raise
+        # Not sent when cancelled: the consumer has stopped and the queue may be full
+        await batches.put(None)
+
+    def _report(self, progress: Dict[str, Any], start_time: float) -> None:
+        progress["elapsed_seconds"] = monotonic() - start_time
+        if self.progress_callback is None:
+            return
+        try:
+            self.progress_callback(dict(progress))
+        except Exception:
+            logger.exception("Progress callback failed")
+
+    async def encode(
+        self,
+        path: str,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        chapter_index: Optional[ChapterIndex] = None,
+    ) -> Optional[FAISS]:
+        """
+        Description:
+            Stream a PDF through splitting, tab cleanup, batched embedding and index
+            appends. Pages come one at a time from the PDF extractor and are split
+            separately, like EncodeEmbeddings.load_book_chunks; chunks carry the same
+            `offset` in the book text and, given the chapter index, their `chapter`.
+
+        Params:
+            path (str): The path to the PDF file.
+            chunk_size (int): The desired size of each text chunk.
+            chunk_overlap (int): The amount of overlap between consecutive chunks.
+            chapter_index (ChapterIndex, optional): The book's chapter index, built
+                with the same extractor backend.
+
+        Return:
+            FAISS or None: The populated vector store, or None if the PDF had no text.
+
+        Exceptions:
+            Exception: Whatever PDF parsing or the embedding model raised.
+        """
+        splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            length_function=len,
+            add_start_index=True,
+        )
+        batches: asyncio.Queue = asyncio.Queue(maxsize=self.max_pending_batches)
+        progress: Dict[str, Any] = {"pages": 0, "chunks": 0, "batches": 0}
+        start_time = monotonic()
+        producer = asyncio.create_task(
+            self._produce(path, splitter, batches, progress, chapter_index)
+        )
+
+        store: Optional[FAISS] = None
+        try:
+            while True:
+                batch = await batches.get()
+                if batch is None:
+                    break
+                texts = [doc.page_content for doc in batch]
+                vectors = await asyncio.to_thread(
+                    self.embeddings.embed_documents, texts
+                )
+                pairs = list(zip(texts, vectors))
+                metadatas = [doc.metadata for doc in batch]
+                if store is None:
+                    store = await asyncio.to_thread(
+                        FAISS.from_embeddings, pairs, self.embeddings, metadatas
+                    )
+                else:
+                    await asyncio.to_thread(store.add_embeddings, pairs, metadatas)
+                progress["chunks"] += len(batch)
+                progress["batches"] += 1
+                self._report(progress, start_time)
+            # Surface parsing errors raised after the last batch was queued
+            await producer
+        finally:
+            if not producer.done():
+                producer.cancel()
+                try:
+                    await producer
+                except (asyncio.CancelledError, Exception):
+                    pass
+
+        logger.info(
+            f"Streamed {path}: {progress['pages']} pages, {progress['chunks']} chunks "
+            f"in {progress['batches']} batches ({monotonic() - start_time:.2f}s)"
+        )
+        return store
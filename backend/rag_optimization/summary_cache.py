@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Optional
+from backend.config.logging_lib import logger
+
+
+class SummaryCache:
+    """
+    Description:
+        On-disk cache of chapter summaries. The key is the sha256 of the chapter text,
+        the summarization prompt and the LLM deployment name, so an unchanged chapter
+        is never summarized twice, while editing the chapter, the prompt or switching
+        deployments produces a new key. Each entry is its own JSON file, written
+        atomically, so concurrent chapter tasks never contend on a shared index.
+
+    Params:
+        cache_dir (str): Folder holding the cached summaries.
+    """
+
+    def __init__(self, cache_dir: str = "chapter_summary_cache"):
+        if not isinstance(cache_dir, str):
+            raise TypeError("cache_dir must be a string")
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(text: str, prompt: str, deployment: str) -> str:
+        """
+        Description:
+            Cache key for a chapter summary.
+
+        Params:
+            text (str): Chapter text.
+            prompt (str): Summarization prompt template.
+            deployment (str): LLM deployment name.
+
+        Return:
+            str: Hex digest.
+
+        Exceptions:
+            None
+        """
+        payload = json.dumps(
+            {"text": text, "prompt": prompt, "deployment": deployment},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Description:
+            Cached summary for a key, if any.
+
+        Params:
+            key (str): Key from make_key().
+
+        Return:
+            str or None: The summary text.
+
+        Exceptions:
+            None
+        """
+        path = self._path(key)
+        summary = None
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    summary = json.load(f)["summary"]
+            except (OSError, ValueError, KeyError):
+                logger.warning(f"Summary cache entry unreadable, ignoring: {path}")
+        with self._lock:
+            if summary is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return summary
+
+    def put(self, key: str, summary: str, deployment: str = "") -> None:
+        """
+        Description:
+            Store a summary.
+
+        Params:
+            key (str): Key from make_key().
+            summary (str): The summary text.
+            deployment (str): LLM deployment name (kept for inspection).
+
+        Return:
+            None
+
+        Exceptions:
+            OSError: If the entry cannot be written.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"summary": summary, "deployment": deployment}, f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,165 @@
+import re
+import threading
+from typing import Dict, List
+import tiktoken
+from backend.config.logging_lib import logger
+
+
+class TokenCounter:
+    """
+    Description:
+        Process-wide token counting. tiktoken encodings are resolved once per model
+        name and cached; Azure-style names ("gpt-35-turbo", "gpt-35-turbo-16k") are
+        mapped to their OpenAI equivalents and unknown names fall back to
+        cl100k_base instead of raising. count_batch() encodes many strings in one
+        native call, and estimate_upper_bound() gives a bound that needs no
+        tokenizer at all for hot paths that only need "is this small enough".
+    """
+
+    DEFAULT_MODEL = "gpt-4"
+    FALLBACK_ENCODING = "cl100k_base"
+
+    _encodings: Dict[str, tiktoken.Encoding] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def normalize_model_name(model: str) -> str:
+        """
+        Description:
+            Map Azure deployment-style model names onto names tiktoken knows.
+
+        Params:
+            model (str): Model or deployment name, e.g. "gpt-35-turbo-".
+
+        Return:
+            str: Normalised model name, e.g. "gpt-3.5-turbo".
+
+        Exceptions:
+            TypeError: If model is not a string.
+        """
+        if not isinstance(model, str):
+            raise TypeError("model must be a string")
+        model = model.strip().lower().rstrip("-")
+        return re.sub(r"^gpt-35\b", "gpt-3.5", model)
+
+    @classmethod
+    def get_encoding(cls, model: str = DEFAULT_MODEL) -> tiktoken.Encoding:
+        """
+        Description:
+            Cached tiktoken encoding for a model name.
+
+        Params:
+            model (str): Model or deployment name.
+
+        Return:
+            tiktoken.Encoding: The encoding.
+
+        Exceptions:
+            TypeError: If model is not a string.
+        """
+        encoding = cls._encodings.get(model)
+        if encoding is not None:
+            return encoding
+        with cls._lock:
+            encoding = cls._encodings.get(model)
+            if encoding is None:
+                name = cls.normalize_model_name(model)
+                try:
+                    encoding = tiktoken.encoding_for_model(name)
+                except KeyError:
+                    logger.warning(
+                        f"No tiktoken encoding for {model!r}; "
+                        f"using {cls.FALLBACK_ENCODING}"
+                    )
+                    encoding = tiktoken.get_encoding(cls.FALLBACK_ENCODING)
+                cls._encodings[model] = encoding
+            return encoding
+
+    @classmethod
+    def count(cls, text: str, model: str = DEFAULT_MODEL) -> int:
+        """
+        Description:
+            Exact token count of a string.
+
+        Params:
+            text (str): Text to count.
+            model (str): Model or deployment name.
+
+        Return:
+            int: Number of tokens.
+
+        Exceptions:
+            TypeError: If text is not a string.
+        """
+        if not isinstance(text, str):
+            raise TypeError("text must be a string")
+        # Special-token text in documents is counted as ordinary text
+        return len(cls.get_encoding(model).encode(text, disallowed_special=()))
+
+    @classmethod
+    def count_batch(cls, texts: List[str], model: str = DEFAULT_MODEL) -> List[int]:
+        """
+        Description:
+            Exact token counts for many strings in one batched, multi-threaded
+            tiktoken call.
+
+        Params:
+            texts (list[str]): Texts to count.
+            model (str): Model or deployment name.
+
+        Return:
+            list[int]: One count per text, in input order.
+
+        Exceptions:
+            TypeError: If texts is not a list of strings.
+        """
+        if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+            raise TypeError("texts must be a list of strings")
+        if not texts:
+            return []
+        encoded = cls.get_encoding(model).encode_batch(texts, disallowed_special=())
+        return [len(tokens) for tokens in encoded]
+
+    @staticmethod
+    def estimate_upper_bound(text: str) -> int:
+        """
+        Description:
+            Upper bound on the token count of any byte-level BPE encoding: every token
+            covers at least one UTF-8 byte, so tokens <= bytes. Roughly 4x the real
+            count for English; use it to skip exact counting when text is clearly
+            under a limit.
+
+        Params:
+            text (str): Text to bound.
+
+        Return:
+            int: UTF-8 byte length.
+
+        Exceptions:
+            TypeError: If text is not a string.
+        """
+        if not isinstance(text, str):
+            raise TypeError("text must be a string")
+        return len(text.encode("utf-8"))
+
+    @classmethod
+    def fits(cls, text: str, max_tokens: int, model: str = DEFAULT_MODEL) -> bool:
+        """
+        Description:
+            Whether text fits in max_tokens, counting exactly only when the cheap
+            upper bound is inconclusive.
+
+        Params:
+            text (str): Text to check.
+            max_tokens (int): Token limit.
+            model (str): Model or deployment name.
+
+        Return:
+            bool: True if the text has at most max_tokens tokens.
+
+        Exceptions:
+            TypeError: If text is not a string.
+        """
+        if cls.estimate_upper_bound(text) <= max_tokens:
+            return True
+        return cls.count(text, model) <= max_tokens
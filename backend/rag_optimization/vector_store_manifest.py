@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.documents import Document
+from backend.config.logging_lib import logger
+
+
+class VectorStoreManifest:
+    """
+    Description:
+        Records what each persisted FAISS store was built from, so create_vector_db can
+        tell which stores are stale. The manifest keeps the embedding model id and, per
+        store, a "source" fingerprint (e.g. PDF hash and chunking parameters) plus the
+        ordered list of document ids. Document ids are content hashes, so the difference
+        between two id lists is exactly the set of documents to add or delete.
+
+    Params:
+        path (str): Location of the JSON manifest file.
+    """
+
+    def __init__(self, path: str = "vector_store_manifest.json"):
+        if not isinstance(path, str):
+            raise TypeError("path must be a string")
+        self.path = path
+        self.embedding_model: Optional[str] = None
+        self.stores: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def load(cls, path: str = "vector_store_manifest.json") -> "VectorStoreManifest":
+        """
+        Description:
+            Load a manifest from disk; a missing or unreadable file yields an empty manifest.
+
+        Params:
+            path (str): Location of the JSON manifest file.
+
+        Return:
+            VectorStoreManifest: The loaded manifest.
+
+        Exceptions:
+            TypeError: If path is not a string.
+        """
+        manifest = cls(path)
+        if not os.path.exists(path):
+            return manifest
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            logger.warning(f"Manifest unreadable, treating all stores as stale: {path}")
+            return manifest
+        manifest.embedding_model = data.get("embedding_model")
+        manifest.stores = data.get("stores", {})
+        return manifest
+
+    def save(self) -> None:
+        """
+        Description:
+            Atomically write the manifest to disk.
+
+        Params:
+            None
+
+        Return:
+            None
+
+        Exceptions:
+            OSError: If the file cannot be written.
+        """
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"embedding_model": self.embedding_model, "stores": self.stores},
+                f,
+                indent=2,
+            )
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def file_sha256(path: str) -> str:
+        """
+        Description:
+            Stream a file through sha256.
+
+        Params:
+            path (str): File to hash.
+
+        Return:
+            str: Hex digest.
+
+        Exceptions:
+            FileNotFoundError: If the file does not exist.
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def document_ids(documents: List[Document]) -> List[str]:
+        """
+        Description:
+            Deterministic content-hash ids for documents. Identical documents get an
+            occurrence suffix so every id in a store stays unique.
+
+        Params:
+            documents (list[Document]): Documents to identify.
+
+        Return:
+            list[str]: One id per document, in input order.
+
+        Exceptions:
+            None
+        """
+        seen: Dict[str, int] = {}
+        ids = []
+        for doc in documents:
+            payload = json.dumps(
+                {"text": doc.page_content, "metadata": doc.metadata},
+                sort_keys=True,
+                default=str,
+            )
+            digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+            occurrence = seen.get(digest, 0)
+            seen[digest] = occurrence + 1
+            ids.append(f"{digest}-{occurrence}")
+        return ids
+
+    def store_source(self, store_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Description:
+            Source fingerprint recorded for a store, if any.
+
+        Params:
+            store_name (str): Store folder name.
+
+        Return:
+            dict or None: The recorded fingerprint.
+
+        Exceptions:
+            None
+        """
+        return self.stores.get(store_name, {}).get("source")
+
+    def store_ids(self, store_name: str) -> Optional[List[str]]:
+        """
+        Description:
+            Document ids recorded for a store, or None if the store was never recorded.
+
+        Params:
+            store_name (str): Store folder name.
+
+        Return:
+            list[str] or None: The recorded ids.
+
+        Exceptions:
+            None
+        """
+        entry = self.stores.get(store_name)
+        return None if entry is None else list(entry.get("ids", []))
+
+    def diff(self, store_name: str, new_ids: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Description:
+            Compare recorded ids for a store with the ids of its current inputs.
+
+        Params:
+            store_name (str): Store folder name.
+            new_ids (list[str]): Ids of the documents the store should now contain.
+
+        Return:
+            tuple[list[str], list[str]]: (ids to add, ids to delete).
+
+        Exceptions:
+            None
+        """
+        old_ids = set(self.store_ids(store_name) or [])
+        current = set(new_ids)
+        to_add = [i for i in new_ids if i not in old_ids]
+        to_delete = [i for i in old_ids if i not in current]
+        return to_add, to_delete
+
+    def record_store(
+        self, store_name: str, ids: List[str], source: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Description:
+            Record the ids (and optional source fingerprint) a store was built from.
+
+        Params:
+            store_name (str): Store folder name.
+            ids (list[str]): Document ids now held by the store.
+            source (dict, optional): Fingerprint of the store inputs.
+
+        Return:
+            None
+
+        Exceptions:
+            None
+        """
+        self.stores[store_name] = {"source": source, "ids": list(ids)}
@@ -0,0 +1,31 @@
+import os
+import pytest
+
+pytest.importorskip("optimum")
+pytest.importorskip("onnxruntime")
+pytest.importorskip("sentence_transformers")
+
+from backend.config.onnx_embeddings import OnnxEmbeddingExporter
+
+MODEL_PATH = os.getenv("EMBEDDING_MODEL_PATH", "")
+
+
+@pytest.mark.skipif(
+    not os.path.isdir(MODEL_PATH),
+    reason="EMBEDDING_MODEL_PATH must point to a local sentence-transformers model",
+)
+def test_quantized_onnx_matches_pytorch():
+    texts = [
+        "Harry Potter lived in the cupboard under the stairs.",
+        '"I solemnly swear that I am up to no good."',
+        "Who is the headmaster of Hogwarts?",
+        "CHAPTER ONE THE BOY WHO LIVED",
+    ]
+    report = OnnxEmbeddingExporter.parity_check(
+        MODEL_PATH,
+        texts,
+        os.getenv("EMBEDDING_ONNX_QUANTIZATION", "avx2"),
+        min_cosine=0.99,
+    )
+    assert report["passed"], report["failures"]
+    assert report["min_cosine"] > 0.99
@@ -0,0 +1,48 @@
+import asyncio
+import time
+from typing import Iterator, List, Optional, Tuple
+import pytest
+from backend.config.pdf_extractors import PdfTextExtractor
+from backend.rag_optimization.streaming_ingest import StreamingBookEncoder
+
+
+class _PagesExtractor(PdfTextExtractor):
+    name = "pages"
+
+    def __init__(self, pages: List[str]):
+        self.pages = pages
+
+    def page_count(self, source) -> int:
+        return len(self.pages)
+
+    def iter_pages(
+        self, source, start: int = 0, stop: Optional[int] = None
+    ) -> Iterator[Tuple[int, str, Optional[str]]]:
+        for i, text in enumerate(self.pages[start:stop], start):
+            yield i, text, None
+
+
+class _FailingEmbeddings:
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        # Give the producer time to fill the queue and block on it
+        time.sleep(0.2)
+        raise RuntimeError("embedding failed")
+
+
+def test_embedding_error_with_full_queue_raises():
+    # Many small chunks keep the one-batch queue full when embedding fails
+    encoder = StreamingBookEncoder(
+        _FailingEmbeddings(),
+        batch_size=2,
+        max_pending_batches=1,
+        pdf_extractor=_PagesExtractor([f"page {i}" for i in range(50)]),
+    )
+    start_time = time.monotonic()
+    with pytest.raises(RuntimeError, match="embedding failed"):
+        # wait_for breaks a deadlock, so also check the error came without one
+        asyncio.run(
+            asyncio.wait_for(
+                encoder.encode("book.pdf", chunk_size=20, chunk_overlap=0), 10
+            )
+        )
+    assert time.monotonic() - start_time < 5